@@ -0,0 +1,326 @@
+"""Benchmarks for the data pipeline and the suggestion search path.
+
+Usage:
+  python benchmarks/bench.py [--quick] [--only classify,json,fetch,search,rebuild,binary] [--out FILE]
+  python benchmarks/bench.py --compare OLD.json NEW.json
+
+Suites:
+  classify  infer_vehicle_type_from_model_name + infer_subtiers, and classify_many,
+            over synthetic catalogs of 1k-100k model names
+  json      load and dump of models.json scaled 1x-100x (stdlib json vs models_io)
+  fetch     a full fetch_all_models.main run against the local VPIC stand-in (vehicle_selector/vpic_standin.py)
+  search    make/model suggestions: linear fuzzyScore port vs SuggestionIndex
+  rebuild   the curated rebuild (vehicle_selector rebuild) into a scratch directory
+  binary    open + 1,000 lookups: json.load of models.json vs the mmap'd binary catalog, 1x-100x
+
+Results are written as JSON (default benchmarks/results/<commit>-<time>.json)
+so runs from different commits can be compared with --compare.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASE = os.path.dirname(HERE)
+DATA_PATH = os.path.join(BASE, 'data', 'models.json')
+RESULTS_DIR = os.path.join(HERE, 'results')
+sys.path.insert(0, BASE)
+
+from vehicle_selector import models_io, search, vehicle_types, vpic_standin  # noqa: E402
+
+SUITES = ['classify', 'json', 'fetch', 'search', 'rebuild', 'binary']
+
+
+def measure(fn, repeat):
+    """Run `fn` `repeat` times; returns timing stats in seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return {
+        'repeat': repeat,
+        'min': min(times),
+        'median': statistics.median(times),
+        'mean': statistics.fmean(times),
+    }
+
+
+def record(results, name, params, stats):
+    results.append({'name': name, 'params': params, **stats})
+    shown = ', '.join(f'{k}={v}' for k, v in params.items())
+    print(f'  {name:<34} {shown:<28} median {stats["median"] * 1000:10.2f} ms')
+
+
+def load_catalog():
+    return models_io.load_models(DATA_PATH)
+
+
+def synthetic_names(count, seed=1):
+    """Model-name-like strings built from the real catalog plus trims and suffixes."""
+    rng = random.Random(seed)
+    names = [m['name'] for models in load_catalog().values() for m in models]
+    trims = ['', 'Sport', 'Hybrid', 'LX', 'EX-L', 'Touring', '4x4', 'Cargo Van', 'Pickup', 'Coupe']
+    return [f'{rng.choice(names)} {rng.choice(trims)} {i}'.strip() for i in range(count)]
+
+
+def scaled_catalog(factor):
+    """models.json with every make repeated `factor` times under new names."""
+    data = load_catalog()
+    out = {}
+    for i in range(factor):
+        for make, models in data.items():
+            out[make if i == 0 else f'{make} {i}'] = models
+    return out
+
+
+def bench_classify(results, quick):
+    sizes = [1000, 10000] if quick else [1000, 10000, 100000]
+    for size in sizes:
+        names = synthetic_names(size)
+        repeat = 3 if size >= 100000 else 5
+
+        def per_name():
+            for n in names:
+                vehicle_types.infer_subtiers(vehicle_types.infer_vehicle_type_from_model_name(n), n)
+
+        record(results, 'classify.per_name', {'names': size}, measure(per_name, repeat))
+        record(results, 'classify.classify_many', {'names': size},
+               measure(lambda: vehicle_types.classify_many(names), repeat))
+
+
+def bench_json(results, quick, tmp):
+    factors = [1, 10] if quick else [1, 10, 100]
+    for factor in factors:
+        data = scaled_catalog(factor)
+        path = os.path.join(tmp, f'models.x{factor}.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        params = {'scale': factor, 'bytes': os.path.getsize(path)}
+        repeat = 3 if factor >= 100 else 5
+
+        def std_load():
+            with open(path, 'r', encoding='utf-8') as f:
+                json.load(f)
+
+        def std_dump():
+            with open(os.path.join(tmp, 'out.json'), 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+
+        record(results, 'json.load.stdlib', params, measure(std_load, repeat))
+        record(results, 'json.load.models_io', params, measure(lambda: models_io.load_models(path), repeat))
+        record(results, 'json.dump.stdlib', params, measure(std_dump, repeat))
+        record(results, 'json.dump.models_io', params,
+               measure(lambda: models_io.write_models(os.path.join(tmp, 'out.json'), data), repeat))
+
+
+FETCH_LATENCY = 'fixed:20'
+
+
+@contextlib.contextmanager
+def fake_vpic():
+    """A local VPIC stand-in answering every make with generated models."""
+    server = vpic_standin.StandinServer(('127.0.0.1', 0), {}, vpic_standin.Faults(latency=FETCH_LATENCY),
+                                        missing='synthetic')
+    vpic_standin.start(server)
+    try:
+        yield server.base_url
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def bench_fetch(results, quick, tmp):
+    from vehicle_selector import fetch_all_models
+
+    source = load_catalog()
+    data_path = os.path.join(tmp, 'fetch', 'models.json')
+    patched = {
+        'DATA_PATH': data_path,
+        'BACKUP_PATH': data_path + '.bak',
+        'JOURNAL_PATH': os.path.join(tmp, 'fetch', 'journal.jsonl'),
+        'DIGESTS_PATH': os.path.join(tmp, 'fetch', 'digests.json'),
+        'TYPES_PATH': os.path.join(tmp, 'fetch', 'types.json'),
+    }
+    saved = {k: getattr(fetch_all_models, k) for k in patched}
+    worker_counts = [1, 8] if quick else [1, 4, 8, 16]
+    try:
+        for k, v in patched.items():
+            setattr(fetch_all_models, k, v)
+        with fake_vpic() as base:
+            for workers in worker_counts:
+                def run():
+                    models_io.write_models(data_path, source)
+                    # Every run looks types up again, like the first run against a new base.
+                    if os.path.exists(patched['TYPES_PATH']):
+                        os.remove(patched['TYPES_PATH'])
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        fetch_all_models.main(['--no-cache', '--vpic-base', base, '--workers', str(workers),
+                                               '--rate', '1000', '--metrics-dir', os.path.join(tmp, 'fetch')])
+
+                record(results, 'fetch.main', {'makes': len(source), 'workers': workers,
+                                               'latency': FETCH_LATENCY},
+                       measure(run, 1 if quick else 3))
+    finally:
+        for k, v in saved.items():
+            setattr(fetch_all_models, k, v)
+
+
+def bench_search(results, quick):
+    data = load_catalog()
+    makes = sorted(data)
+    terms = ['t', 'to', 'toy', 'mrcds', 'benz', 'z', 'rover']
+    sizes = [len(makes), 10000] if quick else [len(makes), 10000, 100000]
+    for size in sizes:
+        names = makes if size == len(makes) else synthetic_names(size, seed=2)
+        index = search.SuggestionIndex(names)
+        params = {'candidates': size, 'queries': len(terms)}
+        record(results, 'search.index_build', {'candidates': size},
+               measure(lambda: search.SuggestionIndex(names), 3))
+        record(results, 'search.linear', params,
+               measure(lambda: [search.rank(names, t, 12) for t in terms], 3))
+        record(results, 'search.indexed', params,
+               measure(lambda: [index.rank(t, 12) for t in terms], 5))
+
+    def models_of_every_make():
+        for make, models in data.items():
+            search.rank(models, 'c', 20, key=lambda m: m['name'])
+
+    record(results, 'search.models_per_make', {'makes': len(data)}, measure(models_of_every_make, 5))
+
+
+def bench_rebuild(results, quick, tmp):
+    from vehicle_selector import rebuild_models
+
+    out = os.path.join(tmp, 'rebuild')
+    argv = ['--output', os.path.join(out, 'models.json'), '--db', os.path.join(out, 'none.db'), '--metrics-dir', out]
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            rebuild_models.main(argv)
+
+    record(results, 'rebuild.run', {}, measure(run, 3 if quick else 10))
+
+
+def bench_binary(results, quick, tmp):
+    from vehicle_selector import binary_catalog
+
+    factors = [1, 10] if quick else [1, 10, 100]
+    for factor in factors:
+        data = scaled_catalog(factor)
+        json_path = os.path.join(tmp, f'models.x{factor}.json')
+        bin_path = os.path.join(tmp, f'models.x{factor}.bin')
+        models_io.write_models(json_path, data)
+        binary_catalog.write_catalog(bin_path, data)
+        rng = random.Random(3)
+        pairs = [(make, rng.choice(models)['name'].upper()) for make, models in rng.choices(list(data.items()), k=1000)]
+        params = {'scale': factor, 'json_bytes': os.path.getsize(json_path), 'bin_bytes': os.path.getsize(bin_path)}
+        repeat = 3 if factor >= 100 else 5
+
+        def with_json():
+            catalog = models_io.load_models(json_path)
+            lookup = {make.lower(): {m['name'].lower(): m for m in models} for make, models in catalog.items()}
+            for make, model in pairs:
+                lookup[make.lower()].get(model.lower())
+
+        def with_mmap():
+            with binary_catalog.BinaryCatalog(bin_path) as catalog:
+                for make, model in pairs:
+                    catalog.lookup(make, model)
+
+        record(results, 'binary.json_open_lookup', params, measure(with_json, repeat))
+        record(results, 'binary.mmap_open_lookup', params, measure(with_mmap, repeat))
+
+
+def git_commit():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def compare(old_path, new_path):
+    with open(old_path, 'r', encoding='utf-8') as f:
+        old = json.load(f)
+    with open(new_path, 'r', encoding='utf-8') as f:
+        new = json.load(f)
+    print(f"{old['meta']['commit']} -> {new['meta']['commit']}")
+    baseline = {(r['name'], json.dumps(r['params'], sort_keys=True)): r for r in old['results']}
+    for r in new['results']:
+        prev = baseline.get((r['name'], json.dumps(r['params'], sort_keys=True)))
+        if prev is None:
+            continue
+        speedup = prev['median'] / r['median'] if r['median'] else float('inf')
+        shown = ', '.join(f'{k}={v}' for k, v in r['params'].items())
+        print(f"  {r['name']:<34} {shown:<28} {prev['median'] * 1000:10.2f} -> "
+              f"{r['median'] * 1000:10.2f} ms  x{speedup:.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the data pipeline and search path.')
+    parser.add_argument('--quick', action='store_true', help='smaller sizes and fewer repeats')
+    parser.add_argument('--only', default=','.join(SUITES), help=f'comma-separated suites ({",".join(SUITES)})')
+    parser.add_argument('--out', help='results file (default benchmarks/results/<commit>-<time>.json)')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help='compare two results files')
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    suites = [s.strip() for s in args.only.split(',') if s.strip()]
+    unknown = set(suites) - set(SUITES)
+    if unknown:
+        parser.error(f'unknown suites: {", ".join(sorted(unknown))}')
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for suite in suites:
+            print(f'[{suite}]')
+            if suite == 'classify':
+                bench_classify(results, args.quick)
+            elif suite == 'json':
+                bench_json(results, args.quick, tmp)
+            elif suite == 'fetch':
+                bench_fetch(results, args.quick, tmp)
+            elif suite == 'search':
+                bench_search(results, args.quick)
+            elif suite == 'rebuild':
+                bench_rebuild(results, args.quick, tmp)
+            elif suite == 'binary':
+                bench_binary(results, args.quick, tmp)
+
+    now = datetime.now(timezone.utc)
+    commit = git_commit()
+    report = {
+        'meta': {
+            'commit': commit,
+            'timestamp': now.isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'quick': args.quick,
+            'orjson': models_io.orjson is not None,
+        },
+        'results': results,
+    }
+    out = args.out or os.path.join(RESULTS_DIR, f'{commit}-{now:%Y%m%dT%H%M%S}.json')
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f'✓ Results written to {out}')
+
+
+if __name__ == '__main__':
+    main()
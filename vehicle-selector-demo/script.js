@@ -1,6 +1,12 @@
-// modelsByMake will be loaded from `data/models.json` at runtime.
+// The make list comes from `data/makes.json`; each make's models are fetched from its
+// shard when the make is chosen (falling back to `data/models.min.json`, then `data/models.json`).
 let makes = [];
 let modelsByMake = {};
+// Precomputed suggestions for short queries (from vehicle_selector/build_dataset.py)
+let makePrefix = {};   // lower-cased prefix -> ranked make names
+let modelPrefix = {};  // make -> lower-cased prefix -> ranked model objects
+let shardPaths = {};   // make -> shard path under data/, from data/makes.json
+const shardLoads = {}; // make -> Promise that resolves once its shard is loaded
 
 // DOM refs
 const makeInput = document.getElementById('makeInput');
@@ -72,7 +78,8 @@ function filterMakeSuggestions(term) {
   }
   
   const t = term.trim();
-  const scored = makes
+  const hit = makePrefix[t.toLowerCase()];
+  const scored = hit ? hit.map(make => ({ make })) : makes
     .map(m => ({ make: m, score: fuzzyScore(m, t) }))
     .filter(item => item.score > 0)
     .sort((a, b) => b.score - a.score)
@@ -100,7 +107,8 @@ function filterModelSuggestions(make, term) {
   
   const t = term.trim();
   const models = modelsByMake[make] || [];
-  const scored = models
+  const hit = (modelPrefix[make] || {})[t.toLowerCase()];
+  const scored = hit ? hit.map(model => ({ model })) : models
     .map(m => ({ model: m, score: fuzzyScore(m.name, t) }))
     .filter(item => item.score > 0)
     .sort((a, b) => b.score - a.score)
@@ -172,6 +180,7 @@ makeInput.addEventListener('blur', e => {
   const exact = makes.find(m => m.toLowerCase() === v.toLowerCase());
   if (exact) {
     modelInput.disabled = false;
+    loadMake(exact);
   }
 });
 
@@ -182,6 +191,15 @@ modelInput.addEventListener('blur', e => {
     modelSuggestions.style.display = 'none';
     return;
   }
+  // Don't judge the model before the make's shard has arrived
+  if (!modelsByMake[make] && shardPaths[make]) {
+    loadMake(make).then(() => {
+      if (modelsByMake[make] && makeInput.value === make && document.activeElement !== modelInput) {
+        modelInput.dispatchEvent(new Event('blur'));
+      }
+    });
+    return;
+  }
 
   if (!hasModelMatches(make, v)) {
     // invalid model for selected make: clear and reset downstream
@@ -257,6 +275,7 @@ makeSuggestions.addEventListener('click', e => {
   makeSuggestions.style.display = 'none';
   modelInput.disabled = false;
   modelInput.focus();
+  loadMake(make);
   updateSummary();
 });
 
@@ -264,7 +283,14 @@ makeSuggestions.addEventListener('click', e => {
 modelInput.addEventListener('input', e => {
   const make = makeInput.value;
   if (!make) return;
-  filterModelSuggestions(make, e.target.value);
+  if (!modelsByMake[make] && shardPaths[make]) {
+    // Suggest as soon as the shard arrives, for whatever has been typed by then
+    loadMake(make).then(() => {
+      if (makeInput.value === make) filterModelSuggestions(make, modelInput.value);
+    });
+  } else {
+    filterModelSuggestions(make, e.target.value);
+  }
   updateSummary();
 });
 
@@ -301,14 +327,87 @@ doorsSelect.addEventListener('change', updateSummary);
 
 console.log('Vehicle selector initialized. Makes:', makes.length, 'available.');
 
-// Load models data and initialize makes/models
-fetch('data/models.json')
-  .then(r => r.json())
+// Expand the compact dataset into modelsByMake and the prefix lookup tables
+function loadCompactDataset(d) {
+  const models = d.models.map(([name, typeId, setId]) => ({
+    name,
+    type: d.types[typeId],
+    subtiers: d.subtierSets[setId].map(i => d.subtiers[i])
+  }));
+  modelsByMake = {};
+  modelPrefix = {};
+  d.makes.forEach((make, i) => {
+    modelsByMake[make] = d.byMake[i].map(id => models[id]);
+    const table = {};
+    for (const [p, ids] of Object.entries(d.modelPrefix[i])) table[p] = ids.map(id => models[id]);
+    modelPrefix[make] = table;
+  });
+  makePrefix = {};
+  for (const [p, ids] of Object.entries(d.makePrefix)) makePrefix[p] = ids.map(id => d.makes[id]);
+  makes = d.makes.slice();
+}
+
+// Load the make index: the make list, its prefix table and each make's shard path
+function loadMakeIndex(d) {
+  makes = d.makes.slice();
+  makePrefix = {};
+  for (const [p, ids] of Object.entries(d.makePrefix)) makePrefix[p] = ids.map(id => d.makes[id]);
+  shardPaths = {};
+  d.makes.forEach((make, i) => { shardPaths[make] = d.shards[i]; });
+}
+
+// Expand one make's shard (ids are local to the shard) into modelsByMake and modelPrefix
+function loadShard(make, d) {
+  const models = d.models.map(([name, typeId, setId]) => ({
+    name,
+    type: d.types[typeId],
+    subtiers: d.subtierSets[setId].map(i => d.subtiers[i])
+  }));
+  const table = {};
+  for (const [p, ids] of Object.entries(d.modelPrefix)) table[p] = ids.map(id => models[id]);
+  modelsByMake[make] = models;
+  modelPrefix[make] = table;
+}
+
+// Fetch a make's shard once; the promise resolves when its models are available
+function loadMake(make) {
+  if (modelsByMake[make] || !shardPaths[make]) return Promise.resolve();
+  if (!shardLoads[make]) {
+    shardLoads[make] = fetchJSON('data/' + shardPaths[make])
+      .then(data => loadShard(make, data))
+      .catch(err => {
+        delete shardLoads[make];  // allow a retry on the next selection
+        console.error('Failed to load models for', make, err);
+      });
+  }
+  return shardLoads[make];
+}
+
+function fetchJSON(url) {
+  return fetch(url).then(r => {
+    if (!r.ok) throw new Error('HTTP ' + r.status);
+    return r.json();
+  });
+}
+
+// Load the make index, falling back to the whole catalog in one file
+fetchJSON('data/makes.json')
   .then(data => {
-    modelsByMake = data;
-    makes = Object.keys(modelsByMake).sort();
-    console.log('Loaded models.json — makes available:', makes.length);
+    loadMakeIndex(data);
+    console.log('Loaded makes.json — makes available:', makes.length);
   })
+  .catch(() => fetchJSON('data/models.min.json')
+    .then(data => {
+      loadCompactDataset(data);
+      console.log('Loaded models.min.json — makes available:', makes.length);
+    }))
+  .catch(() => fetch('data/models.json')
+    .then(r => r.json())
+    .then(data => {
+      modelsByMake = data;
+      makes = Object.keys(modelsByMake).sort();
+      console.log('Loaded models.json — makes available:', makes.length);
+    }))
   .catch(err => {
     console.error('Failed to load data/models.json', err);
   });
@@ -0,0 +1,37 @@
+"""Vehicle catalog tooling for the selector demo.
+
+Run `python -m vehicle_selector` for the command-line tools. The pieces are
+also importable for use from other services; names below are loaded on first
+access, so `import vehicle_selector` itself costs nothing:
+
+    from vehicle_selector import load_models, classify, SuggestionIndex
+"""
+import importlib
+
+# public name -> module that defines it
+_EXPORTS = {
+    'load_models': 'models_io',
+    'write_models': 'models_io',
+    'classify': 'vehicle_types',
+    'classify_many': 'vehicle_types',
+    'build_entries': 'normalize',
+    'canonical_key': 'normalize',
+    'SuggestionIndex': 'search',
+    'fuzzy_score': 'search',
+    'validate': 'validate',
+    'CatalogDB': 'catalog_db',
+    'BinaryCatalog': 'binary_catalog',
+    'VPICClient': 'vpic_client',
+    'TypeResolver': 'type_lookup',
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,281 @@
+"""Compact binary catalog for services: mmap it and look models up with no parse step.
+
+Usage:
+  python -m vehicle_selector compile [--input data/models.json] [--output data/models.bin] [--check]
+
+    from vehicle_selector import BinaryCatalog
+    with BinaryCatalog('data/models.bin') as catalog:
+        catalog.lookup('ford', 'f150')  # {'make': 'Ford', 'name': 'F-150', 'type': 'Truck', ...}
+
+Opening the file maps it read-only and reads one header; every lookup is a
+binary search over the mapped bytes. Processes that open the same file share
+its page-cache copy, so a worker costs neither json.load time nor a private
+dict-of-lists catalog. `compile` writes the file atomically; a reader keeps
+the snapshot it opened until it opens the file again.
+
+Layout (little-endian unsigned 32-bit integers throughout, sections 4-aligned):
+
+  header       magic b'VSCATLG\\0', version, counts (strings, makes, models,
+               subtier sets, keys), then the offset of every section below
+  strings      (count + 1) offsets into a UTF-8 blob, then the blob; every
+               name, key, type and subtier is stored once
+  makes        (key, name, first model, model count) per make, sorted by key
+  models       (name, make, type, subtier set) per model, grouped by make in
+               models.json order
+  subtier sets (count + 1) offsets into a list of subtier string ids
+  keys         (key, model) sorted by key bytes, where a key is
+               "<make lower-cased>\\0<model name or alias lower-cased>"
+
+Make and model matching is case-insensitive and ignores surrounding spaces,
+and aliases resolve to their model, the same as the suggestion API.
+"""
+import argparse
+import mmap
+import os
+import struct
+import sys
+
+from .models_io import load_models, write_bytes
+
+BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_PATH = os.path.join(BASE, 'data', 'models.json')
+OUTPUT_PATH = os.path.join(BASE, 'data', 'models.bin')
+
+MAGIC = b'VSCATLG\0'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<8s13I')
+MAKE = struct.Struct('<4I')
+MODEL = struct.Struct('<4I')
+KEY = struct.Struct('<2I')
+U32 = struct.Struct('<I')
+
+
+def _key(text):
+    return (text or '').strip().lower()
+
+
+def _align(buf):
+    buf.extend(b'\0' * (-len(buf) % 4))
+
+
+def _u32_array(values):
+    return struct.pack(f'<{len(values)}I', *values)
+
+
+class _Strings:
+    """Interned string table."""
+
+    def __init__(self):
+        self.ids = {}
+        self.values = []
+
+    def __call__(self, value):
+        i = self.ids.get(value)
+        if i is None:
+            i = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return i
+
+    def encode(self):
+        offsets = [0]
+        blob = bytearray()
+        for value in self.values:
+            blob += value.encode('utf-8')
+            offsets.append(len(blob))
+        return _u32_array(offsets), bytes(blob)
+
+
+def build(data):
+    """The binary catalog for `data` (a models.json dict), as bytes."""
+    strings = _Strings()
+    sets = {}
+    set_refs = [[]]
+    makes = sorted(data, key=lambda m: _key(m).encode('utf-8'))
+    make_rows = []
+    model_rows = []
+    keys = []
+    for make_id, make in enumerate(makes):
+        make_key = _key(make)
+        models = data[make]
+        make_rows.append((strings(make_key), strings(make), len(model_rows), len(models)))
+        names = {}
+        for m in models:
+            model_id = len(model_rows)
+            subtiers = tuple(strings(s) for s in m.get('subtiers', []))
+            set_id = sets.get(subtiers)
+            if set_id is None:
+                set_id = sets[subtiers] = len(set_refs)
+                set_refs.append(list(subtiers))
+            model_rows.append((strings(m['name']), make_id, strings(m.get('type', '')), set_id))
+            for alias in m.get('aliases', ()):
+                names.setdefault(_key(alias), model_id)
+            names[_key(m['name'])] = model_id  # a model's own name wins over another's alias
+        keys.extend((f'{make_key}\0{name}', model_id) for name, model_id in names.items())
+    keys.sort(key=lambda k: k[0].encode('utf-8'))
+    key_rows = [(strings(k), model_id) for k, model_id in keys]
+
+    string_index, blob = strings.encode()
+    set_offsets = [0]
+    for refs in set_refs:
+        set_offsets.append(set_offsets[-1] + len(refs))
+
+    out = bytearray(HEADER.size)
+    offsets = []
+    for section in (
+        string_index,
+        blob,
+        b''.join(MAKE.pack(*row) for row in make_rows),
+        b''.join(MODEL.pack(*row) for row in model_rows),
+        _u32_array(set_offsets),
+        _u32_array([r for refs in set_refs for r in refs]),
+        b''.join(KEY.pack(*row) for row in key_rows),
+    ):
+        _align(out)
+        offsets.append(len(out))
+        out += section
+    HEADER.pack_into(out, 0, MAGIC, FORMAT_VERSION, len(strings.values), len(make_rows), len(model_rows),
+                     len(set_refs), len(key_rows), *offsets)
+    return bytes(out)
+
+
+def write_catalog(path, data):
+    """Atomically write the binary catalog for `data` to `path`; returns its size in bytes."""
+    payload = build(data)
+    write_bytes(path, payload)
+    return len(payload)
+
+
+class BinaryCatalog:
+    """Read-only view of a binary catalog file through mmap."""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.mm) < HEADER.size:
+            self.mm.close()
+            raise ValueError(f'{path}: not a binary catalog')
+        (magic, version, self.string_count, self.make_count, self.model_count, self.set_count, self.key_count,
+         self._string_index, self._blob, self._makes, self._models, self._set_index, self._set_refs,
+         self._keys) = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self.mm.close()
+            raise ValueError(f'{path}: not a version {FORMAT_VERSION} binary catalog')
+
+    def close(self):
+        self.mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.model_count
+
+    def _bytes(self, i):
+        start, end = struct.unpack_from('<2I', self.mm, self._string_index + 4 * i)
+        return self.mm[self._blob + start:self._blob + end]
+
+    def _str(self, i):
+        return self._bytes(i).decode('utf-8')
+
+    def _search(self, base, count, width, target):
+        """Index of the record whose leading key string equals `target` (bytes), or -1."""
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            key = self._bytes(U32.unpack_from(self.mm, base + mid * width)[0])
+            if key < target:
+                lo = mid + 1
+            elif key > target:
+                hi = mid
+            else:
+                return mid
+        return -1
+
+    def _make_row(self, i):
+        return MAKE.unpack_from(self.mm, self._makes + i * MAKE.size)
+
+    def _model(self, i):
+        name, make, vtype, set_id = MODEL.unpack_from(self.mm, self._models + i * MODEL.size)
+        start, end = struct.unpack_from('<2I', self.mm, self._set_index + 4 * set_id)
+        refs = struct.unpack_from(f'<{end - start}I', self.mm, self._set_refs + 4 * start)
+        return {
+            'make': self._str(self._make_row(make)[1]),
+            'name': self._str(name),
+            'type': self._str(vtype),
+            'subtiers': [self._str(r) for r in refs],
+        }
+
+    def find_make(self, make):
+        """The stored spelling of `make` (case-insensitive), or None."""
+        i = self._search(self._makes, self.make_count, MAKE.size, _key(make).encode('utf-8'))
+        return self._str(self._make_row(i)[1]) if i >= 0 else None
+
+    def makes(self):
+        """Every make name, in key order."""
+        return [self._str(self._make_row(i)[1]) for i in range(self.make_count)]
+
+    def models(self, make):
+        """`make`'s models in models.json order (make, name, type, subtiers), or None for an unknown make."""
+        i = self._search(self._makes, self.make_count, MAKE.size, _key(make).encode('utf-8'))
+        if i < 0:
+            return None
+        _, _, first, count = self._make_row(i)
+        return [self._model(first + j) for j in range(count)]
+
+    def lookup(self, make, model):
+        """The model `make`/`model` names (by name or alias), or None when the pair is not in the catalog."""
+        target = f'{_key(make)}\0{_key(model)}'.encode('utf-8')
+        i = self._search(self._keys, self.key_count, KEY.size, target)
+        if i < 0:
+            return None
+        return self._model(KEY.unpack_from(self.mm, self._keys + i * KEY.size)[1])
+
+    def is_valid(self, make, model):
+        target = f'{_key(make)}\0{_key(model)}'.encode('utf-8')
+        return self._search(self._keys, self.key_count, KEY.size, target) >= 0
+
+
+def check(catalog, data):
+    """Problems found looking every make, model and alias of `data` up in `catalog`."""
+    problems = []
+    for make, models in data.items():
+        if catalog.find_make(make) != make:
+            problems.append(f'{make}: make not found')
+            continue
+        for m in models:
+            for name in [m['name']] + list(m.get('aliases', ())):
+                hit = catalog.lookup(make, name)
+                if hit is None:
+                    problems.append(f'{make}/{name}: not found')
+                elif name == m['name'] and (hit['type'], hit['subtiers']) != (m.get('type', ''), m.get('subtiers', [])):
+                    problems.append(f'{make}/{name}: got {hit["type"]} {hit["subtiers"]}')
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compile models.json into an mmap-able binary catalog.')
+    parser.add_argument('--input', default=DATA_PATH, help='source models.json')
+    parser.add_argument('--output', default=OUTPUT_PATH, help='binary catalog to write (default data/models.bin)')
+    parser.add_argument('--check', action='store_true', help='look every model up in the written file')
+    args = parser.parse_args(argv)
+
+    data = load_models(args.input)
+    size = write_catalog(args.output, data)
+    print(f'✓ Wrote {args.output}')
+    print(f'  Makes: {len(data)}, models: {sum(len(m) for m in data.values())}')
+    print(f'  Size: {os.path.getsize(args.input):,} -> {size:,} bytes')
+    if args.check:
+        with BinaryCatalog(args.output) as catalog:
+            problems = check(catalog, data)
+        for problem in problems[:20]:
+            print(f'  {problem}')
+        print(f'  Checked: {len(problems)} problems')
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,300 @@
+"""Build the compact, pre-indexed front-end dataset from data/models.json.
+
+Usage:
+  python -m vehicle_selector build [--input data/models.json] [--output data/models.min.json]
+      [--data-dir data]
+
+The output is minified JSON with this shape:
+  types       ["SUV", "Sedan", ...]                  interned type names
+  subtiers    ["Standard", "4-Door", ...]            interned subtier names
+  subtierSets [[0], [1], [2, 3], ...]                interned subtier lists (ids into subtiers)
+  makes       ["Acura", ...]                         sorted, as script.js sorts them
+  models      [["MDX", typeId, subtierSetId], ...]   every model; its index is its id
+  byMake      [[0, 1, 2, 3], ...]                    model ids per make, in models.json order
+  makePrefix  {"to": [makeId, ...], ...}             ranked make suggestions per short prefix
+  modelPrefix [{"c": [modelId, ...], ...}, ...]      ranked model suggestions per make and prefix
+
+The prefix tables hold exactly what script.js would compute for that query
+(same fuzzyScore ranking, same 12/20 limits), so the page can answer the
+common short queries with a lookup and only scan for longer ones.
+
+The same data is also written sharded, which is what the page loads first:
+data/makes.json holds only the make list, `makePrefix` and the shard of each
+make, and data/shards/<make>.<hash>.json holds one make's models:
+
+  makes.json  {"version", "makes", "makePrefix", "shards": ["shards/ford.1a2b3c4d.json", ...]}
+  shard       {"version", "make", "types", "subtiers", "subtierSets", "models", "modelPrefix"}
+
+A shard's ids are local to it. Shard names carry a hash of their content, so a
+shard is only written when its make changes. A shard is removed once neither
+the new makes.json nor the one it replaces lists it, so a page still holding
+the previous makes.json can load its shards until the next change. The page's
+first download stays the size of the make list however many models the
+catalog holds.
+
+Every command that rewrites models.json does so through `publish_models`,
+which brings makes.json and the shards up to date in the same pass; run
+`build` after editing models.json by hand.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+
+from .models_io import load_models, write_compact, write_models, write_text
+from .search import SuggestionIndex
+
+BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_PATH = os.path.join(BASE, 'data', 'models.json')
+OUTPUT_PATH = os.path.join(BASE, 'data', 'models.min.json')
+DATA_DIR = os.path.join(BASE, 'data')
+PAGE_DATA_NAME = 'models.json'  # the file the page's makes.json and shards sit beside
+INDEX_NAME = 'makes.json'
+SHARDS_DIR = 'shards'  # below the data directory
+
+FORMAT_VERSION = 1
+MAKE_LIMIT = 12   # filterMakeSuggestions .slice(0, 12)
+MODEL_LIMIT = 20  # filterModelSuggestions .slice(0, 20)
+DEFAULT_MAKE_PREFIX_DEPTH = 2
+DEFAULT_MODEL_PREFIX_DEPTH = 1
+
+
+class Interner:
+    """Assign small integer ids to hashable values in first-seen order."""
+
+    def __init__(self):
+        self.ids = {}
+        self.values = []
+
+    def __call__(self, value):
+        i = self.ids.get(value)
+        if i is None:
+            i = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return i
+
+
+def prefixes(names, depth):
+    """Every lower-cased prefix of length 1..depth of the given names."""
+    out = set()
+    for name in names:
+        low = name.lower()
+        for n in range(1, min(depth, len(low)) + 1):
+            p = low[:n]
+            if p == p.strip():  # script.js trims queries, so these are never looked up
+                out.add(p)
+    return sorted(out)
+
+
+def prefix_table(names, depth, limit):
+    """{prefix: [index, ...]} ranked the way script.js ranks suggestions."""
+    index = SuggestionIndex(names)
+    table = {}
+    for p in prefixes(names, depth):
+        ranked = index.rank_ids(p, limit)
+        if ranked:
+            table[p] = ranked
+    return table
+
+
+def build(data, make_prefix_depth=DEFAULT_MAKE_PREFIX_DEPTH, model_prefix_depth=DEFAULT_MODEL_PREFIX_DEPTH):
+    types = Interner()
+    subtiers = Interner()
+    subtier_sets = Interner()
+
+    makes = sorted(data)
+    models = []
+    by_make = []
+    model_prefix = []
+    for make in makes:
+        ids = []
+        for m in data[make]:
+            set_id = subtier_sets(tuple(subtiers(s) for s in m.get('subtiers', [])))
+            ids.append(len(models))
+            models.append([m['name'], types(m.get('type', '')), set_id])
+        by_make.append(ids)
+        names = [models[i][0] for i in ids]
+        local = prefix_table(names, model_prefix_depth, MODEL_LIMIT)
+        model_prefix.append({p: [ids[i] for i in ranked] for p, ranked in local.items()})
+
+    return {
+        'version': FORMAT_VERSION,
+        'types': types.values,
+        'subtiers': subtiers.values,
+        'subtierSets': [list(s) for s in subtier_sets.values],
+        'makes': makes,
+        'models': models,
+        'byMake': by_make,
+        'makePrefix': prefix_table(makes, make_prefix_depth, MAKE_LIMIT),
+        'modelPrefix': model_prefix,
+    }
+
+
+def build_shard(make, models, model_prefix_depth=DEFAULT_MODEL_PREFIX_DEPTH):
+    """One make's shard: its models interned like `build`, with ids local to the shard."""
+    types = Interner()
+    subtiers = Interner()
+    subtier_sets = Interner()
+    rows = []
+    for m in models:
+        set_id = subtier_sets(tuple(subtiers(s) for s in m.get('subtiers', [])))
+        rows.append([m['name'], types(m.get('type', '')), set_id])
+    return {
+        'version': FORMAT_VERSION,
+        'make': make,
+        'types': types.values,
+        'subtiers': subtiers.values,
+        'subtierSets': [list(s) for s in subtier_sets.values],
+        'models': rows,
+        'modelPrefix': prefix_table([r[0] for r in rows], model_prefix_depth, MODEL_LIMIT),
+    }
+
+
+def shard_slug(make):
+    """File-name-safe form of a make name (the content hash keeps equal slugs apart)."""
+    return re.sub(r'[^a-z0-9]+', '-', make.lower()).strip('-') or 'make'
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+def _same_content(path, text):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read() == text
+    except FileNotFoundError:
+        return False
+
+
+def _index_shards(index_path):
+    """Shard file names listed by the makes.json at `index_path` (none when it is missing or unreadable)."""
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            return {p.split('/', 1)[-1] for p in json.load(f).get('shards', [])}
+    except (OSError, ValueError, AttributeError):
+        return set()
+
+
+class ShardWriter:
+    """Writes one content-hashed shard per make as makes are added, then makes.json.
+
+    Only a make's name and shard path are kept once its shard is written, so
+    a catalog can be streamed through it.
+    """
+
+    def __init__(self, data_dir=DATA_DIR, make_prefix_depth=DEFAULT_MAKE_PREFIX_DEPTH,
+                 model_prefix_depth=DEFAULT_MODEL_PREFIX_DEPTH):
+        self.data_dir = data_dir
+        self.shards_dir = os.path.join(data_dir, SHARDS_DIR)
+        self.make_prefix_depth = make_prefix_depth
+        self.model_prefix_depth = model_prefix_depth
+        self.paths = {}  # make -> shard path relative to data_dir
+        self.written = self.unchanged = 0
+
+    def add(self, make, models):
+        text = _dumps(build_shard(make, models, self.model_prefix_depth))
+        digest = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        name = f'{shard_slug(make)}.{digest[:8]}.json'
+        self.paths[make] = f'{SHARDS_DIR}/{name}'
+        if os.path.exists(os.path.join(self.shards_dir, name)):
+            self.unchanged += 1
+        else:
+            write_text(os.path.join(self.shards_dir, name), text)
+            self.written += 1
+
+    def finish(self):
+        """Write makes.json if it changed and prune old shards; returns counts of shards written, unchanged, removed."""
+        makes = sorted(self.paths)
+        paths = [self.paths[make] for make in makes]
+        index = _dumps({
+            'version': FORMAT_VERSION,
+            'makes': makes,
+            'makePrefix': prefix_table(makes, self.make_prefix_depth, MAKE_LIMIT),
+            'shards': paths,
+        })
+        index_path = os.path.join(self.data_dir, INDEX_NAME)
+        if _same_content(index_path, index):
+            # Nothing changed; the previous generation stays until the next change.
+            return {'written': self.written, 'unchanged': self.unchanged, 'removed': 0}
+        # Keep the generation the replaced makes.json points at, for pages that still hold it.
+        keep = {p.split('/', 1)[1] for p in paths} | _index_shards(index_path)
+        write_text(index_path, index)
+        removed = 0
+        for name in os.listdir(self.shards_dir) if os.path.isdir(self.shards_dir) else []:
+            if name.endswith('.json') and name not in keep:
+                os.remove(os.path.join(self.shards_dir, name))
+                removed += 1
+        return {'written': self.written, 'unchanged': self.unchanged, 'removed': removed}
+
+
+def write_shards(data, data_dir=DATA_DIR, make_prefix_depth=DEFAULT_MAKE_PREFIX_DEPTH,
+                 model_prefix_depth=DEFAULT_MODEL_PREFIX_DEPTH):
+    """Write makes.json and one content-hashed shard per make under `data_dir`.
+
+    `data` is a dict or an iterable of (make, models) pairs. Only shards whose
+    content changed are written and makes.json only when it changed. Returns
+    counts of shards written, unchanged and removed.
+    """
+    writer = ShardWriter(data_dir, make_prefix_depth, model_prefix_depth)
+    for make, models in data.items() if isinstance(data, dict) else data:
+        writer.add(make, models)
+    return writer.finish()
+
+
+def publish_models(path, items):
+    """Atomically write `items` to `path`, then bring the page's makes.json and shards beside it up to date.
+
+    `items` is a dict or an iterable of (make, models) pairs and is streamed
+    once. Shards are only kept beside files named models.json, the file the
+    page loads; for any other path this is plain `write_models` and returns
+    None, otherwise the `write_shards` counts.
+    """
+    if os.path.basename(path) != PAGE_DATA_NAME:
+        write_models(path, items)
+        return None
+    writer = ShardWriter(os.path.dirname(os.path.abspath(path)))
+
+    def shard_as_written(pairs):
+        for make, models in pairs:
+            writer.add(make, models)
+            yield make, models
+
+    write_models(path, shard_as_written(items.items() if isinstance(items, dict) else items))
+    return writer.finish()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build data/models.min.json for the selector page.')
+    parser.add_argument('--input', default=DATA_PATH, help='source models.json')
+    parser.add_argument('--output', default=OUTPUT_PATH, help='compact dataset to write')
+    parser.add_argument('--data-dir', default=DATA_DIR,
+                        help='where makes.json and shards/ are written (default data/)')
+    parser.add_argument('--make-prefix-depth', type=int, default=DEFAULT_MAKE_PREFIX_DEPTH,
+                        help=f'longest make prefix to precompute (default {DEFAULT_MAKE_PREFIX_DEPTH})')
+    parser.add_argument('--model-prefix-depth', type=int, default=DEFAULT_MODEL_PREFIX_DEPTH,
+                        help=f'longest model prefix to precompute (default {DEFAULT_MODEL_PREFIX_DEPTH})')
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.input):
+        print('models.json not found at', args.input)
+        return
+
+    data = load_models(args.input)
+    dataset = build(data, args.make_prefix_depth, args.model_prefix_depth)
+    write_compact(args.output, dataset)
+
+    print(f'✓ Wrote {args.output}')
+    print(f'  Makes: {len(dataset["makes"])}, models: {len(dataset["models"])}, '
+          f'types: {len(dataset["types"])}, subtier sets: {len(dataset["subtierSets"])}')
+    print(f'  Size: {os.path.getsize(args.input):,} -> {os.path.getsize(args.output):,} bytes')
+
+    shards = write_shards(data, args.data_dir, args.make_prefix_depth, args.model_prefix_depth)
+    index_path = os.path.join(args.data_dir, INDEX_NAME)
+    print(f'✓ Wrote {index_path} ({os.path.getsize(index_path):,} bytes)')
+    print(f"  Shards: {shards['written']} written, {shards['unchanged']} unchanged, {shards['removed']} removed")
+
+
+if __name__ == '__main__':
+    main()
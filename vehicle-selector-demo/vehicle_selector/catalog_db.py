@@ -0,0 +1,320 @@
+"""SQLite storage backend for the vehicle catalog.
+
+Usage:
+  python -m vehicle_selector db import [--data data/models.json] [--db data/catalog.db]
+  python -m vehicle_selector db export [--output data/models.json] [--db data/catalog.db]
+  python -m vehicle_selector db search TERM [--limit 20] [--db data/catalog.db]
+  python -m vehicle_selector db stats [--db data/catalog.db]
+
+Makes, models (with their alias spellings), types and subtiers live in
+indexed tables, and an FTS5 table (kept in step by triggers) serves name
+search. Writers upsert one make at a time: `upsert_make` inserts or updates that make's models in place, removes
+the ones that disappeared, and does nothing at all when the entries are
+unchanged, so a refresh only touches the rows that moved. Positions are
+stored, so `export` regenerates models.json for the static page with the
+same JSON values in the same order (line endings and float spelling may
+differ from a hand-edited file). The file it replaces is kept as
+models.json.bak, and it refuses to export a database with no makes.
+
+fetch_all_models.py and ingest_export.py write into the database with
+`--db`, and rebuild_models.py updates it whenever it exists.
+"""
+import argparse
+import os
+import sqlite3
+import sys
+
+from .build_dataset import publish_models
+from .models_io import backup_models, load_models
+
+BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_PATH = os.path.join(BASE, 'data', 'models.json')
+DB_PATH = os.path.join(BASE, 'data', 'catalog.db')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS makes (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    position INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS makes_name_nocase ON makes(name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS makes_position ON makes(position);
+
+CREATE TABLE IF NOT EXISTS types (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS subtiers (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS models (
+    id INTEGER PRIMARY KEY,
+    make_id INTEGER NOT NULL REFERENCES makes(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    type_id INTEGER NOT NULL REFERENCES types(id),
+    position INTEGER NOT NULL,
+    UNIQUE (make_id, name)
+);
+CREATE INDEX IF NOT EXISTS models_make_position ON models(make_id, position);
+CREATE INDEX IF NOT EXISTS models_type ON models(type_id);
+
+CREATE TABLE IF NOT EXISTS model_subtiers (
+    model_id INTEGER NOT NULL REFERENCES models(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    subtier_id INTEGER NOT NULL REFERENCES subtiers(id),
+    PRIMARY KEY (model_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS model_subtiers_subtier ON model_subtiers(subtier_id);
+
+CREATE TABLE IF NOT EXISTS model_aliases (
+    model_id INTEGER NOT NULL REFERENCES models(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    alias TEXT NOT NULL,
+    PRIMARY KEY (model_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS model_aliases_alias ON model_aliases(alias COLLATE NOCASE);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS models_fts USING fts5(name, make, tokenize = 'unicode61');
+CREATE TRIGGER IF NOT EXISTS models_fts_insert AFTER INSERT ON models BEGIN
+    INSERT INTO models_fts(rowid, name, make)
+    VALUES (new.id, new.name, (SELECT name FROM makes WHERE id = new.make_id));
+END;
+CREATE TRIGGER IF NOT EXISTS models_fts_delete AFTER DELETE ON models BEGIN
+    DELETE FROM models_fts WHERE rowid = old.id;
+END;
+CREATE TRIGGER IF NOT EXISTS models_fts_rename AFTER UPDATE OF name ON models BEGIN
+    UPDATE models_fts SET name = new.name WHERE rowid = new.id;
+END;
+"""
+
+
+def _fts_query(term):
+    """FTS5 query matching every word of `term` as a prefix."""
+    words = ''.join(ch if ch.isalnum() else ' ' for ch in term).split()
+    return ' '.join('"' + w + '"*' for w in words)
+
+
+class CatalogDB:
+    """A catalog database at `path`, created on first open."""
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode = WAL')
+        self.conn.execute('PRAGMA synchronous = NORMAL')
+        self.conn.execute('PRAGMA foreign_keys = ON')
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+        try:
+            with self.conn:
+                self.conn.executescript(FTS_SCHEMA)
+            self.fts = True
+        except sqlite3.OperationalError:  # SQLite built without FTS5: search falls back to LIKE
+            self.fts = False
+        self._ids = {'types': {}, 'subtiers': {}}
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _intern(self, table, name):
+        ids = self._ids[table]
+        i = ids.get(name)
+        if i is None:
+            self.conn.execute(f'INSERT OR IGNORE INTO {table}(name) VALUES (?)', (name,))
+            i = ids[name] = self.conn.execute(f'SELECT id FROM {table} WHERE name = ?', (name,)).fetchone()[0]
+        return i
+
+    def find_make(self, make):
+        """The stored spelling of `make` (case-insensitive), or None."""
+        row = self.conn.execute('SELECT name FROM makes WHERE name = ? COLLATE NOCASE',
+                                ((make or '').strip(),)).fetchone()
+        return row[0] if row else None
+
+    def get_make(self, make):
+        """models.json entries for `make`, or None if it is not stored."""
+        row = self.conn.execute('SELECT id FROM makes WHERE name = ?', (make,)).fetchone()
+        if row is None:
+            return None
+        return self._entries(row[0])
+
+    def _entries(self, make_id):
+        models = self.conn.execute(
+            'SELECT m.id, m.name, t.name FROM models m JOIN types t ON t.id = m.type_id '
+            'WHERE m.make_id = ? ORDER BY m.position', (make_id,)).fetchall()
+        subtiers = {}
+        for model_id, name in self.conn.execute(
+                'SELECT ms.model_id, s.name FROM model_subtiers ms JOIN subtiers s ON s.id = ms.subtier_id '
+                'JOIN models m ON m.id = ms.model_id WHERE m.make_id = ? ORDER BY ms.model_id, ms.position',
+                (make_id,)):
+            subtiers.setdefault(model_id, []).append(name)
+        aliases = {}
+        for model_id, alias in self.conn.execute(
+                'SELECT a.model_id, a.alias FROM model_aliases a JOIN models m ON m.id = a.model_id '
+                'WHERE m.make_id = ? ORDER BY a.model_id, a.position', (make_id,)):
+            aliases.setdefault(model_id, []).append(alias)
+        entries = []
+        for model_id, name, vtype in models:
+            entry = {'name': name, 'type': vtype, 'subtiers': subtiers.get(model_id, [])}
+            if model_id in aliases:
+                entry['aliases'] = aliases[model_id]
+            entries.append(entry)
+        return entries
+
+    def upsert_make(self, make, entries, position=None):
+        """Make `make`'s stored models equal `entries`; returns False if nothing changed.
+
+        `position` orders the make in exports; new makes go last by default.
+        """
+        with self.conn:
+            row = self.conn.execute('SELECT id, position FROM makes WHERE name = ?', (make,)).fetchone()
+            if row is None:
+                if position is None:
+                    position = self.conn.execute('SELECT COALESCE(MAX(position) + 1, 0) FROM makes').fetchone()[0]
+                make_id = self.conn.execute('INSERT INTO makes(name, position) VALUES (?, ?)',
+                                            (make, position)).lastrowid
+            else:
+                make_id = row[0]
+                moved = position is not None and position != row[1]
+                if moved:
+                    self.conn.execute('UPDATE makes SET position = ? WHERE id = ?', (position, make_id))
+                if self._entries(make_id) == entries:
+                    return moved
+
+            existing = dict(self.conn.execute('SELECT name, id FROM models WHERE make_id = ?', (make_id,)))
+            keep = set()
+            for pos, entry in enumerate(entries):
+                type_id = self._intern('types', entry.get('type', ''))
+                model_id = existing.get(entry['name'])
+                if model_id is None:
+                    model_id = self.conn.execute(
+                        'INSERT INTO models(make_id, name, type_id, position) VALUES (?, ?, ?, ?)',
+                        (make_id, entry['name'], type_id, pos)).lastrowid
+                    existing[entry['name']] = model_id
+                else:
+                    self.conn.execute('UPDATE models SET type_id = ?, position = ? WHERE id = ?',
+                                      (type_id, pos, model_id))
+                    self.conn.execute('DELETE FROM model_subtiers WHERE model_id = ?', (model_id,))
+                    self.conn.execute('DELETE FROM model_aliases WHERE model_id = ?', (model_id,))
+                keep.add(model_id)
+                self.conn.executemany(
+                    'INSERT INTO model_subtiers(model_id, position, subtier_id) VALUES (?, ?, ?)',
+                    [(model_id, i, self._intern('subtiers', s)) for i, s in enumerate(entry.get('subtiers', []))])
+                self.conn.executemany(
+                    'INSERT INTO model_aliases(model_id, position, alias) VALUES (?, ?, ?)',
+                    [(model_id, i, a) for i, a in enumerate(entry.get('aliases', []))])
+            self.conn.executemany('DELETE FROM models WHERE id = ?',
+                                  [(i,) for i in existing.values() if i not in keep])
+        return True
+
+    def delete_make(self, make):
+        with self.conn:
+            self.conn.execute('DELETE FROM models WHERE make_id = (SELECT id FROM makes WHERE name = ?)', (make,))
+            self.conn.execute('DELETE FROM makes WHERE name = ?', (make,))
+
+    def replace_all(self, items):
+        """Store exactly `items` (a dict or (make, entries) pairs); returns the changed make count."""
+        if isinstance(items, dict):
+            items = items.items()
+        changed = 0
+        names = set()
+        for position, (make, entries) in enumerate(items):
+            names.add(make)
+            changed += self.upsert_make(make, entries, position)
+        for (make,) in self.conn.execute('SELECT name FROM makes').fetchall():
+            if make not in names:
+                self.delete_make(make)
+                changed += 1
+        return changed
+
+    def iter_catalog(self):
+        """Yield (make, entries) pairs in models.json order."""
+        for make_id, make in self.conn.execute('SELECT id, name FROM makes ORDER BY position').fetchall():
+            yield make, self._entries(make_id)
+
+    def export(self, path=DATA_PATH):
+        """Regenerate models.json at `path` (and the page's shards beside it) from the database.
+
+        Raises ValueError when the database has no makes, rather than
+        replacing the catalog with an empty one.
+        """
+        if self.conn.execute('SELECT 1 FROM makes LIMIT 1').fetchone() is None:
+            raise ValueError(f'{self.path}: no makes to export')
+        if os.path.exists(path):
+            backup_models(path, path + '.bak')
+        publish_models(path, self.iter_catalog())
+
+    def search(self, term, limit=20):
+        """(make, model name, type) rows whose make or model name match every word of `term`."""
+        query = _fts_query(term)
+        if not query:
+            return []
+        if self.fts:
+            return self.conn.execute(
+                'SELECT k.name, m.name, t.name FROM models_fts f '
+                'JOIN models m ON m.id = f.rowid JOIN makes k ON k.id = m.make_id JOIN types t ON t.id = m.type_id '
+                'WHERE models_fts MATCH ? ORDER BY f.rank LIMIT ?', (query, limit)).fetchall()
+        like = f'%{term.strip()}%'
+        return self.conn.execute(
+            'SELECT k.name, m.name, t.name FROM models m JOIN makes k ON k.id = m.make_id '
+            'JOIN types t ON t.id = m.type_id WHERE m.name LIKE ? OR k.name LIKE ? '
+            'ORDER BY k.position, m.position LIMIT ?', (like, like, limit)).fetchall()
+
+    def stats(self):
+        return {table: self.conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+                for table in ('makes', 'models', 'types', 'subtiers')}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Manage the SQLite vehicle catalog.')
+    parser.add_argument('--db', default=DB_PATH, help='database file (default data/catalog.db)')
+    sub = parser.add_subparsers(dest='command', required=True)
+    imp = sub.add_parser('import', help='load models.json into the database')
+    imp.add_argument('--data', default=DATA_PATH, help='models.json to import')
+    exp = sub.add_parser('export', help='regenerate models.json from the database')
+    exp.add_argument('--output', default=DATA_PATH, help='models.json to write')
+    find = sub.add_parser('search', help='full-text search over make and model names')
+    find.add_argument('term')
+    find.add_argument('--limit', type=int, default=20)
+    sub.add_parser('stats', help='row counts')
+    args = parser.parse_args(argv)
+    if args.command == 'export' and not os.path.exists(args.db):
+        print(f'{args.db} not found; run `db import` first')
+        return 1
+
+    with CatalogDB(args.db) as db:
+        if args.command == 'import':
+            changed = db.replace_all(load_models(args.data))
+            print(f'✓ Imported {args.data} into {args.db} ({changed} makes changed)')
+        elif args.command == 'export':
+            try:
+                db.export(args.output)
+            except ValueError as e:
+                print(f'Not exported: {e}')
+                return 1
+            print(f'✓ Exported {args.db} to {args.output}')
+        elif args.command == 'search':
+            for make, model, vtype in db.search(args.term, args.limit):
+                print(f'{make} {model} ({vtype})')
+        else:
+            for table, n in db.stats().items():
+                print(f'{table}: {n}')
+            if not db.fts:
+                print('(FTS5 unavailable; search uses LIKE)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
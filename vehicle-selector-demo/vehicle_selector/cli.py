@@ -0,0 +1,51 @@
+"""Single command-line entry point: `python -m vehicle_selector <command> [options]`.
+
+Each command lives in its own module, which is imported only when that
+command runs, so quick offline commands never load `requests` or the other
+network-side modules. `python -m vehicle_selector <command> --help` shows a
+command's options.
+"""
+import importlib
+import sys
+
+# command: (module, summary), in the order they are listed
+COMMANDS = {
+    'fetch': ('fetch_all_models', 'refresh data/models.json from VPIC for every make'),
+    'refresh': ('refresh_daemon', 'keep data/models.json fresh within a request budget, stalest makes first'),
+    'catalog': ('fetch_catalog', 'stream every VPIC make and model into data/models.full.json'),
+    'fill-placeholders': ('fetch_vpic', 'replace placeholder makes with VPIC models'),
+    'rebuild': ('rebuild_models', 'rebuild data/models.json from the curated catalog'),
+    'years': ('model_years', 'build the make/model/year-range catalog from VPIC'),
+    'build': ('build_dataset', 'build data/models.min.json for the selector page'),
+    'validate': ('validate', 'check catalog files for problems'),
+    'compile': ('binary_catalog', 'compile data/models.bin, the mmap-able catalog for services'),
+    'ingest': ('ingest_export', 'rebuild data/models.json from a local vPIC export'),
+    'db': ('catalog_db', 'manage the SQLite catalog (import, export, search, stats)'),
+    'package': ('package_assets', 'write hashed, precompressed assets to dist/'),
+    'serve': ('serve_api', 'serve the suggestion API'),
+    'search': ('search', 'check the indexed suggestion ranking against script.js'),
+    'standin': ('vpic_standin', 'record and replay VPIC responses with fault injection'),
+}
+
+
+def usage():
+    width = max(len(c) for c in COMMANDS)
+    lines = ['usage: python -m vehicle_selector <command> [options]', '', 'commands:']
+    lines += [f'  {command:<{width}}  {summary}' for command, (_, summary) in COMMANDS.items()]
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] in ('-h', '--help'):
+        print(usage())
+        return 0
+    command, rest = argv[0], argv[1:]
+    if command not in COMMANDS:
+        print(f'unknown command: {command}\n\n{usage()}', file=sys.stderr)
+        return 2
+
+    module = importlib.import_module(f'.{COMMANDS[command][0]}', __package__)
+    # Let the command's argparse name itself in usage and error messages.
+    sys.argv[0] = f'vehicle_selector {command}'
+    return module.main(rest) or 0
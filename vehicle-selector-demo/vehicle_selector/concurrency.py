@@ -0,0 +1,155 @@
+"""Adaptive limit on VPIC requests in flight, driven by latency and throttling.
+
+Instead of fixed sleeps and a hand-picked request rate, `AdaptiveConcurrency`
+finds how much concurrency VPIC is handling well at the moment, with AIMD
+(additive increase, multiplicative decrease):
+
+- every successful response that arrives while the limit is in use raises
+  the limit by 1/limit, so it grows by about one per round trip while
+  latency stays flat;
+- a 429, a 5xx or a connection failure multiplies it by `backoff` (0.5),
+  at most once per round trip so one burst of errors counts once;
+- so does rising tail latency: the p90 of each `sample` responses is compared
+  with a baseline (the lowest p90 seen), and a p90 more than `tolerance` times the baseline cuts the
+  limit by `latency_backoff` (0.75) and holds it there until the tail
+  recovers. If the tail stays high even at `min_limit`, VPIC itself got
+  slower and that p90 becomes the new baseline.
+
+`VPICClient(concurrency=...)` holds a slot for each HTTP attempt, so retries
+and backoff sleeps are not counted as in flight. The limit stays within
+[`min_limit`, `max_limit`]; `max_limit` is normally the worker count.
+`report` and `summary` give the limit it settled on, its average and range,
+and how often it was cut.
+"""
+import collections
+import threading
+import time
+
+from .ratelimit import TokenBucket
+
+DEFAULT_INITIAL = 2
+DEFAULT_BACKOFF = 0.5  # limit multiplier on a 429, 5xx or connection failure
+DEFAULT_LATENCY_BACKOFF = 0.75  # limit multiplier when tail latency rises
+DEFAULT_TOLERANCE = 2.0  # p90 / baseline p90 ratio treated as rising latency
+DEFAULT_SAMPLE = 20  # responses per latency window
+THROTTLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+class AdaptiveConcurrency:
+    """Thread-safe AIMD limit on concurrent requests."""
+
+    def __init__(self, max_limit, min_limit=1, initial=DEFAULT_INITIAL, backoff=DEFAULT_BACKOFF,
+                 latency_backoff=DEFAULT_LATENCY_BACKOFF, tolerance=DEFAULT_TOLERANCE, sample=DEFAULT_SAMPLE):
+        if max_limit < min_limit or min_limit < 1:
+            raise ValueError('need 1 <= min_limit <= max_limit')
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(max(min_limit, min(initial, max_limit)))
+        self.backoff = backoff
+        self.latency_backoff = latency_backoff
+        self.tolerance = tolerance
+        self.sample = sample
+        self.inflight = 0
+        self.window = []
+        self.baseline = None  # reference p90, seconds
+        self.rtt = None  # smoothed latency, seconds
+        self.last_cut = 0.0
+        self.cond = threading.Condition()
+        self.stats = {'responses': 0, 'throttled': 0, 'cuts': 0, 'latency_cuts': 0}
+        self.seen = collections.Counter()  # whole limit -> responses completed at it
+        self.low = self.high = int(self.limit)
+
+    def acquire(self):
+        """Block until a request slot is free, then take it."""
+        with self.cond:
+            while self.inflight >= int(self.limit):
+                self.cond.wait()
+            self.inflight += 1
+
+    def release(self, seconds=None, status=None, error=None):
+        """Free a slot and adapt the limit to how the attempt went.
+
+        `seconds` is the attempt's latency; without it (the attempt was
+        abandoned locally) the slot is freed and nothing is learned.
+        """
+        with self.cond:
+            busy = self.inflight >= int(self.limit)
+            self.inflight -= 1
+            if seconds is not None:
+                self._update(seconds, status, error, busy)
+            self.cond.notify_all()
+
+    def _cut(self, factor, now):
+        self.limit = max(float(self.min_limit), self.limit * factor)
+        self.last_cut = now
+        self.stats['cuts'] += 1
+
+    def _update(self, seconds, status, error, busy):
+        now = time.monotonic()
+        self.stats['responses'] += 1
+        self.seen[int(self.limit)] += 1
+        # Cut at most once per round trip: the attempts in flight when the
+        # first error came back were sent at the old limit.
+        recently_cut = now - self.last_cut < (self.rtt or seconds)
+        if error is not None or status in THROTTLE_STATUSES:
+            self.stats['throttled'] += 1
+            if not recently_cut:
+                self._cut(self.backoff, now)
+            self._track()
+            return
+
+        self.rtt = seconds if self.rtt is None else 0.8 * self.rtt + 0.2 * seconds
+        self.window.append(seconds)
+        if len(self.window) >= self.sample:
+            p90 = sorted(self.window)[int(0.9 * (len(self.window) - 1))]
+            self.window = []
+            if self.baseline is None or p90 < self.baseline:
+                self.baseline = p90
+            elif p90 > self.tolerance * self.baseline:
+                if self.limit <= self.min_limit:
+                    # Slow even one at a time: VPIC itself got slower, so adopt the new level.
+                    self.baseline = p90
+                else:
+                    if not recently_cut:
+                        self._cut(self.latency_backoff, now)
+                        self.stats['latency_cuts'] += 1
+                    self._track()
+                    return
+        # Only grow while the limit is what holds requests back.
+        if busy:
+            self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+        self._track()
+
+    def _track(self):
+        self.low = min(self.low, int(self.limit))
+        self.high = max(self.high, int(self.limit))
+
+    def summary(self):
+        with self.cond:
+            total = sum(self.seen.values())
+            return {
+                'limit': int(self.limit),
+                'average_limit': round(sum(k * n for k, n in self.seen.items()) / total, 2) if total else None,
+                'lowest_limit': self.low,
+                'highest_limit': self.high,
+                'baseline_p90_seconds': None if self.baseline is None else round(self.baseline, 6),
+                **self.stats,
+            }
+
+    def report(self):
+        s = self.summary()
+        average = '' if s['average_limit'] is None else f", average {s['average_limit']:g}"
+        return (f"Concurrency: settled at {s['limit']} in flight{average} (range {s['lowest_limit']}-"
+                f"{s['highest_limit']} of {self.max_limit}); {s['cuts']} cuts ({s['latency_cuts']} for latency, "
+                f"{s['throttled']} throttled responses)")
+
+
+def request_controls(workers, rate=None, adaptive=True):
+    """(limiter, concurrency) for a script's --workers, --rate and --fixed-concurrency options.
+
+    `rate` is an optional hard cap in requests per second; without
+    `adaptive`, all `workers` requests may be in flight at once.
+    """
+    limiter = TokenBucket(rate, burst=workers) if rate else None
+    concurrency = AdaptiveConcurrency(max(1, workers)) if adaptive else None
+    return limiter, concurrency
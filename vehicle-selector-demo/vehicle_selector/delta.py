@@ -0,0 +1,90 @@
+"""Upstream change detection and model diffs for delta refreshes.
+
+A digest of each make's raw VPIC `Results` is kept between runs. When the
+digest is unchanged, the make's existing entries are kept as they are instead
+of being rebuilt. Every run also reports which models were added, removed or
+reclassified, per make, in a machine-readable diff.
+"""
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+
+from .models_io import write_models
+
+
+def results_digest(results):
+    """Stable content hash of a make's upstream `Results` rows."""
+    canonical = json.dumps(results, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class DigestStore:
+    """{make: digest} persisted as a JSON file."""
+
+    def __init__(self, path):
+        self.path = path
+        self.digests = {}
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.digests = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.digests = {}
+        return self.digests
+
+    def get(self, make):
+        return self.digests.get(make)
+
+    def update(self, digests):
+        self.digests.update(digests)
+
+    def save(self):
+        write_models(self.path, dict(sorted(self.digests.items())))
+
+
+def diff_models(old_models, new_models):
+    """Compare two entry lists for one make by model name."""
+    old = {m['name']: m for m in old_models or []}
+    new = {m['name']: m for m in new_models or []}
+    reclassified = []
+    for name, m in new.items():
+        prev = old.get(name)
+        if prev is not None and (prev.get('type') != m.get('type') or prev.get('subtiers') != m.get('subtiers')):
+            reclassified.append({
+                'name': name,
+                'old_type': prev.get('type'),
+                'new_type': m.get('type'),
+                'old_subtiers': prev.get('subtiers'),
+                'new_subtiers': m.get('subtiers'),
+            })
+    return {
+        'added': [name for name in new if name not in old],
+        'removed': [name for name in old if name not in new],
+        'reclassified': reclassified,
+    }
+
+
+def build_diff(old_data, new_items):
+    """Diff every make whose entries changed; returns the diff document."""
+    makes = {}
+    for make, models in new_items:
+        prev = old_data.get(make)
+        if prev == models:
+            continue
+        makes[make] = diff_models(prev, models)
+    return {
+        'generated_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'changed_makes': len(makes),
+        'added': sum(len(d['added']) for d in makes.values()),
+        'removed': sum(len(d['removed']) for d in makes.values()),
+        'reclassified': sum(len(d['reclassified']) for d in makes.values()),
+        'makes': makes,
+    }
+
+
+def diff_path(data_path):
+    """Where the diff for `data_path` is written (data/models.diff.json)."""
+    root, ext = os.path.splitext(data_path)
+    return f'{root}.diff{ext}'
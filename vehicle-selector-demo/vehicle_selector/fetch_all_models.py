@@ -0,0 +1,307 @@
+"""Fetch real models from NHTSA VPIC for ALL makes and populate data/models.json comprehensively.
+
+Usage:
+  python -m vehicle_selector fetch [--workers N] [--rate REQ_PER_SEC] [--fixed-concurrency] [--no-cache] [--resume]
+      [--delta] [--db PATH] [--no-type-lookup]
+
+Makes are fetched concurrently by a bounded thread pool, and results are
+assembled in the original make order so the output is identical to a serial
+run. How many requests are in flight (up to --workers) adapts to VPIC's
+latency and 429s (see concurrency.py); `--rate` adds a fixed cap on requests
+per second. Raw responses are cached
+on disk (see vpic_cache.py), so reruns only hit the network for stale entries.
+
+Every fetched make is also appended to a journal as soon as it completes. If a
+run is interrupted, `--resume` skips the journaled makes and fetches only the
+rest; the journal is removed once models.json has been written.
+
+A digest of each make's upstream results is kept between runs. With `--delta`,
+makes whose digest is unchanged keep their existing entries untouched, and if
+nothing changed at all models.json is not rewritten. Every run writes
+data/models.diff.json listing added, removed and reclassified models per make.
+
+Models the name heuristics leave Unknown or match only weakly get their type
+from VPIC (see type_lookup.py), on the same workers and under the same rate
+limit; `--no-type-lookup` skips that.
+
+After models.json is written, the per-make shards the selector page loads
+(data/makes.json and data/shards/, see build_dataset.py) are brought up to
+date; only the shards of makes that changed are rewritten.
+
+With `--db PATH`, every make is also upserted into the SQLite catalog (see
+catalog_db.py) as soon as its result arrives.
+
+Each run records request latency, bytes, retries, errors and phase times (see
+metrics.py) to .cache/metrics/fetch.json and fetch.prom.
+"""
+import argparse
+import collections
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from .build_dataset import publish_models
+from .catalog_db import CatalogDB
+from .concurrency import request_controls
+from .delta import DigestStore, build_diff, diff_path, results_digest
+from .journal import RunJournal
+from .metrics import METRICS_DIR, RunMetrics
+from .models_io import backup_models, load_models, write_models
+from .normalize import build_entries
+from .type_lookup import TYPES_PATH, TypeResolver, TypeStore
+from .vpic_cache import DEFAULT_TTL, ResponseCache
+from .vpic_client import VPIC_BASE, VPICClient, model_names
+
+BASE = os.path.dirname(os.path.dirname(__file__))
+DATA_PATH = os.path.join(BASE, 'data', 'models.json')
+BACKUP_PATH = DATA_PATH + '.bak'
+JOURNAL_PATH = os.path.join(BASE, '.cache', 'fetch_all_models.journal.jsonl')
+DIGESTS_PATH = os.path.join(BASE, '.cache', 'upstream_digests.json')
+
+DEFAULT_WORKERS = 8
+
+def _outcome(make, future):
+    try:
+        return make, future.result(), None
+    except Exception as e:
+        return make, None, e
+
+
+def fetch_all(makes, fetch, workers=DEFAULT_WORKERS, window=None):
+    """Run `fetch(make)` for every make concurrently on a bounded thread pool.
+
+    Yields (make, result, error) tuples in the order of `makes`, as soon as each
+    result (and every result before it) is available. `makes` may be any
+    iterable. At most `window` (default 4 x workers) makes are submitted ahead
+    of the one being yielded, so finished results never pile up in memory.
+    """
+    workers = max(1, workers)
+    window = window or 4 * workers
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = collections.deque()
+        for make in makes:
+            pending.append((make, pool.submit(fetch, make)))
+            if len(pending) >= window:
+                yield _outcome(*pending.popleft())
+        while pending:
+            yield _outcome(*pending.popleft())
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Refresh data/models.json from NHTSA VPIC.')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'max concurrent requests in flight (default {DEFAULT_WORKERS})')
+    parser.add_argument('--rate', type=float,
+                        help='hard cap on requests per second across all workers (default: none)')
+    parser.add_argument('--fixed-concurrency', action='store_true',
+                        help='keep --workers requests in flight instead of adapting to VPIC (see concurrency.py)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='bypass the on-disk response cache')
+    parser.add_argument('--cache-ttl', type=float, default=DEFAULT_TTL,
+                        help=f'seconds before a cached response is revalidated (default {DEFAULT_TTL})')
+    parser.add_argument('--resume', action='store_true',
+                        help='skip makes journaled by an interrupted run and fetch only the rest')
+    parser.add_argument('--vpic-base', default=VPIC_BASE,
+                        help='VPIC API base URL (e.g. a local stand-in for testing)')
+    parser.add_argument('--delta', action='store_true',
+                        help='keep makes whose upstream results are unchanged, and skip the write if nothing changed')
+    parser.add_argument('--db', help='also upsert every make into this SQLite catalog (see catalog_db.py)')
+    parser.add_argument('--no-type-lookup', action='store_true',
+                        help='keep heuristic types instead of asking VPIC about Unknown and low-confidence models')
+    parser.add_argument('--metrics-dir', default=METRICS_DIR,
+                        help='where to write the run metrics (default .cache/metrics)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if not os.path.exists(DATA_PATH):
+        print('data/models.json not found')
+        return
+
+    metrics = RunMetrics('fetch')
+    with metrics.phase('load'):
+        old_data = load_models(DATA_PATH)
+
+        # Get all makes from old data
+        makes = list(old_data.keys())
+
+        digests = DigestStore(DIGESTS_PATH)
+        digests.load()
+        new_digests = {}
+
+        journal = RunJournal(JOURNAL_PATH)
+        done = {}
+        if args.resume:
+            for make, entry in journal.load().items():
+                if make in old_data:
+                    done[make] = entry['models']
+                    if entry.get('digest'):
+                        new_digests[make] = entry['digest']
+    if done:
+        print(f'Resuming: {len(done)} makes already journaled')
+    journal.open(resume=args.resume)
+
+    pending = [make for make in makes if make not in done]
+    print(f'Fetching real models for {len(pending)} makes from VPIC ({pacing(args)})...')
+
+    fresh = {}
+    fetched_count = 0
+    skipped_count = 0
+    unchanged_count = 0
+    type_failures = 0
+
+    cache = None if args.no_cache else ResponseCache(ttl=args.cache_ttl)
+    metrics.cache = cache
+    limiter, concurrency = request_controls(args.workers, args.rate, not args.fixed_concurrency)
+    metrics.concurrency = concurrency
+    client = VPICClient(base=args.vpic_base, limiter=limiter, concurrency=concurrency,
+                        cache=cache, pool_size=args.workers, metrics=metrics)
+    resolver = None
+    if not args.no_type_lookup:
+        resolver = TypeResolver(client, TypeStore(TYPES_PATH, client.base).load())
+
+    def fetch_make(make):
+        # Runs on a worker thread: journal each make the moment it completes,
+        # so one slow make cannot hold back the checkpoints of the others.
+        results = client.get_make_results(make)
+        digest = results_digest(results)
+        unchanged = args.delta and make in old_data and digests.get(make) == digest
+        type_error = None
+        if unchanged:
+            entries = old_data[make]
+        else:
+            with metrics.phase('classify'):
+                entries = build_entries(model_names(results))
+            if resolver is not None:
+                with metrics.phase('types'):
+                    try:
+                        resolver.resolve(make, entries)
+                    except Exception as e:
+                        # The listing is good: keep its heuristic types, and drop the
+                        # digest so the next --delta run classifies the make again.
+                        type_error = e
+                        digest = None
+        if entries:
+            journal.record(make, entries, digest)
+        return entries, digest, unchanged, type_error
+
+    db = CatalogDB(args.db) if args.db else None
+    positions = {make: i for i, make in enumerate(makes)}
+    if db is not None:
+        for make, models in done.items():
+            db.upsert_make(make, models, positions[make])
+
+    with metrics.phase('fetch'):
+        results = fetch_all(pending, fetch_make, workers=args.workers)
+        for i, (make, result, error) in enumerate(results, 1):
+            print(f'[{i}/{len(pending)}] {make}...', end=' ', flush=True)
+            if error is not None:
+                print(f'ERROR: {error}')
+                # Keep old data as fallback
+                fresh[make] = old_data.get(make, [{"name": "Standard Model", "type": "Unknown", "subtiers": ["Standard"]}])
+                skipped_count += 1
+                continue
+
+            new_models, digest, unchanged, type_error = result
+            if not new_models:
+                print('no models')
+                # Keep old data as fallback
+                fresh[make] = old_data.get(make, [{"name": "Standard Model", "type": "Unknown", "subtiers": ["Standard"]}])
+                skipped_count += 1
+                continue
+
+            fresh[make] = new_models
+            new_digests[make] = digest
+            if db is not None:
+                db.upsert_make(make, new_models, positions[make])
+            if unchanged:
+                unchanged_count += 1
+                print(f'unchanged ({len(new_models)} models)')
+                continue
+            fetched_count += 1
+            if type_error is not None:
+                type_failures += 1
+                print(f'{len(new_models)} models (type lookup failed, heuristic types kept: {type_error})')
+                continue
+            print(f'{len(new_models)} models')
+    client.close()
+    if db is not None:
+        db.close()
+    if resolver is not None:
+        resolver.store.save()
+        metrics.count('types_checked', resolver.stats['checked'])
+        metrics.count('types_changed', resolver.stats['changed'])
+        metrics.count('types_failed', type_failures)
+    metrics.count('makes_fetched', fetched_count)
+    metrics.count('makes_unchanged', unchanged_count)
+    metrics.count('makes_kept', skipped_count)
+    metrics.count('makes_resumed', len(done))
+
+    # Compact journaled and freshly fetched makes, in the original order
+    with metrics.phase('diff'):
+        merged = [(make, done[make] if make in done else fresh[make]) for make in makes]
+        diff = build_diff(old_data, merged)
+        write_models(diff_path(DATA_PATH), diff)
+
+    if args.delta and not diff['changed_makes']:
+        with metrics.phase('write'):
+            digests.update(new_digests)
+            digests.save()
+            journal.discard()
+        print('\n✓ No upstream changes; data/models.json left untouched')
+        print(f'  Unchanged makes: {unchanged_count}')
+        if resolver is not None:
+            print(f'  {resolver.report()}')
+        if cache is not None:
+            print(f'  {cache.report()}')
+        if concurrency is not None:
+            print(f'  {concurrency.report()}')
+        write_metrics(metrics, args.metrics_dir)
+        return
+
+    # Backup current state, then replace it
+    with metrics.phase('backup'):
+        backup_models(DATA_PATH, BACKUP_PATH)
+    print('Backup written to', BACKUP_PATH)
+    with metrics.phase('write'):
+        shards = publish_models(DATA_PATH, merged)
+        digests.update(new_digests)
+        digests.save()
+        journal.discard()
+    metrics.count('shards_written', shards['written'])
+    metrics.count('models_written', sum(len(models) for _, models in merged))
+
+    print(f'\n✓ Updated data/models.json')
+    if done:
+        print(f'  Resumed {len(done)} makes from the journal')
+    print(f'  Fetched real models for {fetched_count} makes')
+    if args.delta:
+        print(f'  Unchanged upstream for {unchanged_count} makes')
+    print(f'  Kept/fallback for {skipped_count} makes')
+    print(f'  Total makes: {len(makes)}')
+    print(f"  Diff: +{diff['added']} -{diff['removed']} ~{diff['reclassified']} models "
+          f"in {diff['changed_makes']} makes ({os.path.basename(diff_path(DATA_PATH))})")
+    print(f"  Shards: {shards['written']} written, {shards['unchanged']} unchanged, {shards['removed']} removed")
+    if resolver is not None:
+        print(f'  {resolver.report()}')
+    if cache is not None:
+        print(f'  {cache.report()}')
+    if concurrency is not None:
+        print(f'  {concurrency.report()}')
+    write_metrics(metrics, args.metrics_dir)
+
+
+def pacing(args):
+    """How a run's requests are paced, for its start-up line."""
+    text = f'up to {args.workers} in flight' + (', fixed' if args.fixed_concurrency else ', adaptive')
+    return text + (f', {args.rate:g} req/s max' if args.rate else '')
+
+
+def write_metrics(metrics, directory):
+    json_path, _ = metrics.write(directory)
+    print(f'  {metrics.report()}')
+    print(f'  Metrics written to {os.path.dirname(json_path)}')
+
+if __name__ == '__main__':
+    main()
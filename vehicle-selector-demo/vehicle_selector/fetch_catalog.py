@@ -0,0 +1,216 @@
+"""Stream the full VPIC catalog: every make VPIC knows, every model, no per-make cap.
+
+Usage:
+  python -m vehicle_selector catalog [--vehicle-types car,truck,trailer] [--output data/models.full.json]
+      [--workers N] [--rate REQ_PER_SEC] [--fixed-concurrency] [--no-cache] [--vpic-base URL] [--limit N] [--type-lookup] [--db PATH]
+
+`fetch` only refreshes the makes already in data/models.json. This discovers
+makes through VPIC's make listings instead: GetAllMakes by default, or
+GetMakesForVehicleType for each of `--vehicle-types`, which keeps a run to,
+say, the truck and trailer makes (Freightliner, Hino, Great Dane...).
+
+Each make's models come from GetModelsForMakeId (an exact match, unlike
+GetModelsForMake's make-name search), go through the same collapsing and
+classification as `fetch` (normalize.build_entries, without the 200-model
+cap unless `--limit` is given), and are streamed straight into the output
+file. Makes are fetched on a bounded thread pool, with the requests in flight
+adapting to VPIC (see concurrency.py), and written in name order as they
+complete, so only a few makes' models are ever held in memory, however large
+the catalog. Makes with no models are left out. A make whose requests fail
+keeps its entry from the previous file, so a transient error does not drop
+it from the catalog: the first failure indexes where each make starts in
+<output>.bak, and each failed make's entry alone is read back from there.
+
+Make names keep the spelling data/models.json uses for them, and VPIC's own
+(often upper-case) spelling otherwise. The output is written atomically and
+the previous file is kept as <output>.bak.
+
+Responses are cached in their own directory, .cache/vpic-catalog/, whose
+entry cap is raised to fit every request of the run, so a rerun within the
+cache TTL is answered from disk instead of evicting the entries it is about
+to need (and without evicting `fetch`'s entries in .cache/vpic/).
+"""
+import argparse
+import os
+import sys
+
+from .concurrency import request_controls
+from .fetch_all_models import fetch_all, pacing
+from .metrics import METRICS_DIR, RunMetrics
+from .models_io import backup_models, index_models, load_make, load_models, write_models
+from .normalize import build_entries
+from .type_lookup import TYPES_PATH, TypeResolver, TypeStore
+from .vpic_cache import DEFAULT_MAX_ENTRIES, DEFAULT_TTL, ResponseCache
+from .vpic_client import VPIC_BASE, VPICClient, model_names
+
+BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_PATH = os.path.join(BASE, 'data', 'models.json')
+OUTPUT_PATH = os.path.join(BASE, 'data', 'models.full.json')
+CACHE_DIR = os.path.join(BASE, '.cache', 'vpic-catalog')
+
+DEFAULT_WORKERS = 8
+PROGRESS_EVERY = 250  # makes
+TYPE_LOOKUP_REQUESTS = 5  # per make: GetVehicleTypesForMake plus a few per-type listings
+
+
+def discover_makes(client, vehicle_types=None):
+    """[(VPIC make name, [make ids])] for every make listed, sorted by name.
+
+    Makes VPIC lists more than once under the same name (different ids) are
+    merged into one entry.
+    """
+    if vehicle_types:
+        rows = [(r.get('MakeId'), r.get('MakeName')) for t in vehicle_types
+                for r in client.get_makes_for_vehicle_type(t)]
+    else:
+        rows = [(r.get('Make_ID'), r.get('Make_Name')) for r in client.get_all_makes()]
+    makes = {}
+    for make_id, name in rows:
+        name = ' '.join((name or '').split())
+        if make_id is None or not name:
+            continue
+        ids = makes.setdefault(name.casefold(), (name, []))[1]
+        if make_id not in ids:
+            ids.append(make_id)
+    return sorted(makes.values(), key=lambda item: item[0].casefold())
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Stream every VPIC make and model into a full catalog.')
+    parser.add_argument('--vehicle-types',
+                        help='comma-separated VPIC vehicle types to list makes for (default: all makes)')
+    parser.add_argument('--output', default=OUTPUT_PATH, help='catalog to write (default data/models.full.json)')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'max concurrent requests in flight (default {DEFAULT_WORKERS})')
+    parser.add_argument('--rate', type=float,
+                        help='hard cap on requests per second across all workers (default: none)')
+    parser.add_argument('--fixed-concurrency', action='store_true',
+                        help='keep --workers requests in flight instead of adapting to VPIC (see concurrency.py)')
+    parser.add_argument('--no-cache', action='store_true', help='bypass the on-disk response cache')
+    parser.add_argument('--cache-ttl', type=float, default=DEFAULT_TTL,
+                        help=f'seconds before a cached response is revalidated (default {DEFAULT_TTL})')
+    parser.add_argument('--vpic-base', default=VPIC_BASE, help='VPIC API base URL (e.g. a local stand-in)')
+    parser.add_argument('--limit', type=int, help='keep at most this many models per make (default: all)')
+    parser.add_argument('--type-lookup', action='store_true',
+                        help='also ask VPIC for Unknown and low-confidence types (a few more requests per make)')
+    parser.add_argument('--db', help='also upsert every make into this SQLite catalog (see catalog_db.py)')
+    parser.add_argument('--metrics-dir', default=METRICS_DIR,
+                        help='where to write the run metrics (default .cache/metrics)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    metrics = RunMetrics('catalog')
+    cache = None if args.no_cache else ResponseCache(CACHE_DIR, ttl=args.cache_ttl)
+    metrics.cache = cache
+    limiter, concurrency = request_controls(args.workers, args.rate, not args.fixed_concurrency)
+    metrics.concurrency = concurrency
+    client = VPICClient(base=args.vpic_base, limiter=limiter, concurrency=concurrency,
+                        cache=cache, pool_size=args.workers, metrics=metrics)
+    resolver = TypeResolver(client, TypeStore(TYPES_PATH, client.base).load()) if args.type_lookup else None
+
+    vehicle_types = [t.strip() for t in (args.vehicle_types or '').split(',') if t.strip()]
+    with metrics.phase('discover'):
+        makes = discover_makes(client, vehicle_types)
+    if not makes:
+        print('VPIC listed no makes')
+        return 1
+    if cache is not None:
+        per_make = TYPE_LOOKUP_REQUESTS if args.type_lookup else 0
+        needed = sum(len(ids) + per_make for _, ids in makes) + len(vehicle_types) + 1
+        cache.max_entries = max(cache.max_entries, needed + DEFAULT_MAX_ENTRIES // 10)
+    # Only the names are kept from the page catalog, to reuse its spellings.
+    known = {}
+    if os.path.exists(DATA_PATH):
+        known = {make.casefold(): make for make in load_models(DATA_PATH)}
+    print(f'Streaming {len(makes)} makes from VPIC ({pacing(args)})...')
+
+    def fetch_make(task):
+        name, ids = task
+        names = []
+        for make_id in ids:
+            names.extend(model_names(client.get_make_id_results(make_id)))
+        with metrics.phase('classify'):
+            entries = build_entries(names, limit=args.limit)
+        if resolver is not None and entries:
+            with metrics.phase('types'):
+                resolver.resolve(name, entries)
+        return entries
+
+    db = None
+    if args.db:
+        from .catalog_db import CatalogDB
+        db = CatalogDB(args.db)
+    stats = {'written': 0, 'models': 0, 'empty': 0, 'failed': [], 'kept': 0}
+    backup_path = args.output + '.bak'
+    previous = None  # {casefolded make: (make, span)} in the backup, indexed on the first failure
+
+    def previous_entry(make):
+        nonlocal previous
+        if previous is None:
+            previous = {}
+            if os.path.exists(backup_path):
+                previous = {m.casefold(): (m, span) for m, span in index_models(backup_path).items()}
+        if make.casefold() not in previous:
+            return None
+        make, span = previous[make.casefold()]
+        return make, load_make(backup_path, span)
+
+    def records():
+        for i, ((name, _), entries, error) in enumerate(fetch_all(makes, fetch_make, workers=args.workers), 1):
+            make = known.get(name.casefold(), name)
+            if error is not None:
+                stats['failed'].append(name)
+                kept = previous_entry(make)
+                print(f'  {name}: ERROR: {error}' + ('; keeping the previous entry' if kept else ''))
+                if kept:
+                    # Keep the previous file's spelling and entries; the run still exits non-zero.
+                    make, entries = kept
+                    stats['kept'] += 1
+            if error is None and not entries:
+                stats['empty'] += 1
+            elif entries:
+                if db is not None:
+                    db.upsert_make(make, entries, stats['written'])
+                stats['written'] += 1
+                stats['models'] += len(entries)
+                yield make, entries
+            if i % PROGRESS_EVERY == 0 or i == len(makes):
+                print(f"  {i}/{len(makes)} makes, {stats['written']} written, {stats['models']} models")
+
+    if os.path.exists(args.output):
+        backup_models(args.output, backup_path)
+    try:
+        with metrics.phase('fetch'):
+            write_models(args.output, records())
+    finally:
+        client.close()
+        if db is not None:
+            db.close()
+        if resolver is not None:
+            resolver.store.save()
+
+    print(f'\n✓ Wrote {args.output}')
+    print(f"  Makes: {stats['written']} with models, {stats['empty']} without (left out), "
+          f"{len(stats['failed'])} failed ({stats['kept']} kept from the previous file)")
+    print(f"  Models: {stats['models']}")
+    print(f'  Size: {os.path.getsize(args.output):,} bytes')
+    if resolver is not None:
+        print(f'  {resolver.report()}')
+    if cache is not None:
+        print(f'  {cache.report()}')
+    if concurrency is not None:
+        print(f'  {concurrency.report()}')
+    metrics.count('makes_written', stats['written'])
+    metrics.count('makes_empty', stats['empty'])
+    metrics.count('makes_failed', len(stats['failed']))
+    metrics.count('makes_kept', stats['kept'])
+    metrics.count('models_written', stats['models'])
+    metrics.write(args.metrics_dir)
+    print(f'  {metrics.report()}')
+    return 1 if stats['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""Fetch models for makes from NHTSA VPIC and replace placeholders in data/models.json.
+
+Usage:
+  python -m vehicle_selector fill-placeholders [--no-cache] [--workers N] [--rate REQ_PER_SEC] [--fixed-concurrency]
+      [--no-type-lookup]
+
+Notes:
+- This script updates `data/models.json` in place (creates a backup `models.json.bak`).
+- Vehicle types come from the name heuristics in vehicle_types.py; models they leave Unknown or match only weakly are then looked up in VPIC (see type_lookup.py), concurrently under the --rate limit, with answers cached permanently.
+- Spelling variants of a model are collapsed into one entry with `aliases` (see normalize.py).
+- Placeholder makes are fetched concurrently; the number of requests in flight (up to --workers) adapts to VPIC's latency and 429s (see concurrency.py) instead of pausing between makes.
+- Requests go through the shared client in vpic_client.py (pooled connections, retries, circuit breaker).
+- Raw responses are cached on disk (see vpic_cache.py); pass --no-cache to bypass.
+- Request and phase metrics are written to .cache/metrics/fill-placeholders.json and .prom (see metrics.py).
+"""
+import argparse
+import os
+
+from .build_dataset import publish_models
+from .concurrency import request_controls
+from .fetch_all_models import TYPES_PATH, fetch_all, pacing
+from .metrics import METRICS_DIR, RunMetrics
+from .models_io import backup_models, load_models
+from .normalize import build_entries
+from .type_lookup import TypeResolver, TypeStore
+from .vpic_cache import ResponseCache
+from .vpic_client import VPICClient
+
+BASE = os.path.dirname(os.path.dirname(__file__))
+DATA_PATH = os.path.join(BASE, 'data', 'models.json')
+BACKUP_PATH = DATA_PATH + '.bak'
+
+DEFAULT_WORKERS = 8
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Replace placeholder makes in data/models.json with VPIC models.')
+    parser.add_argument('--no-cache', action='store_true', help='bypass the on-disk response cache')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'max concurrent requests in flight (default {DEFAULT_WORKERS})')
+    parser.add_argument('--rate', type=float,
+                        help='hard cap on requests per second across all workers (default: none)')
+    parser.add_argument('--fixed-concurrency', action='store_true',
+                        help='keep --workers requests in flight instead of adapting to VPIC (see concurrency.py)')
+    parser.add_argument('--no-type-lookup', action='store_true',
+                        help='keep heuristic types instead of asking VPIC about Unknown and low-confidence models')
+    parser.add_argument('--metrics-dir', default=METRICS_DIR,
+                        help='where to write the run metrics (default .cache/metrics)')
+    args = parser.parse_args(argv)
+    metrics = RunMetrics('fill-placeholders')
+
+    if not os.path.exists(DATA_PATH):
+        print('data/models.json not found at', DATA_PATH)
+        return
+
+    with metrics.phase('load'):
+        data = load_models(DATA_PATH)
+
+    # Backup
+    with metrics.phase('backup'):
+        backup_models(DATA_PATH, BACKUP_PATH)
+    print('Backup written to', BACKUP_PATH)
+
+    replaced = {}
+    makes = list(data.keys())
+    print('Found', len(makes), 'makes in models.json')
+
+    placeholders = []
+    for make in makes:
+        models = data.get(make) or []
+        # Determine if it's placeholder: has exactly 1 model AND (name is "Standard Model" OR type is "Unknown")
+        is_placeholder = False
+        if len(models) == 1:
+            model_name = models[0].get('name', '').lower().strip()
+            model_type = models[0].get('type', '').lower().strip()
+            # Single-entry placeholders: name "standard model" or type "unknown"
+            if model_name == 'standard model' or model_type == 'unknown':
+                is_placeholder = True
+
+        if is_placeholder:
+            placeholders.append(make)
+    print(f'Fetching models for {len(placeholders)} placeholder makes ({pacing(args)})...')
+
+    cache = None if args.no_cache else ResponseCache()
+    metrics.cache = cache
+    limiter, concurrency = request_controls(args.workers, args.rate, not args.fixed_concurrency)
+    metrics.concurrency = concurrency
+    client = VPICClient(limiter=limiter, concurrency=concurrency, cache=cache,
+                        pool_size=args.workers, metrics=metrics)
+    try:
+        with metrics.phase('fetch'):
+            results = fetch_all(placeholders, client.get_models_for_make, workers=args.workers)
+            for i, (make, fetched, error) in enumerate(results, 1):
+                print(f'[{i}/{len(placeholders)}] {make}:', end=' ')
+                if error is not None:
+                    print('failed to fetch models —', error)
+                    metrics.count('makes_failed')
+                    continue
+
+                if not fetched:
+                    print('no models returned')
+                    continue
+
+                # Collapse spelling variants and keep the best-ranked models (at most 200)
+                with metrics.phase('classify'):
+                    new_models = build_entries(fetched)
+
+                if new_models:
+                    data[make] = new_models
+                    replaced[make] = new_models
+                    metrics.count('makes_replaced')
+                    print('replaced placeholder with', len(new_models), 'models')
+                else:
+                    print('no usable models')
+
+        if replaced and not args.no_type_lookup:
+            resolver = TypeResolver(client, TypeStore(TYPES_PATH, client.base).load())
+            print(f'Checking types of {len(replaced)} makes against VPIC...')
+            with metrics.phase('types'):
+                for make, _, error in fetch_all(list(replaced), lambda m: resolver.resolve(m, replaced[m]),
+                                                workers=args.workers):
+                    if error is not None:
+                        print('  Type lookup failed for', make, ' — ', error)
+            resolver.store.save()
+            metrics.count('types_checked', resolver.stats['checked'])
+            metrics.count('types_changed', resolver.stats['changed'])
+            print(resolver.report())
+    finally:
+        client.close()
+
+    if replaced:
+        with metrics.phase('write'):
+            publish_models(DATA_PATH, data)
+        print('Updated data/models.json and its shards')
+    else:
+        print('No updates made (no placeholders found or fetch failed)')
+    if cache is not None:
+        print(cache.report())
+    if concurrency is not None:
+        print(concurrency.report())
+    metrics.write(args.metrics_dir)
+    print(metrics.report())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,228 @@
+"""Build data/models.json from a local vPIC data export instead of the API.
+
+Usage:
+  python -m vehicle_selector ingest FLAT.csv [--all-makes] [--delimiter ,]
+  python -m vehicle_selector ingest --make-table Make.csv --model-table Model.csv --make-model-table Make_Model.csv
+
+NHTSA publishes the whole vPIC database for download. Two layouts are read:
+- a flat file with one (make, model) pair per row; the make and model columns
+  are found by header name (Make_Name/MakeName/Make, Model_Name/ModelName/Model);
+- the Make, Model and Make_Model tables dumped to flat files (Id/Name columns,
+  and MakeId/ModelId in the link table), joined while streaming the link table.
+
+`.gz` inputs are decompressed on the fly, `.tsv` files are read tab-separated,
+and `--delimiter` overrides either. Rows are streamed in one pass; memory is
+bounded by the distinct make/model names, not by the size of the export.
+Spelling variants are collapsed and ranked by normalize.py.
+
+By default only the makes already in models.json are rebuilt, keeping their
+order and falling back to the existing entries for makes the export does not
+list. `--all-makes` adds every other make in the export, sorted by name.
+Models are classified with vehicle_types.py and written in the usual shape,
+with a backup and a models.diff.json, exactly like fetch_all_models.py.
+With `--db PATH` the SQLite catalog (catalog_db.py) is updated as well.
+"""
+import argparse
+import csv
+import gzip
+import os
+import sys
+
+from .build_dataset import publish_models
+from .catalog_db import CatalogDB
+from .delta import build_diff, diff_path
+from .models_io import backup_models, load_models, write_models
+from .normalize import build_entries
+
+BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_PATH = os.path.join(BASE, 'data', 'models.json')
+BACKUP_PATH = DATA_PATH + '.bak'
+
+MAKE_COLUMNS = ('make_name', 'makename', 'make')
+MODEL_COLUMNS = ('model_name', 'modelname', 'model')
+
+
+def open_text(path):
+    """Open a (possibly gzipped) text export for csv reading."""
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8-sig', newline='')
+    return open(path, 'r', encoding='utf-8-sig', newline='')
+
+
+def default_delimiter(path):
+    name = path[:-3] if path.endswith('.gz') else path
+    return '\t' if name.endswith('.tsv') else ','
+
+
+def _column(header, candidates, path):
+    lowered = [h.strip().lower() for h in header]
+    for candidate in candidates:
+        if candidate in lowered:
+            return lowered.index(candidate)
+    raise ValueError(f'{path}: no {candidates[0]} column in header {header}')
+
+
+def _rows(path, delimiter):
+    """(header, row iterator) for one export file."""
+    f = open_text(path)
+    reader = csv.reader(f, delimiter=delimiter or default_delimiter(path))
+    try:
+        header = next(reader)
+    except StopIteration:
+        f.close()
+        raise ValueError(f'{path}: empty file')
+
+    def rows():
+        with f:
+            yield from reader
+    return header, rows()
+
+
+def iter_flat(path, delimiter=None):
+    """Yield (make, model) pairs from a flat export with make and model columns."""
+    header, rows = _rows(path, delimiter)
+    make_col = _column(header, MAKE_COLUMNS, path)
+    model_col = _column(header, MODEL_COLUMNS, path)
+    width = max(make_col, model_col)
+    for row in rows:
+        if len(row) > width:
+            yield row[make_col], row[model_col]
+
+
+def _id_names(path, delimiter):
+    header, rows = _rows(path, delimiter)
+    id_col = _column(header, ('id',), path)
+    name_col = _column(header, ('name',), path)
+    width = max(id_col, name_col)
+    return {row[id_col].strip(): row[name_col] for row in rows if len(row) > width}
+
+
+def iter_tables(make_path, model_path, link_path, delimiter=None):
+    """Yield (make, model) pairs by joining Make and Model through Make_Model.
+
+    The two lookup tables are small; the link table is streamed.
+    """
+    makes = _id_names(make_path, delimiter)
+    models = _id_names(model_path, delimiter)
+    header, rows = _rows(link_path, delimiter)
+    make_col = _column(header, ('makeid', 'make_id'), link_path)
+    model_col = _column(header, ('modelid', 'model_id'), link_path)
+    width = max(make_col, model_col)
+    for row in rows:
+        if len(row) <= width:
+            continue
+        make = makes.get(row[make_col].strip())
+        model = models.get(row[model_col].strip())
+        if make and model:
+            yield make, model
+
+
+class CatalogBuilder:
+    """Collect unique model names per make, in first-seen order.
+
+    `makes` maps lower-cased export names to catalog names; rows for other makes
+    are dropped unless `all_makes` is set.
+    """
+
+    def __init__(self, makes, all_makes=False):
+        self.names = {m.lower(): m for m in makes}
+        self.all_makes = all_makes
+        self.models = {}
+        self.seen = {}
+        self.rows = 0
+
+    def add(self, make, model):
+        self.rows += 1
+        make = make.strip()
+        model = model.strip()
+        if not make or not model:
+            return
+        key = make.lower()
+        name = self.names.get(key)
+        if name is None:
+            if not self.all_makes:
+                return
+            name = self.names[key] = make
+        models = self.models.get(name)
+        if models is None:
+            models = self.models[name] = []
+            self.seen[name] = set()
+        seen = self.seen[name]
+        if model not in seen:
+            seen.add(model)
+            models.append(model)
+
+
+def ingest(pairs, old_data, all_makes=False):
+    """Build the new catalog from (make, model) pairs; returns ([(make, entries)], builder)."""
+    builder = CatalogBuilder(old_data, all_makes=all_makes)
+    for make, model in pairs:
+        builder.add(make, model)
+
+    items = []
+    for make, models in old_data.items():
+        names = builder.models.get(make)
+        items.append((make, build_entries(names) if names else models))
+    extra = sorted((m for m in builder.models if m not in old_data), key=str.lower)
+    items.extend((make, build_entries(builder.models[make])) for make in extra)
+    return items, builder
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Rebuild data/models.json from a local vPIC export.')
+    parser.add_argument('export', nargs='?', help='flat export with make and model columns (.csv, .tsv, optionally .gz)')
+    parser.add_argument('--make-table', help='Make table dump (Id, Name)')
+    parser.add_argument('--model-table', help='Model table dump (Id, Name)')
+    parser.add_argument('--make-model-table', help='Make_Model link table dump (MakeId, ModelId)')
+    parser.add_argument('--delimiter', help='field delimiter (default: tab for .tsv, otherwise comma)')
+    parser.add_argument('--all-makes', action='store_true',
+                        help='also add makes that are not in models.json yet')
+    parser.add_argument('--output', default=DATA_PATH, help='models.json to rebuild')
+    parser.add_argument('--db', help='also update this SQLite catalog (see catalog_db.py)')
+    args = parser.parse_args(argv)
+
+    tables = [args.make_table, args.model_table, args.make_model_table]
+    if args.export and any(tables):
+        parser.error('pass either a flat export or the three table dumps, not both')
+    if args.export:
+        pairs = iter_flat(args.export, args.delimiter)
+    elif all(tables):
+        pairs = iter_tables(*tables, delimiter=args.delimiter)
+    else:
+        parser.error('pass a flat export, or all of --make-table, --model-table and --make-model-table')
+
+    old_data = load_models(args.output) if os.path.exists(args.output) else {}
+    if not old_data and not args.all_makes:
+        print(f'{args.output} not found or empty; pass --all-makes to build it from the export alone')
+        return 1
+
+    try:
+        items, builder = ingest(pairs, old_data, all_makes=args.all_makes)
+    except (OSError, ValueError, csv.Error) as e:
+        print('Ingest failed:', e)
+        return 1
+
+    diff = build_diff(old_data, items)
+    write_models(diff_path(args.output), diff)
+    if os.path.exists(args.output):
+        backup = BACKUP_PATH if args.output == DATA_PATH else args.output + '.bak'
+        backup_models(args.output, backup)
+        print('Backup written to', backup)
+    publish_models(args.output, items)
+    if args.db:
+        with CatalogDB(args.db) as db:
+            changed = db.replace_all(items)
+        print(f'Updated {changed} makes in {args.db}')
+
+    found = sum(1 for make in old_data if make in builder.models)
+    print(f'\n✓ Rebuilt {args.output} from {builder.rows:,} export rows')
+    print(f'  Makes from the export: {found} existing, {len(items) - len(old_data)} new')
+    print(f'  Kept existing entries for {len(old_data) - found} makes not in the export')
+    print(f'  Total makes: {len(items)}')
+    print(f"  Diff: +{diff['added']} -{diff['removed']} ~{diff['reclassified']} models "
+          f"in {diff['changed_makes']} makes ({os.path.basename(diff_path(args.output))})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
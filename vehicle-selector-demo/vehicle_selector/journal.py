@@ -0,0 +1,72 @@
+"""Append-only JSONL journal of completed makes for resumable refresh runs.
+
+Each completed make is written as one line and fsync'd immediately, so a run
+that is killed part-way loses at most the make that was in flight. A resumed
+run reads the journal back, skips those makes, and deletes the journal once
+the final output file has been written.
+"""
+import json
+import os
+import threading
+
+
+class RunJournal:
+    """One JSON object per line: {"make": ..., "models": [...], "digest": ...}.
+
+    `record` is thread-safe; `digest` is the make's upstream content hash, if known.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+        self.lock = threading.Lock()
+
+    def load(self):
+        """Return {make: entry} for every complete line in the journal."""
+        entries = {}
+        try:
+            f = open(self.path, 'r', encoding='utf-8')
+        except FileNotFoundError:
+            return entries
+        with f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A torn last line from an interrupted write; that make is simply refetched.
+                    continue
+                entries[entry['make']] = entry
+        return entries
+
+    def open(self, resume=False):
+        """Open for appending; without `resume` any previous journal is discarded."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+        if resume and self.file.tell() > 0:
+            with open(self.path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                torn = f.read(1) != b'\n'
+            if torn:
+                # Terminate a torn last line so the next record starts cleanly.
+                self.file.write('\n')
+        return self
+
+    def record(self, make, models, digest=None):
+        line = json.dumps({'make': make, 'models': models, 'digest': digest}, ensure_ascii=False)
+        with self.lock:
+            self.file.write(line + '\n')
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def discard(self):
+        """Remove the journal after its contents have been compacted into the output."""
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
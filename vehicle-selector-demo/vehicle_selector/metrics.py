@@ -0,0 +1,208 @@
+"""Run metrics for fetch and rebuild runs: request latency, bytes, retries, errors, phase times.
+
+A `RunMetrics` is shared by everything in one run (it is thread-safe):
+`VPICClient` reports each HTTP attempt to it, and the scripts wrap their
+phases in `with metrics.phase('fetch'):`. Phase time adds up across threads,
+so a phase run inside workers (classify) reports total time spent, not wall
+time. At the end of a run, `write` saves a JSON summary and a Prometheus
+textfile (for node_exporter's textfile collector) to .cache/metrics/ by
+default, named after the run:
+
+  .cache/metrics/fetch.json
+  .cache/metrics/fetch.prom
+"""
+import contextlib
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+from .models_io import write_text
+
+BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+METRICS_DIR = os.path.join(BASE, '.cache', 'metrics')
+PREFIX = 'vehicle_selector'
+
+# Request latency bucket upper bounds, in seconds.
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style (not locked; RunMetrics locks)."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+    def quantile(self, q):
+        """Upper bucket bound holding the q-th quantile (the max beyond the last bucket)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        for bound, n in zip(self.buckets, self.counts):
+            if n >= rank:
+                return bound
+        return self.max
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'sum_seconds': round(self.sum, 6),
+            'mean_seconds': round(self.sum / self.count, 6) if self.count else 0.0,
+            'max_seconds': round(self.max, 6),
+            'p50_le': self.quantile(0.5),
+            'p90_le': self.quantile(0.9),
+            'p99_le': self.quantile(0.99),
+            'buckets': {str(b): n for b, n in zip(self.buckets, self.counts)},
+        }
+
+
+class RunMetrics:
+    """Metrics for one run named `run` (e.g. 'fetch', 'rebuild')."""
+
+    def __init__(self, run):
+        self.run = run
+        self.started = time.time()
+        self.lock = threading.Lock()
+        self.latency = {}    # endpoint -> Histogram
+        self.requests = {}   # status -> count; 'error' for connection failures
+        self.errors = {}     # status or exception name -> count
+        self.retries = 0
+        self.bytes = 0
+        self.phases = {}     # phase -> seconds
+        self.counters = {}   # free-form run counters (makes fetched, models written, ...)
+        self.cache = None    # a vpic_cache.ResponseCache whose stats are reported
+        self.concurrency = None  # a concurrency.AdaptiveConcurrency whose limit is reported
+
+    def observe_request(self, endpoint, seconds, status=None, nbytes=0, error=None):
+        """Record one HTTP attempt; `status` is None when it failed with `error` (an exception)."""
+        with self.lock:
+            hist = self.latency.get(endpoint)
+            if hist is None:
+                hist = self.latency[endpoint] = Histogram()
+            hist.observe(seconds)
+            key = str(status) if status is not None else 'error'
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self.bytes += nbytes
+            if error is not None or (status is not None and status >= 400):
+                kind = type(error).__name__ if error is not None else str(status)
+                self.errors[kind] = self.errors.get(kind, 0) + 1
+
+    def count_retry(self):
+        with self.lock:
+            self.retries += 1
+
+    def count(self, name, n=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self.lock:
+                self.phases[name] = self.phases.get(name, 0.0) + elapsed
+
+    def summary(self):
+        with self.lock:
+            out = {
+                'run': self.run,
+                'started_at': datetime.fromtimestamp(self.started, timezone.utc).isoformat(timespec='seconds'),
+                'duration_seconds': round(time.time() - self.started, 3),
+                'phases_seconds': {k: round(v, 6) for k, v in self.phases.items()},
+                'requests': dict(sorted(self.requests.items())),
+                'errors': dict(sorted(self.errors.items())),
+                'retries': self.retries,
+                'bytes_received': self.bytes,
+                'latency': {k: h.summary() for k, h in sorted(self.latency.items())},
+                'counters': dict(sorted(self.counters.items())),
+            }
+        if self.cache is not None:
+            out['cache'] = dict(self.cache.stats)
+        if self.concurrency is not None:
+            out['concurrency'] = self.concurrency.summary()
+        return out
+
+    def prometheus(self):
+        """The summary in the Prometheus text exposition format."""
+        s = self.summary()
+        run = _label(s['run'])
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f'# HELP {PREFIX}_{name} {help_text}')
+            lines.append(f'# TYPE {PREFIX}_{name} {kind}')
+            for suffix, labels, value in samples:
+                labels = ','.join([f'run="{run}"'] + [f'{k}="{_label(v)}"' for k, v in labels])
+                lines.append(f'{PREFIX}_{name}{suffix}{{{labels}}} {value}')
+
+        metric('run_timestamp_seconds', 'gauge', 'Unix time the run started.', [('', [], int(self.started))])
+        metric('run_duration_seconds', 'gauge', 'Wall time of the run.', [('', [], s['duration_seconds'])])
+        metric('phase_duration_seconds', 'gauge', 'Time spent per phase (summed across threads).',
+               [('', [('phase', p)], v) for p, v in s['phases_seconds'].items()])
+        metric('requests_total', 'counter', 'HTTP attempts by status (error = no response).',
+               [('', [('status', k)], v) for k, v in s['requests'].items()])
+        metric('request_errors_total', 'counter', 'Failed HTTP attempts by status or exception.',
+               [('', [('kind', k)], v) for k, v in s['errors'].items()])
+        metric('request_retries_total', 'counter', 'HTTP attempts that were retries.', [('', [], s['retries'])])
+        metric('response_bytes_total', 'counter', 'Response bytes received.', [('', [], s['bytes_received'])])
+        samples = []
+        with self.lock:
+            for endpoint, hist in sorted(self.latency.items()):
+                for bound, n in zip(hist.buckets, hist.counts):
+                    samples.append(('_bucket', [('endpoint', endpoint), ('le', bound)], n))
+                samples.append(('_bucket', [('endpoint', endpoint), ('le', '+Inf')], hist.count))
+                samples.append(('_sum', [('endpoint', endpoint)], round(hist.sum, 6)))
+                samples.append(('_count', [('endpoint', endpoint)], hist.count))
+        metric('request_duration_seconds', 'histogram', 'VPIC request latency.', samples)
+        if 'cache' in s:
+            metric('cache_events_total', 'counter', 'Response cache events.',
+                   [('', [('event', k)], v) for k, v in s['cache'].items()])
+        if 'concurrency' in s:
+            c = s['concurrency']
+            metric('concurrency_limit', 'gauge', 'Adaptive limit on requests in flight at the end of the run.',
+                   [('', [], c['limit'])])
+            metric('concurrency_limit_average', 'gauge', 'Adaptive limit averaged over responses.',
+                   [('', [], c['average_limit'] or 0)])
+            metric('concurrency_cuts_total', 'counter', 'Times the adaptive limit was cut, by cause.',
+                   [('', [('cause', 'latency')], c['latency_cuts']),
+                    ('', [('cause', 'throttled')], c['cuts'] - c['latency_cuts'])])
+        metric('run_items', 'gauge', 'Run counters (makes fetched, models written, ...).',
+               [('', [('name', k)], v) for k, v in s['counters'].items()])
+        return '\n'.join(lines) + '\n'
+
+    def write(self, directory=METRICS_DIR):
+        """Write <run>.json and <run>.prom to `directory`; returns their paths."""
+        json_path = os.path.join(directory, f'{self.run}.json')
+        prom_path = os.path.join(directory, f'{self.run}.prom')
+        write_text(json_path, json.dumps(self.summary(), indent=2))
+        # Written atomically so the textfile collector never reads a partial file.
+        write_text(prom_path, self.prometheus())
+        return json_path, prom_path
+
+    def report(self):
+        """One-line human summary."""
+        s = self.summary()
+        phases = ', '.join(f'{k} {v:.2f}s' for k, v in s['phases_seconds'].items())
+        total = sum(s['requests'].values())
+        return (f'Metrics: {total} requests, {s["retries"]} retries, {sum(s["errors"].values())} errors, '
+                f'{s["bytes_received"]:,} bytes; {phases}')
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
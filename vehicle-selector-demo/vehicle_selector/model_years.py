@@ -0,0 +1,192 @@
+"""Build a year-aware catalog (make -> model -> model-year ranges) from VPIC.
+
+Usage:
+  python -m vehicle_selector years [--from-year 1995] [--to-year NEXT_YEAR] [--makes Ford,Toyota]
+      [--workers N] [--rate REQ_PER_SEC] [--fixed-concurrency] [--no-cache] [--vpic-base URL] [--output data/model_years.json]
+
+One GetModelsForMakeYear request is made per make and year, so a full run is
+about 30 times the requests of `fetch`. They fan out over a bounded thread pool,
+with the requests in flight adapting to VPIC (see concurrency.py), and go through a response cache of their own,
+.cache/vpic-years/, whose entry cap is raised to hold every request of the
+run, so an interrupted or repeated run only refetches what is missing or
+stale.
+
+Model names are matched to data/models.json through their canonical key (see
+normalize.py), so a model keeps the catalog's spelling; models the catalog does
+not list keep VPIC's. The years a model was offered are stored as inclusive
+ranges rather than repeated per year:
+
+  {"Ford": {"Escape": [[2001, 2012], [2020, 2025]], ...}, ...}
+
+The file is written minified. A make whose requests did not all succeed keeps
+its entry from the previous file.
+"""
+import argparse
+import os
+import sys
+from datetime import date
+
+from .concurrency import request_controls
+from .fetch_all_models import fetch_all, pacing
+from .models_io import load_models, write_compact
+from .normalize import canonical_key, display_name
+from .vpic_cache import DEFAULT_MAX_ENTRIES, DEFAULT_TTL, ResponseCache
+from .vpic_client import VPIC_BASE, VPICClient, model_names
+
+BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_PATH = os.path.join(BASE, 'data', 'models.json')
+OUTPUT_PATH = os.path.join(BASE, 'data', 'model_years.json')
+CACHE_DIR = os.path.join(BASE, '.cache', 'vpic-years')
+
+DEFAULT_FROM_YEAR = 1995
+DEFAULT_WORKERS = 16
+
+
+def year_ranges(years):
+    """Collapse model years into sorted inclusive [start, end] ranges."""
+    ranges = []
+    for year in sorted(set(years)):
+        if ranges and year == ranges[-1][1] + 1:
+            ranges[-1][1] = year
+        else:
+            ranges.append([year, year])
+    return ranges
+
+
+def in_ranges(ranges, year):
+    return any(start <= year <= end for start, end in ranges)
+
+
+def models_for_year(catalog, make, year):
+    """Names of `make`'s models offered in `year`, from a year-aware catalog."""
+    return [name for name, ranges in catalog.get(make, {}).items() if in_ranges(ranges, year)]
+
+
+def catalog_names(models):
+    """{canonical key: catalog spelling} for one make's models.json entries, aliases included."""
+    names = {}
+    for m in models:
+        for alias in m.get('aliases', ()):
+            names.setdefault(canonical_key(alias), m['name'])
+    names.update((canonical_key(m['name']), m['name']) for m in models)
+    return names
+
+
+class YearCollector:
+    """Fold (year, model names) results for one make into {model: sorted years}."""
+
+    def __init__(self, known):
+        self.known = known
+        self.years = {}
+        self.names = {}
+
+    def add(self, year, names):
+        for raw in names:
+            key = canonical_key(raw)
+            if not key:
+                continue
+            if key not in self.names:
+                self.names[key] = self.known.get(key) or display_name(raw)
+            self.years.setdefault(key, set()).add(year)
+
+    def result(self):
+        # Models in order of their first model year, then by name.
+        order = sorted(self.years, key=lambda k: (min(self.years[k]), self.names[k].lower()))
+        return {self.names[k]: year_ranges(self.years[k]) for k in order}
+
+
+def parse_args(argv=None):
+    next_year = date.today().year + 1
+    parser = argparse.ArgumentParser(description='Build a make/model/year-range catalog from VPIC.')
+    parser.add_argument('--from-year', type=int, default=DEFAULT_FROM_YEAR,
+                        help=f'first model year (default {DEFAULT_FROM_YEAR})')
+    parser.add_argument('--to-year', type=int, default=next_year,
+                        help=f'last model year (default {next_year})')
+    parser.add_argument('--makes', help='comma-separated makes (default: every make in data/models.json)')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'max concurrent requests in flight (default {DEFAULT_WORKERS})')
+    parser.add_argument('--rate', type=float,
+                        help='hard cap on requests per second across all workers (default: none)')
+    parser.add_argument('--fixed-concurrency', action='store_true',
+                        help='keep --workers requests in flight instead of adapting to VPIC (see concurrency.py)')
+    parser.add_argument('--no-cache', action='store_true', help='bypass the on-disk response cache')
+    parser.add_argument('--cache-ttl', type=float, default=DEFAULT_TTL,
+                        help=f'seconds before a cached response is revalidated (default {DEFAULT_TTL})')
+    parser.add_argument('--vpic-base', default=VPIC_BASE, help='VPIC API base URL (e.g. a local stand-in)')
+    parser.add_argument('--output', default=OUTPUT_PATH, help='year-aware catalog to write')
+    args = parser.parse_args(argv)
+    if args.to_year < args.from_year:
+        parser.error('--to-year is before --from-year')
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    catalog = load_models(DATA_PATH) if os.path.exists(DATA_PATH) else {}
+    if args.makes:
+        makes = [m.strip() for m in args.makes.split(',') if m.strip()]
+    else:
+        makes = list(catalog)
+    if not makes:
+        print('No makes to fetch (data/models.json not found and no --makes given)')
+        return 1
+    old = load_models(args.output) if os.path.exists(args.output) else {}
+
+    years = list(range(args.from_year, args.to_year + 1))
+    tasks = [(make, year) for make in makes for year in years]
+    print(f'Fetching {len(makes)} makes x {len(years)} years = {len(tasks)} requests ({pacing(args)})...')
+
+    cache = None if args.no_cache else ResponseCache(CACHE_DIR, ttl=args.cache_ttl)
+    if cache is not None:
+        # One entry per make and year: the default cap would evict this run's own entries.
+        cache.max_entries = max(cache.max_entries, len(tasks) + DEFAULT_MAX_ENTRIES // 10)
+    limiter, concurrency = request_controls(args.workers, args.rate, not args.fixed_concurrency)
+    client = VPICClient(base=args.vpic_base, limiter=limiter, concurrency=concurrency,
+                        cache=cache, pool_size=args.workers)
+
+    def fetch(task):
+        make, year = task
+        return model_names(client.get_make_year_results(make, year))
+
+    collectors = {make: YearCollector(catalog_names(catalog.get(make, []))) for make in makes}
+    failed = {}
+    done = 0
+    for (make, year), names, error in fetch_all(tasks, fetch, workers=args.workers):
+        done += 1
+        if error is not None:
+            failed.setdefault(make, []).append(year)
+        else:
+            collectors[make].add(year, names)
+        if done % 500 == 0 or done == len(tasks):
+            print(f'  {done}/{len(tasks)} requests, {len(failed)} makes with errors')
+    client.close()
+
+    result = dict(old)
+    kept = []
+    for make in makes:
+        if make in failed:
+            if make in old:
+                kept.append(make)
+            shown = ', '.join(map(str, failed[make][:5])) + ('...' if len(failed[make]) > 5 else '')
+            print(f'  {make}: {len(failed[make])} years failed ({shown}); '
+                  + ('keeping the previous entry' if make in old else 'skipped'))
+            continue
+        result[make] = collectors[make].result()
+    write_compact(args.output, result)
+
+    models = sum(len(m) for m in result.values())
+    ranges = sum(len(r) for m in result.values() for r in m.values())
+    print(f'\n✓ Wrote {args.output}')
+    print(f'  Makes: {len(result)} ({len(kept)} kept from the previous run after errors)')
+    print(f'  Models: {models}, year ranges: {ranges}')
+    print(f'  Size: {os.path.getsize(args.output):,} bytes')
+    if cache is not None:
+        print(f'  {cache.report()}')
+    if concurrency is not None:
+        print(f'  {concurrency.report()}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,169 @@
+"""Shared load/write/backup stage for data/models.json.
+
+Writes are atomic: the document is streamed make by make into a temp file in
+the same directory, fsync'd, and swapped in with `os.replace`, so `script.js`
+never sees a truncated file. The layout is that of
+`json.dump(data, f, indent=2, ensure_ascii=False)`.
+
+Backups are hardlinks (or byte copies where links are unsupported) rather
+than a parse-and-reserialize of the whole file. A hardlink is safe because
+every writer replaces the file instead of rewriting it in place.
+
+If `orjson` is installed it is used to encode and decode; otherwise the
+standard library `json` module is used. The two agree on the layout but not
+on every byte (orjson writes 1e+16 as 1e16, for instance), so the output is
+only guaranteed to load to the same values, not to match `json.dump` exactly.
+"""
+import json
+import os
+import shutil
+import tempfile
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+
+def _dumps(value):
+    """Encode one value as indent=2 JSON text."""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(value, indent=2, ensure_ascii=False)
+
+
+def iter_json_chunks(items):
+    """Yield the text of a `{key: value}` JSON document one item at a time."""
+    first = True
+    for key, value in items:
+        yield '{\n  ' if first else ',\n  '
+        first = False
+        yield json.dumps(key, ensure_ascii=False)
+        yield ': '
+        # Nest the value one level deeper; newlines inside strings are escaped,
+        # so every literal newline here is a line break of the layout.
+        yield _dumps(value).replace('\n', '\n  ')
+    yield '{}' if first else '\n}'
+
+
+def load_models(path):
+    """Read a models.json file into a dict."""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def index_models(path):
+    """{make: (offset, length)} of every make's item in a models.json file.
+
+    One streaming pass that relies on the indent=2 layout every writer here
+    produces, where each make starts a line indented by exactly two spaces.
+    Only offsets are kept, so memory grows with the number of makes, not
+    with their models. Read an item back with `load_make`.
+    """
+    index = {}
+    make = start = None
+    offset = 0
+    with open(path, 'rb') as f:
+        for line in f:
+            if line.startswith(b'  "') or line.rstrip(b'\r\n') == b'}':
+                if make is not None:
+                    index[make] = (start, offset - start)
+                make = None
+                if line.startswith(b'  "'):
+                    make = json.JSONDecoder().raw_decode(line.decode('utf-8'), 2)[0]
+                    start = offset
+            offset += len(line)
+    return index
+
+
+def load_make(path, span):
+    """Read the models of one make from `path`, at a span from `index_models`."""
+    offset, length = span
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        item = f.read(length).decode('utf-8').rstrip().rstrip(',')
+    (models,) = json.loads('{' + item + '}').values()
+    return models
+
+
+def _fsync_dir(directory):
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return  # e.g. Windows, where directories cannot be opened
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _atomic_write(path, chunks, binary=False):
+    """Write text (or, with `binary`, bytes) `chunks` to a temp file beside `path`, fsync, and swap it in."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.', suffix='.tmp', dir=directory)
+    try:
+        # mkstemp creates 0600 files; keep the live file readable by the web server.
+        try:
+            mode = os.stat(path).st_mode & 0o777
+        except FileNotFoundError:
+            mode = 0o644
+        os.chmod(tmp, mode)
+        with (os.fdopen(fd, 'wb') if binary else os.fdopen(fd, 'w', encoding='utf-8')) as f:
+            for chunk in chunks:
+                f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    _fsync_dir(directory)
+
+
+def write_models(path, items):
+    """Atomically write `items` (a dict or iterable of (make, models) pairs) to `path`."""
+    if isinstance(items, dict):
+        items = items.items()
+    _atomic_write(path, iter_json_chunks(items))
+
+
+def write_text(path, text):
+    """Atomically write the string `text` to `path`."""
+    _atomic_write(path, [text])
+
+
+def write_bytes(path, payload):
+    """Atomically write the bytes `payload` to `path`."""
+    _atomic_write(path, [payload], binary=True)
+
+
+def write_compact(path, value):
+    """Atomically write `value` as minified JSON (no whitespace) to `path`."""
+    if orjson is not None:
+        text = orjson.dumps(value).decode('utf-8')
+    else:
+        text = json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+    _atomic_write(path, [text])
+
+
+def backup_models(path, backup_path):
+    """Snapshot `path` to `backup_path` as a hardlink, falling back to a byte copy."""
+    tmp = backup_path + '.tmp'
+    try:
+        os.remove(tmp)
+    except FileNotFoundError:
+        pass
+    try:
+        os.link(path, tmp)
+    except OSError:
+        shutil.copyfile(path, tmp)
+    os.replace(tmp, backup_path)
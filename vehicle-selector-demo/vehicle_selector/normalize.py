@@ -0,0 +1,115 @@
+"""Model-name normalization, variant collapsing and ranked selection.
+
+VPIC lists the same model under several spellings ("F-150", "F150",
+"F-150 4WD", "CAMRY", "Camry  LE"). Every name gets a canonical key:
+Unicode-normalized, case-folded, punctuation and spacing removed, and trailing
+trim/drivetrain suffixes (TRIM_SUFFIXES) dropped. Names with the same key are
+collapsed into one model through a dict keyed by it; the cleanest spelling
+becomes the model name and the others are kept as `aliases`.
+
+When a make has more models than `limit`, the ones kept are chosen by rank
+(how many spellings VPIC has for the model, whether the classifier recognises
+it, then how early VPIC lists it) instead of by position alone, and are then
+emitted in VPIC's order.
+"""
+import re
+import unicodedata
+
+from .vehicle_types import classify_many
+
+MODEL_LIMIT = 200  # models kept per make, to keep models.json a reasonable size
+
+# Trailing tokens that name a trim level or drivetrain rather than a model.
+# Deliberately conservative: words that are also model names ("Sport", "HD",
+# "Limited", single letters) are not listed, and a name is never reduced to nothing.
+TRIM_SUFFIXES = {
+    '2wd', '4wd', 'awd', 'fwd', 'rwd', '4x2', '4x4',
+    'base', 'standard', 'std',
+    'dx', 'lx', 'ex', 'exl', 'le', 'xle', 'se', 'sel', 'ses',
+    'gl', 'gls', 'glx', 'ls', 'lt', 'ltz', 'sr5',
+}
+
+_TOKEN_RE = re.compile(r'[^\W_]+')
+
+
+def _tokens(name):
+    """Word tokens of `name` as (case-folded text, start, end), trim suffixes removed."""
+    text = unicodedata.normalize('NFKC', name or '')
+    tokens = [(m.group().casefold(), m.start(), m.end()) for m in _TOKEN_RE.finditer(text)]
+    while len(tokens) > 1 and tokens[-1][0] in TRIM_SUFFIXES:
+        tokens.pop()
+    return text, tokens
+
+
+def canonical_key(name):
+    """Hash key shared by every spelling of one model ('' for names with no letters or digits)."""
+    _, tokens = _tokens(name)
+    return ''.join(t for t, _, _ in tokens)
+
+
+def display_name(name):
+    """`name` with collapsed whitespace and trailing trim suffixes removed."""
+    text, tokens = _tokens(name)
+    if not tokens:
+        return ' '.join(text.split())
+    return ' '.join(text[:tokens[-1][2]].split())
+
+
+class ModelGroup:
+    """Every spelling of one model, in first-seen order."""
+
+    __slots__ = ('key', 'first', 'spellings')
+
+    def __init__(self, key, first):
+        self.key = key
+        self.first = first
+        self.spellings = []
+
+    @property
+    def name(self):
+        # Prefer a spelling that needed no trimming, then one that is not all
+        # upper case (VPIC shouts some names), then the first one seen.
+        best = min(self.spellings, key=lambda s: (display_name(s) != ' '.join(s.split()), s.isupper()))
+        return display_name(best)
+
+
+def collapse(names):
+    """Group `names` by canonical key; returns the groups in first-seen order."""
+    groups = {}
+    for i, raw in enumerate(names):
+        if not raw:
+            continue
+        key = canonical_key(raw)
+        if not key:
+            continue
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = ModelGroup(key, i)
+        spelling = ' '.join(raw.split())
+        if spelling not in group.spellings:
+            group.spellings.append(spelling)
+    return list(groups.values())
+
+
+def build_entries(names, limit=MODEL_LIMIT):
+    """models.json entries for a make's raw model names: collapsed, classified and ranked.
+
+    Returns at most `limit` entries (all of them when `limit` is None) in
+    first-seen order. Entries with other spellings carry them in an `aliases` list.
+    """
+    groups = collapse(names)
+    classified = classify_many([g.name for g in groups])
+    ranked = list(zip(groups, classified))
+    if limit is not None and len(ranked) > limit:
+        keep = sorted(ranked, key=lambda item: (-len(item[0].spellings), item[1][0] == 'Unknown', item[0].first))
+        ranked = sorted(keep[:limit], key=lambda item: item[0].first)
+
+    entries = []
+    for group, (vtype, subtiers) in ranked:
+        name = group.name
+        entry = {'name': name, 'type': vtype, 'subtiers': subtiers}
+        aliases = [s for s in group.spellings if s != name]
+        if aliases:
+            entry['aliases'] = aliases
+        entries.append(entry)
+    return entries
@@ -0,0 +1,149 @@
+"""Package the static demo into dist/ with content-hashed, precompressed assets.
+
+Usage:
+  python -m vehicle_selector package [--out dist]
+
+Run it after any script that rewrites data/models.json (and after
+build_dataset.py). For every asset it writes:
+- a content-hashed copy, e.g. `script.1a2b3c4d.js`, safe to cache forever;
+- a `.gz` variant, and a `.br` variant when the `brotli` package is installed;
+- an entry in `manifest.json` with the hashed name, a strong ETag and sizes.
+
+References are rewritten so the hashed names are actually used: script.js
+points at the hashed data files, and index.html (which keeps its name so the
+URL is stable, and should be served with `Cache-Control: no-cache`) points at
+the hashed script and stylesheet. Files from older builds are removed.
+
+The per-make shards listed in data/makes.json already carry a content hash in
+their names, so they are copied (and precompressed) under the same names.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+
+from .models_io import write_models
+
+try:
+    import brotli
+except ImportError:  # optional: only .gz variants are written without it
+    brotli = None
+
+BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DIST_PATH = os.path.join(BASE, 'dist')
+
+# Logical paths, in dependency order: every file comes after the files it references.
+ASSETS = ['data/models.json', 'data/models.min.json', 'data/makes.json', 'styles.css', 'script.js', 'index.html']
+UNHASHED = {'index.html'}
+SHARD_INDEX = 'data/makes.json'
+MIN_COMPRESS_BYTES = 256  # below this, compressed variants are not worth a lookup
+
+
+def hashed_name(path, digest):
+    root, ext = os.path.splitext(path)
+    return f'{root}.{digest[:8]}{ext}'
+
+
+def _write(path, payload):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(payload)
+
+
+def shard_assets(index=SHARD_INDEX):
+    """Logical paths of the shards listed in the shard index (none when it is missing)."""
+    try:
+        with open(os.path.join(BASE, index), 'r', encoding='utf-8') as f:
+            shards = json.load(f)['shards']
+    except FileNotFoundError:
+        return []
+    return [f'{os.path.dirname(index)}/{path}' for path in shards]
+
+
+def package(out_dir=DIST_PATH, assets=ASSETS):
+    """Write the packaged assets and return the manifest."""
+    # Shards go before the index that references them; their names are already hashed.
+    prehashed = set(shard_assets()) if SHARD_INDEX in assets else set()
+    if prehashed:
+        i = assets.index(SHARD_INDEX)
+        assets = assets[:i] + sorted(prehashed) + assets[i:]
+    renames = {}
+    manifest = {}
+    written = set()
+    for logical in assets:
+        source = os.path.join(BASE, logical)
+        if not os.path.exists(source):
+            continue
+        with open(source, 'rb') as f:
+            payload = f.read()
+        for old, new in renames.items():
+            payload = payload.replace(old.encode('utf-8'), new.encode('utf-8'))
+
+        digest = hashlib.sha256(payload).hexdigest()
+        name = logical if logical in UNHASHED or logical in prehashed else hashed_name(logical, digest)
+        if name != logical:
+            renames[logical] = name
+
+        entry = {
+            'path': name,
+            'etag': f'"{digest[:32]}"',
+            'bytes': len(payload),
+            'immutable': logical not in UNHASHED,
+        }
+        _write(os.path.join(out_dir, name), payload)
+        written.add(name)
+
+        if len(payload) >= MIN_COMPRESS_BYTES:
+            gz = gzip.compress(payload, compresslevel=9, mtime=0)
+            _write(os.path.join(out_dir, name + '.gz'), gz)
+            written.add(name + '.gz')
+            entry['gzip'] = {'path': name + '.gz', 'bytes': len(gz)}
+            if brotli is not None:
+                br = brotli.compress(payload, quality=11)
+                _write(os.path.join(out_dir, name + '.br'), br)
+                written.add(name + '.br')
+                entry['br'] = {'path': name + '.br', 'bytes': len(br)}
+        manifest[logical] = entry
+
+    written.add('manifest.json')
+    write_models(os.path.join(out_dir, 'manifest.json'), manifest)
+    _prune(out_dir, written)
+    return manifest
+
+
+def _prune(out_dir, keep):
+    """Remove files left over from earlier builds."""
+    for root, _, files in os.walk(out_dir):
+        for name in files:
+            full = os.path.join(root, name)
+            rel = os.path.relpath(full, out_dir).replace(os.sep, '/')
+            if rel not in keep:
+                os.remove(full)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Write hashed, precompressed static assets and a manifest.')
+    parser.add_argument('--out', default=DIST_PATH, help='output directory (default dist/)')
+    args = parser.parse_args(argv)
+
+    manifest = package(args.out)
+    shards = set(shard_assets())
+    for logical, entry in manifest.items():
+        if logical in shards:
+            continue
+        sizes = [f"{entry['bytes']:,} B"]
+        if 'gzip' in entry:
+            sizes.append(f"gzip {entry['gzip']['bytes']:,} B")
+        if 'br' in entry:
+            sizes.append(f"br {entry['br']['bytes']:,} B")
+        print(f"  {logical} -> {entry['path']} ({', '.join(sizes)})")
+    if shards:
+        print(f'  {len(shards)} make shards copied under their own names')
+    print(f'✓ Wrote {len(manifest)} assets and manifest.json to {args.out}')
+    if brotli is None:
+        print('  (install `brotli` to also write .br variants)')
+
+
+if __name__ == '__main__':
+    main()
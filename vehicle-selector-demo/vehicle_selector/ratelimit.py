@@ -0,0 +1,105 @@
+"""Shared token-bucket rate limiter for outbound VPIC requests.
+
+One `TokenBucket` is shared by every worker thread so the total request rate
+stays polite no matter how many requests are in flight. A `WindowBudget`
+additionally caps how many requests are made in any rolling time window.
+"""
+import collections
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, up to `burst` saved."""
+
+    def __init__(self, rate, burst=1):
+        if rate <= 0:
+            raise ValueError('rate must be positive')
+        self.rate = float(rate)
+        self.capacity = max(1.0, float(burst))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = now
+
+    def acquire(self, tokens=1):
+        """Block until `tokens` are available, then take them."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait = (tokens - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class BudgetExhausted(RuntimeError):
+    """The window had no room for a request within the budget's `timeout`."""
+
+
+class WindowBudget:
+    """Thread-safe cap of `limit` requests in any rolling `window` seconds.
+
+    Usable wherever a `TokenBucket` is: `acquire` blocks until the window has
+    room, then acquires from `limiter` (if given) as well, so one object can
+    enforce both a budget and a rate. With a `timeout` (0 for none at all),
+    `acquire` raises `BudgetExhausted` once it has waited that long, so a
+    caller can put work off instead of sleeping for up to a whole window;
+    `try_acquire` is the non-raising form.
+    """
+
+    def __init__(self, limit, window, limiter=None, timeout=None):
+        if limit < 1 or window <= 0:
+            raise ValueError('limit must be at least 1 and window positive')
+        self.limit = int(limit)
+        self.window = float(window)
+        self.limiter = limiter
+        self.timeout = timeout
+        self.spent = collections.deque()
+        self.lock = threading.Lock()
+
+    def _expire(self, now):
+        while self.spent and self.spent[0] <= now - self.window:
+            self.spent.popleft()
+
+    def remaining(self):
+        """Requests that can be made now without waiting."""
+        with self.lock:
+            self._expire(time.monotonic())
+            return self.limit - len(self.spent)
+
+    def try_acquire(self, tokens=1, timeout=None):
+        """Spend `tokens` requests once they fit in the window; True if they did.
+
+        Waits at most `timeout` seconds (None: as long as it takes, 0: not at
+        all) and returns False, spending nothing, if the window is still full.
+        """
+        if tokens > self.limit:
+            return False
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._expire(now)
+                if len(self.spent) + tokens <= self.limit:
+                    self.spent.extend([now] * tokens)
+                    break
+                wait = self.spent[len(self.spent) + tokens - self.limit - 1] + self.window - now
+            if deadline is not None and now + wait > deadline:
+                return False
+            time.sleep(max(wait, 0.01))
+        if self.limiter is not None:
+            self.limiter.acquire(tokens)
+        return True
+
+    def acquire(self, tokens=1):
+        """Spend `tokens` requests, waiting up to `timeout` for room in the window."""
+        if not self.try_acquire(tokens, self.timeout):
+            raise BudgetExhausted(f'request budget spent ({self.limit} per {self.window:g}s)')
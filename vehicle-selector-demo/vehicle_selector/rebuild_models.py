@@ -0,0 +1,69 @@
+"""
+Rebuild models.json with comprehensive real vehicle data for all makes.
+This completely replaces the old file with accurate, curated model data.
+
+Usage:
+  python -m vehicle_selector rebuild [--curated data/curated_models.json] [--output data/models.json] [--db PATH]
+
+The curated catalog lives in data/curated_models.json (same shape as
+models.json) and is only read when a rebuild runs. Phase times are written to
+.cache/metrics/rebuild.json and rebuild.prom (see metrics.py).
+"""
+import argparse
+import os
+
+from .build_dataset import publish_models
+from .metrics import METRICS_DIR, RunMetrics
+from .models_io import load_models
+
+BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CURATED_PATH = os.path.join(BASE, 'data', 'curated_models.json')
+DATA_PATH = os.path.join(BASE, 'data', 'models.json')
+
+
+def load_curated(path=CURATED_PATH):
+    """The curated catalog: comprehensive vehicle models for all 101+ makes."""
+    return load_models(path)
+
+
+def main(argv=None):
+    from .catalog_db import DB_PATH
+
+    parser = argparse.ArgumentParser(description='Rebuild data/models.json from the curated catalog.')
+    parser.add_argument('--curated', default=CURATED_PATH, help='curated catalog to rebuild from')
+    parser.add_argument('--output', default=DATA_PATH, help='models.json to write')
+    parser.add_argument('--db', default=DB_PATH,
+                        help='SQLite catalog to update, when it exists (default data/catalog.db)')
+    parser.add_argument('--metrics-dir', default=METRICS_DIR,
+                        help='where to write the run metrics (default .cache/metrics)')
+    args = parser.parse_args(argv)
+    metrics = RunMetrics('rebuild')
+
+    with metrics.phase('load'):
+        complete_data = load_curated(args.curated)
+
+    # Write JSON file (atomically; creates the directory if needed) and the page's shards
+    with metrics.phase('write'):
+        publish_models(args.output, complete_data)
+
+    # Keep the SQLite catalog in step when one is in use
+    if os.path.exists(args.db):
+        from .catalog_db import CatalogDB
+
+        with metrics.phase('db'), CatalogDB(args.db) as db:
+            db.replace_all(complete_data)
+        print(f"✓ {args.db} updated")
+
+    print("✓ models.json rebuilt successfully!")
+    print(f"  Location: {args.output}")
+    print(f"  Total makes: {len(complete_data)}")
+    total_models = sum(len(models) for models in complete_data.values())
+    print(f"  Total models: {total_models}")
+    metrics.count('makes_written', len(complete_data))
+    metrics.count('models_written', total_models)
+    metrics.write(args.metrics_dir)
+    print(f"  {metrics.report()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,358 @@
+"""Keep data/models.json fresh by re-fetching makes a few at a time, stalest first.
+
+Usage:
+  python -m vehicle_selector refresh [--once] [--interval SECONDS] [--budget N] [--window SECONDS]
+      [--min-age SECONDS] [--batch N] [--workers N] [--rate REQ_PER_SEC] [--fixed-concurrency] [--vpic-base URL]
+
+`fetch` re-fetches every make in one burst. This runs instead as a long-lived
+process that spends a fixed request budget (`--budget` requests in any
+`--window` seconds, 500 an hour by default) where it is most useful. Every
+`--interval` seconds it ranks the makes of data/models.json in a priority
+queue and refreshes the top of it:
+
+  priority = age x change rate x demand weight
+
+  age           seconds since the make was last fetched; makes never fetched
+                by the daemon come first, and makes fetched within `--min-age`
+                are not due at all
+  change rate   (changes + 1) / (checks + 2): how often a fetch of this make
+                has found its upstream results changed, i.e. a digest unlike
+                the last one recorded (1/2 until it is known)
+  demand weight 1 + log(1 + requests), from the per-make request counts the
+                suggestion API records (see serve_api.py)
+
+so a popular make whose VPIC listing changes often is checked far more often
+than an obscure one that never changes. Per-make fetch and change history is
+kept in .cache/refresh_state.json.
+
+Change detection uses the same upstream digests as `fetch --delta`. Makes
+whose results changed are rebuilt (normalize.build_entries, plus the VPIC
+type lookup unless `--no-type-lookup`) and written back through the shared
+models.json writer: the file is backed up to models.json.bak, replaced
+atomically with the other makes untouched, and the changed makes' shards and
+data/models.diff.json are rewritten. Makes that did not change cost one
+request (a revalidation of the cached response) and no write.
+
+Each cycle takes the most urgent makes whose estimated cost fits in what is
+left of the budget: one request for the listing, plus the type lookup's
+requests when the type store cannot yet answer for the make's models. Every
+request, retries included, is still counted against the budget as it goes
+out; a make that runs out of budget mid-fetch is not waited for but left
+due for a later cycle, as are the makes not started when the daemon is
+asked to stop. Within the budget, requests go out as fast as VPIC keeps up:
+the number in flight adapts to its latency and 429s (see concurrency.py),
+and the learned limit carries over from cycle to cycle.
+
+Each cycle's request metrics go to .cache/metrics/refresh.json and
+refresh.prom. Stop the daemon with Ctrl+C or SIGTERM; `--once` runs a single
+cycle (e.g. from cron).
+"""
+import argparse
+import heapq
+import json
+import math
+import os
+import signal
+import sys
+import threading
+import time
+
+from .build_dataset import publish_models
+from .concurrency import request_controls
+from .delta import DigestStore, build_diff, diff_path, results_digest
+from .fetch_all_models import DIGESTS_PATH, fetch_all, pacing
+from .metrics import METRICS_DIR, RunMetrics
+from .models_io import backup_models, load_models, write_compact, write_models
+from .normalize import build_entries
+from .ratelimit import BudgetExhausted, WindowBudget
+from .serve_api import DEMAND_PATH, load_demand
+from .type_lookup import TYPES_PATH, TypeResolver, TypeStore, lookup_cost
+from .vpic_cache import ResponseCache
+from .vpic_client import VPIC_BASE, VPICClient, model_names
+
+BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_PATH = os.path.join(BASE, 'data', 'models.json')
+BACKUP_PATH = DATA_PATH + '.bak'
+STATE_PATH = os.path.join(BASE, '.cache', 'refresh_state.json')
+
+DEFAULT_BUDGET = 500  # requests per window
+DEFAULT_WINDOW = 3600.0  # seconds
+DEFAULT_INTERVAL = 60.0  # seconds between cycles
+DEFAULT_MIN_AGE = 6 * 3600.0  # seconds before a make is due again
+DEFAULT_BATCH = 32  # makes per cycle at most
+DEFAULT_WORKERS = 4
+
+
+class RefreshState:
+    """{make: {'fetched_at', 'changed_at', 'checks', 'changes'}} persisted as JSON.
+
+    Times are Unix timestamps; `checks` counts fetches and `changes` the
+    fetches that found the make's upstream results changed.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.makes = {}
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.makes = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.makes = {}
+        return self
+
+    def record(self, make, changed, now):
+        entry = self.makes.setdefault(make, {'fetched_at': None, 'changed_at': None, 'checks': 0, 'changes': 0})
+        entry['fetched_at'] = now
+        entry['checks'] += 1
+        if changed:
+            entry['changed_at'] = now
+            entry['changes'] += 1
+
+    def save(self):
+        write_compact(self.path, dict(sorted(self.makes.items())))
+
+
+def change_rate(entry):
+    """Smoothed share of this make's fetches that found an upstream change."""
+    entry = entry or {}
+    return (entry.get('changes', 0) + 1) / (entry.get('checks', 0) + 2)
+
+
+def priority(entry, requests, now, min_age):
+    """How urgently a make needs refreshing; None when it is not due yet."""
+    fetched_at = (entry or {}).get('fetched_at')
+    if fetched_at is None:
+        age = math.inf
+    else:
+        age = now - fetched_at
+        if age < min_age:
+            return None
+    return age * change_rate(entry) * (1 + math.log1p(max(requests, 0)))
+
+
+def due_makes(makes, state, demand, now, min_age, limit):
+    """Up to `limit` of `makes` that are due, most urgent first."""
+    queue = []
+    for order, make in enumerate(makes):
+        score = priority(state.makes.get(make), demand.get(make, 0), now, min_age)
+        if score is None:
+            continue
+        # Ties (e.g. makes never fetched) fall back to demand, then catalog order.
+        heapq.heappush(queue, (-score, -demand.get(make, 0), order, make))
+    return [heapq.heappop(queue)[-1] for _ in range(min(limit, len(queue)))]
+
+
+def affordable(makes, cost, room):
+    """The leading `makes` whose summed `cost(make)` fits in `room` requests."""
+    batch = []
+    for make in makes:
+        room -= cost(make)
+        if room < 0:
+            break
+        batch.append(make)
+    return batch
+
+
+class Deferred(Exception):
+    """A make was put off to a later cycle (budget spent, or the daemon stopping)."""
+
+
+class Refresher:
+    """Runs refresh cycles against one VPIC client and one request budget."""
+
+    def __init__(self, args):
+        self.args = args
+        limiter, self.concurrency = request_controls(args.workers, args.rate, not args.fixed_concurrency)
+        # timeout=0: a request the window has no room for fails at once instead of sleeping.
+        self.budget = WindowBudget(args.budget, args.window, limiter, timeout=0)
+        self.state = RefreshState(STATE_PATH).load()
+        self.digests = DigestStore(DIGESTS_PATH)
+        self.digests.load()
+        self.stop = threading.Event()
+
+    def _client(self, metrics):
+        cache = None if self.args.no_cache else ResponseCache()
+        metrics.cache = cache
+        metrics.concurrency = self.concurrency
+        return VPICClient(base=self.args.vpic_base, limiter=self.budget, concurrency=self.concurrency,
+                          cache=cache, pool_size=self.args.workers, metrics=metrics)
+
+    def cycle(self):
+        """Refresh the most urgent makes the budget allows; returns how many were fetched."""
+        args = self.args
+        metrics = RunMetrics('refresh')
+        with metrics.phase('load'):
+            data = load_models(DATA_PATH)
+            demand = load_demand(args.demand)
+            now = time.time()
+            store = None
+            if not args.no_type_lookup:
+                store = TypeStore(TYPES_PATH, args.vpic_base.rstrip('/')).load()
+
+            def cost(make):
+                return 1 + (lookup_cost(store, make, data[make]) if store is not None else 0)
+            due = due_makes(list(data), self.state, demand, now, args.min_age, args.batch)
+            room = self.budget.remaining()
+            batch = affordable(due, cost, room)
+        if not batch:
+            if due:
+                print(f'{len(due)} makes due, but only {room} of {args.budget} requests left in the window')
+            else:
+                print('Nothing due')
+            return 0
+
+        client = self._client(metrics)
+        resolver = TypeResolver(client, store) if store is not None else None
+
+        def fetch_make(make):
+            if self.stop.is_set():
+                raise Deferred('stopping')
+            try:
+                # Revalidate even a fresh cached listing, so the cycle sees upstream changes.
+                results = client.get_make_results(make, revalidate=True)
+            except BudgetExhausted as e:
+                raise Deferred(str(e)) from e
+            digest = results_digest(results)
+            if self.digests.get(make) == digest:
+                return None, digest, None
+            with metrics.phase('classify'):
+                entries = build_entries(model_names(results))
+            type_error = None
+            if resolver is not None and entries:
+                with metrics.phase('types'):
+                    try:
+                        resolver.resolve(make, entries)
+                    except BudgetExhausted as e:
+                        raise Deferred(str(e)) from e
+                    except Exception as e:
+                        type_error = e  # keep the heuristic types
+            return entries, digest, type_error
+
+        fresh = {}
+        failed = deferred = 0
+        try:
+            with metrics.phase('fetch'):
+                for make, result, error in fetch_all(batch, fetch_make, workers=args.workers):
+                    if isinstance(error, Deferred):
+                        deferred += 1
+                        continue
+                    if error is not None:
+                        print(f'  {make}: ERROR: {error}')
+                        failed += 1
+                        continue
+                    entries, digest, type_error = result
+                    # The change rate counts upstream changes, whether or not they reach models.json.
+                    previous = self.digests.get(make)
+                    self.state.record(make, previous is not None and digest != previous, time.time())
+                    if type_error is not None:
+                        # Written with heuristic types; without the digest the next check classifies it again.
+                        print(f'  {make}: type lookup failed, heuristic types kept: {type_error}')
+                    else:
+                        self.digests.update({make: digest})
+                    # An empty listing is treated like an error: the old entries stay.
+                    if entries and entries != data[make]:
+                        fresh[make] = entries
+        finally:
+            client.close()
+            if resolver is not None:
+                resolver.store.save()
+
+        if fresh:
+            self._write(fresh, metrics)
+        with metrics.phase('state'):
+            self.digests.save()
+            self.state.save()
+        checked = len(batch) - failed - deferred
+        metrics.count('makes_checked', checked)
+        metrics.count('makes_changed', len(fresh))
+        metrics.count('makes_failed', failed)
+        metrics.count('makes_deferred', deferred)
+        metrics.write(args.metrics_dir)
+        print(f'Refreshed {checked} of {len(batch)} due makes, {len(fresh)} changed'
+              f'{f", {failed} failed" if failed else ""}{f", {deferred} deferred" if deferred else ""}; '
+              f'{self.budget.remaining()} of {args.budget} requests left in the window')
+        if self.concurrency is not None:
+            print(f'  {self.concurrency.report()}')
+        return len(batch)
+
+    def _write(self, fresh, metrics):
+        """Merge the changed makes into models.json, re-read so concurrent edits to other makes survive."""
+        with metrics.phase('write'):
+            current = load_models(DATA_PATH)
+            merged = [(make, fresh.get(make, models)) for make, models in current.items()]
+            diff = build_diff(current, merged)
+            write_models(diff_path(DATA_PATH), diff)
+            backup_models(DATA_PATH, BACKUP_PATH)
+            publish_models(DATA_PATH, merged)
+        print(f"  Updated data/models.json: {', '.join(sorted(fresh))} "
+              f"(+{diff['added']} -{diff['removed']} ~{diff['reclassified']} models)")
+
+    def run(self):
+        while not self.stop.is_set():
+            try:
+                fetched = self.cycle()
+            except Exception as e:
+                if self.args.once:
+                    raise
+                # One bad cycle (e.g. models.json unreadable mid-edit) must not end the daemon.
+                print(f'Refresh cycle failed: {e!r}')
+                fetched = 0
+            if self.args.once:
+                return
+            # Nothing due, or the budget is spent: wait a full interval either way.
+            if not fetched:
+                print(f'  next check in {self.args.interval:g}s')
+            self.stop.wait(self.args.interval)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Refresh data/models.json continuously, stalest makes first.')
+    parser.add_argument('--once', action='store_true', help='run one refresh cycle and exit')
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL,
+                        help=f'seconds between refresh cycles (default {DEFAULT_INTERVAL:g})')
+    parser.add_argument('--budget', type=int, default=DEFAULT_BUDGET,
+                        help=f'max VPIC requests per window (default {DEFAULT_BUDGET})')
+    parser.add_argument('--window', type=float, default=DEFAULT_WINDOW,
+                        help=f'budget window in seconds (default {DEFAULT_WINDOW:g})')
+    parser.add_argument('--min-age', type=float, default=DEFAULT_MIN_AGE,
+                        help=f'seconds before a fetched make is due again (default {DEFAULT_MIN_AGE:g})')
+    parser.add_argument('--batch', type=int, default=DEFAULT_BATCH,
+                        help=f'max makes per cycle (default {DEFAULT_BATCH})')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'max concurrent requests in flight (default {DEFAULT_WORKERS})')
+    parser.add_argument('--rate', type=float,
+                        help='hard cap on requests per second across all workers (default: none)')
+    parser.add_argument('--fixed-concurrency', action='store_true',
+                        help='keep --workers requests in flight instead of adapting to VPIC (see concurrency.py)')
+    parser.add_argument('--no-cache', action='store_true', help='bypass the on-disk response cache')
+    parser.add_argument('--no-type-lookup', action='store_true',
+                        help='keep heuristic types instead of asking VPIC about Unknown ones')
+    parser.add_argument('--demand', default=DEMAND_PATH,
+                        help='per-make request counts written by `serve` (default .cache/make_demand.json)')
+    parser.add_argument('--vpic-base', default=VPIC_BASE, help='VPIC API base URL (e.g. a local stand-in)')
+    parser.add_argument('--metrics-dir', default=METRICS_DIR,
+                        help='where to write each cycle\'s metrics (default .cache/metrics)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not os.path.exists(DATA_PATH):
+        print('data/models.json not found')
+        return 1
+    refresher = Refresher(args)
+    if not args.once:
+        signal.signal(signal.SIGTERM, lambda *_: refresher.stop.set())
+        print(f'Refreshing data/models.json every {args.interval:g}s '
+              f'({args.budget} requests per {args.window:g}s, {pacing(args)})')
+    try:
+        refresher.run()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
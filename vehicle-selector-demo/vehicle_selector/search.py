@@ -0,0 +1,276 @@
+"""Python port of the suggestion ranking in script.js.
+
+`fuzzy_score` mirrors `fuzzyScore` tier for tier, and `rank` mirrors the
+map/filter/sort/slice pipeline of `filterMakeSuggestions` and
+`filterModelSuggestions` (a stable sort, so ties keep candidate order).
+`rank` is the linear reference; `SuggestionIndex` returns the same results
+from indexes, so query cost stays nearly flat as the catalog grows:
+
+- exact and prefix tiers: a sorted array of lower-cased names (bisect);
+- word-boundary tier: a sorted array of the suffixes that start a word;
+- substring tier: an n-gram inverted index (n = 1..3) to find candidates;
+- subsequence tier: checked only on names that contain every query
+  character and matched no earlier tier.
+
+Usage:
+  python -m vehicle_selector search --check [--data data/models.json]
+
+checks SuggestionIndex against `rank` on generated queries over the catalog,
+and `rank` against script.js's own fuzzyScore when `node` is available.
+"""
+import argparse
+import bisect
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+
+BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_PATH = os.path.join(BASE, 'data', 'models.json')
+SCRIPT_JS = os.path.join(BASE, 'script.js')
+GRAM = 3
+
+
+def fuzzy_score(text, term):
+    """Score `text` against `term` exactly like script.js `fuzzyScore`."""
+    t = term.lower()
+    txt = text.lower()
+
+    # Exact match gets highest score
+    if txt == t:
+        return 1000
+
+    # Starts with search term gets very high score
+    if txt.startswith(t):
+        return 500
+
+    # Word boundary match (e.g., "Mercedes" matches "Mercedes-Benz")
+    if (' ' + t) in txt or ('-' + t) in txt:
+        return 300
+
+    # Contains search term; earlier matches score higher
+    pos = txt.find(t)
+    if pos != -1:
+        return 100 - pos
+
+    # Character sequence match (e.g., "mrcds" matches "Mercedes")
+    char_index = 0
+    for ch in txt:
+        if char_index == len(t):
+            break
+        if ch == t[char_index]:
+            char_index += 1
+    if char_index == len(t):
+        return 50 - (len(t) - char_index)
+
+    return 0
+
+
+def rank(candidates, term, limit, key=None):
+    """Return up to `limit` candidates with a positive score, best first."""
+    key = key or (lambda c: c)
+    scored = [(fuzzy_score(key(c), term), c) for c in candidates]
+    scored = [item for item in scored if item[0] > 0]
+    scored.sort(key=lambda item: -item[0])
+    return [c for _, c in scored[:limit]]
+
+
+def _prefix_range(sorted_keys, term):
+    """Indexes into `sorted_keys` of the keys that start with `term`."""
+    lo = bisect.bisect_left(sorted_keys, term)
+    hi = lo
+    while hi < len(sorted_keys) and sorted_keys[hi].startswith(term):
+        hi += 1
+    return range(lo, hi)
+
+
+def _is_subsequence(term, txt):
+    it = iter(txt)
+    return all(ch in it for ch in term)
+
+
+class SuggestionIndex:
+    """Indexed equivalent of `rank(names, term, limit)` for a fixed list of names."""
+
+    def __init__(self, names):
+        self.names = list(names)
+        self.lowers = [n.lower() for n in self.names]
+
+        exact = {}
+        for i, low in enumerate(self.lowers):
+            exact.setdefault(low, []).append(i)
+        self.exact = exact
+
+        order = sorted(range(len(self.lowers)), key=self.lowers.__getitem__)
+        self.sorted_keys = [self.lowers[i] for i in order]
+        self.sorted_ids = order
+
+        words = []
+        for i, low in enumerate(self.lowers):
+            for pos, ch in enumerate(low):
+                if ch == ' ' or ch == '-':
+                    words.append((low[pos + 1:], i))
+        words.sort()
+        self.word_keys = [w for w, _ in words]
+        self.word_ids = [i for _, i in words]
+
+        grams = {}
+        for i, low in enumerate(self.lowers):
+            for n in range(1, GRAM + 1):
+                for pos in range(len(low) - n + 1):
+                    grams.setdefault(low[pos:pos + n], set()).add(i)
+        self.grams = grams
+
+    def _postings(self, keys):
+        sets = []
+        for key in set(keys):
+            posting = self.grams.get(key)
+            if not posting:
+                return set()
+            sets.append(posting)
+        sets.sort(key=len)
+        return set.intersection(*sets) if sets else set()
+
+    def rank_ids(self, term, limit):
+        """Ids (positions in `names`) of the best `limit` matches, best first."""
+        t = term.lower()
+        if not t:
+            return rank(range(len(self.names)), term, limit, key=self.names.__getitem__)
+
+        seen = set(self.exact.get(t, ()))
+        tiers = [sorted(seen)]
+
+        prefix = [self.sorted_ids[j] for j in _prefix_range(self.sorted_keys, t)]
+        prefix = sorted(i for i in prefix if i not in seen)
+        seen.update(prefix)
+        tiers.append(prefix)
+
+        boundary = {self.word_ids[j] for j in _prefix_range(self.word_keys, t)} - seen
+        seen.update(boundary)
+        tiers.append(sorted(boundary))
+
+        high = [i for tier in tiers for i in tier]
+        if len(high) >= limit:
+            return high[:limit]
+
+        # Substring tier: n-gram candidates, verified with find().
+        if len(t) <= GRAM:
+            candidates = set(self.grams.get(t, ()))
+        else:
+            candidates = self._postings(t[pos:pos + GRAM] for pos in range(len(t) - GRAM + 1))
+        scored = []
+        containing = set()
+        for i in candidates:
+            pos = self.lowers[i].find(t)
+            if pos == -1:
+                continue
+            containing.add(i)
+            if i not in seen and 100 - pos > 0:
+                scored.append((100 - pos, i))
+
+        # Subsequence tier: only names holding every query character.
+        for i in self._postings(t) - seen - containing:
+            if _is_subsequence(t, self.lowers[i]):
+                scored.append((50, i))
+
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return (high + [i for _, i in scored])[:limit]
+
+    def rank(self, term, limit):
+        """Names of the best `limit` matches, exactly as `rank(names, term, limit)`."""
+        return [self.names[i] for i in self.rank_ids(term, limit)]
+
+
+def sample_terms(names, count=2000, seed=7):
+    """Queries that exercise every tier: prefixes, inner substrings, subsequences, misses."""
+    rng = random.Random(seed)
+    terms = set()
+    for name in names:
+        low = name.lower()
+        for n in range(1, min(4, len(low)) + 1):
+            terms.add(low[:n])
+    pool = [n.lower() for n in names if n]
+    for _ in range(count):
+        low = rng.choice(pool)
+        a = rng.randrange(len(low))
+        b = rng.randrange(a, len(low)) + 1
+        terms.add(low[a:b])
+        picks = sorted(rng.sample(range(len(low)), min(len(low), rng.randint(1, 4))))
+        terms.add(''.join(low[k] for k in picks))
+        terms.add(''.join(rng.choice('aeiouxyz') for _ in range(rng.randint(1, 3))))
+    return sorted(t for t in (t.strip() for t in terms) if t)
+
+
+def _js_rank(names, terms, limit):
+    """Rank with script.js's own fuzzyScore via node; returns None if node is unavailable."""
+    node = shutil.which('node')
+    if node is None:
+        return None
+    with open(SCRIPT_JS, 'r', encoding='utf-8') as f:
+        src = f.read()
+    start = src.index('function fuzzyScore')
+    end = src.index('\n}', start) + 2
+    program = src[start:end] + """
+const input = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+const out = input.terms.map(t => input.names
+  .map(n => ({ n, score: fuzzyScore(n, t) }))
+  .filter(item => item.score > 0)
+  .sort((a, b) => b.score - a.score)
+  .slice(0, input.limit)
+  .map(item => item.n));
+process.stdout.write(JSON.stringify(out));
+"""
+    proc = subprocess.run([node, '-e', program], input=json.dumps({'names': names, 'terms': terms, 'limit': limit}),
+                          capture_output=True, text=True, encoding='utf-8', check=True)
+    return json.loads(proc.stdout)
+
+
+def check(data, limit=12):
+    """Compare SuggestionIndex, rank and (if possible) script.js; returns the mismatch count."""
+    groups = [('makes', sorted(data))] + [(make, [m['name'] for m in models]) for make, models in data.items()]
+    all_models = [m['name'] for models in data.values() for m in models]
+    groups.append(('all models', all_models))
+
+    mismatches = 0
+    checked = 0
+    for label, names in groups:
+        index = SuggestionIndex(names)
+        terms = sample_terms(names, count=200 if label != 'all models' else 2000)
+        expected = [rank(names, t, limit) for t in terms]
+        for t, want in zip(terms, expected):
+            got = index.rank(t, limit)
+            checked += 1
+            if got != want:
+                mismatches += 1
+                print(f'index mismatch [{label}] {t!r}: {got} != {want}')
+
+        js = _js_rank(names, terms, limit) if label in ('makes', 'all models') else None
+        if js is not None:
+            for t, want, got in zip(terms, js, expected):
+                checked += 1
+                if got != want:
+                    mismatches += 1
+                    print(f'script.js mismatch [{label}] {t!r}: {got} != {want}')
+
+    print(f'Checked {checked} queries: {mismatches} mismatches'
+          + ('' if shutil.which('node') else ' (node not found; script.js comparison skipped)'))
+    return mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Check the indexed suggestion ranking against script.js.')
+    parser.add_argument('--check', action='store_true', help='run the equivalence check')
+    parser.add_argument('--data', default=DATA_PATH, help='models.json to draw names and queries from')
+    args = parser.parse_args(argv)
+    if not args.check:
+        parser.print_help()
+        return 0
+    with open(args.data, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return 1 if check(data) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,360 @@
+"""Local asyncio suggestion API for the vehicle selector.
+
+Usage:
+  python -m vehicle_selector serve [--host 127.0.0.1] [--port 8000] [--data data/models.json] [--demand PATH]
+
+Endpoints (all GET, JSON responses):
+  /api/vehicles                       the whole catalog, same shape as models.json
+  /api/vehicles/<make>                models for one make (case-insensitive)
+  /api/makes?q=to&limit=12            ranked make suggestions
+  /api/models?make=Toyota&q=ca&limit=20
+                                      ranked model suggestions for one make
+  /api/lookup?make=toyota&model=camry exact (case-insensitive) make/model lookup;
+                                      model aliases (other VPIC spellings) resolve too
+  /healthz                            catalog stats
+
+Suggestions are ranked exactly like `fuzzyScore` in script.js. models.json is
+loaded once into in-memory indexes; hot queries are served from an LRU cache,
+and the catalog (with a fresh cache) is swapped in whenever the file changes.
+Only the standard library is used.
+
+Requests that name a make (/api/vehicles/<make>, /api/models, /api/lookup)
+are counted per make and added to .cache/make_demand.json every few seconds;
+the refresh daemon (refresh_daemon.py) refreshes the most requested makes
+first. `--demand ''` turns the counting off.
+
+Request bodies are never used: one of up to 64 KiB is read and discarded so
+a keep-alive connection stays in step, and a larger or chunked one closes
+the connection after the response. An unexpected error answers 500.
+"""
+import argparse
+import asyncio
+import collections
+import functools
+import json
+import os
+import threading
+import urllib.parse
+
+from .models_io import load_models, write_compact
+from .search import SuggestionIndex
+
+BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_PATH = os.path.join(BASE, 'data', 'models.json')
+DEMAND_PATH = os.path.join(BASE, '.cache', 'make_demand.json')
+
+MAKE_LIMIT = 12
+MODEL_LIMIT = 20
+MAX_LIMIT = 200
+CACHE_SIZE = 4096
+MAX_BODY = 64 * 1024  # bytes of a request body drained to keep the connection open
+RELOAD_INTERVAL = 2.0  # seconds between models.json change checks
+DEMAND_FLUSH_INTERVAL = 30.0  # seconds between demand count writes
+
+
+def _model_lookup(models):
+    """{lower-cased name or alias: model}; a model's own name wins over another's alias."""
+    lookup = {}
+    for m in models:
+        for alias in m.get('aliases', ()):
+            lookup.setdefault(alias.lower(), m)
+    lookup.update((m['name'].lower(), m) for m in models)
+    return lookup
+
+
+class Catalog:
+    """Immutable in-memory indexes over one snapshot of models.json."""
+
+    def __init__(self, data, cache_size=CACHE_SIZE):
+        self.data = data
+        self.makes = sorted(data)
+        self.make_by_lower = {m.lower(): m for m in self.makes}
+        self.model_by_lower = {make: _model_lookup(models) for make, models in data.items()}
+        self.model_count = sum(len(models) for models in data.values())
+        self.make_index = SuggestionIndex(self.makes)
+        self.model_index = {
+            make: SuggestionIndex(m['name'] for m in models) for make, models in data.items()
+        }
+        self.suggest_makes = functools.lru_cache(maxsize=cache_size)(self._suggest_makes)
+        self.suggest_models = functools.lru_cache(maxsize=cache_size)(self._suggest_models)
+
+    def find_make(self, make):
+        return self.make_by_lower.get((make or '').strip().lower())
+
+    def _suggest_makes(self, term, limit):
+        return tuple(self.make_index.rank(term, limit))
+
+    def _suggest_models(self, make, term, limit):
+        models = self.data[make]
+        return tuple(models[i] for i in self.model_index[make].rank_ids(term, limit))
+
+    def lookup(self, make, model):
+        make = self.find_make(make)
+        if make is None:
+            return None, None
+        return make, self.model_by_lower[make].get((model or '').strip().lower())
+
+
+class CatalogHolder:
+    """Owns the current Catalog and swaps in a new one when the file changes."""
+
+    def __init__(self, path):
+        self.path = path
+        self.signature = None
+        self.catalog = None
+
+    def _stat(self):
+        st = os.stat(self.path)
+        return st.st_mtime_ns, st.st_size
+
+    def _build(self):
+        signature = self._stat()
+        return Catalog(load_models(self.path)), signature
+
+    def load(self):
+        self.catalog, self.signature = self._build()
+
+    async def watch(self, interval=RELOAD_INTERVAL):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                if self._stat() == self.signature:
+                    continue
+                catalog, signature = await asyncio.to_thread(self._build)
+            except (OSError, ValueError) as e:
+                # Mid-replace or malformed file: keep serving the old snapshot.
+                print('Reload skipped:', e)
+                continue
+            self.catalog, self.signature = catalog, signature
+            print(f'Reloaded {self.path}: {len(catalog.makes)} makes, {catalog.model_count} models')
+
+
+def load_demand(path=DEMAND_PATH):
+    """{make: request count} as last flushed to `path`; empty when there is none."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            demand = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    return demand if isinstance(demand, dict) else {}
+
+
+class DemandLog:
+    """Per-make request counts, added to the totals in a JSON file on `flush`.
+
+    `count` and `take` run on the event loop only, so counting needs no
+    lock; `flush` writes a detached Counter and may run in a worker thread.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.pending = collections.Counter()
+        self.lock = threading.Lock()  # serializes writes to the file
+
+    def count(self, make):
+        self.pending[make] += 1
+
+    def take(self):
+        """Detach and return the counts gathered since the last call."""
+        pending, self.pending = self.pending, collections.Counter()
+        return pending
+
+    def flush(self, pending=None):
+        """Add `pending` (by default, everything counted so far) to the file."""
+        if pending is None:
+            pending = self.take()
+        if not pending:
+            return
+        with self.lock:
+            totals = collections.Counter(load_demand(self.path))
+            totals.update(pending)
+            write_compact(self.path, dict(sorted(totals.items())))
+
+    async def watch(self, interval=DEMAND_FLUSH_INTERVAL):
+        try:
+            while True:
+                await asyncio.sleep(interval)
+                pending = self.take()
+                try:
+                    await asyncio.to_thread(self.flush, pending)
+                except OSError as e:
+                    self.pending.update(pending)  # retried on the next flush
+                    print('Demand flush skipped:', e)
+        finally:
+            self.flush()
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           500: 'Internal Server Error'}
+
+
+def _limit(params, default):
+    raw = params.get('limit', [str(default)])[0]
+    try:
+        return max(1, min(MAX_LIMIT, int(raw)))
+    except ValueError:
+        raise HTTPError(400, f'invalid limit: {raw!r}')
+
+
+def route(catalog, target, demand=None):
+    """Resolve one request target against `catalog`; returns a JSON-able value.
+
+    Makes that requests resolve are counted in `demand` (a DemandLog) if given.
+    """
+    parsed = urllib.parse.urlsplit(target)
+    path = urllib.parse.unquote(parsed.path).rstrip('/') or '/'
+    params = urllib.parse.parse_qs(parsed.query)
+    term = params.get('q', [''])[0].strip()
+
+    if path == '/healthz':
+        return {'makes': len(catalog.makes), 'models': catalog.model_count}
+
+    if path == '/api/vehicles':
+        return catalog.data
+
+    if path.startswith('/api/vehicles/'):
+        make = catalog.find_make(path[len('/api/vehicles/'):])
+        if make is None:
+            raise HTTPError(404, 'unknown make')
+        if demand is not None:
+            demand.count(make)
+        return {'make': make, 'models': catalog.data[make]}
+
+    if path == '/api/makes':
+        limit = _limit(params, MAKE_LIMIT)
+        if not term:
+            return {'makes': catalog.makes[:limit]}
+        return {'makes': list(catalog.suggest_makes(term, limit))}
+
+    if path == '/api/models':
+        make = catalog.find_make(params.get('make', [''])[0])
+        if make is None:
+            raise HTTPError(404, 'unknown make')
+        limit = _limit(params, MODEL_LIMIT)
+        if demand is not None:
+            demand.count(make)
+        if not term:
+            return {'make': make, 'models': catalog.data[make][:limit]}
+        return {'make': make, 'models': list(catalog.suggest_models(make, term, limit))}
+
+    if path == '/api/lookup':
+        make, model = catalog.lookup(params.get('make', [''])[0], params.get('model', [''])[0])
+        if make is not None and demand is not None:
+            demand.count(make)
+        if model is None:
+            raise HTTPError(404, 'unknown make/model')
+        return {'make': make, 'model': model}
+
+    raise HTTPError(404, 'not found')
+
+
+def _response(status, body, keep_alive, head=False):
+    payload = json.dumps(body, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    headers = [
+        f'HTTP/1.1 {status} {REASONS.get(status, "")}',
+        'Content-Type: application/json; charset=utf-8',
+        f'Content-Length: {len(payload)}',
+        'Access-Control-Allow-Origin: *',
+        'Cache-Control: no-cache',
+        f'Connection: {"keep-alive" if keep_alive else "close"}',
+    ]
+    head_bytes = ('\r\n'.join(headers) + '\r\n\r\n').encode('latin-1')
+    return head_bytes if head else head_bytes + payload
+
+
+async def handle(holder, demand, reader, writer):
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            try:
+                method, target, version = request_line.decode('latin-1').split()
+            except ValueError:
+                writer.write(_response(400, {'error': 'malformed request line'}, False))
+                break
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+            connection = headers.get('connection', '').lower()
+            keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+            # Left unread, a body would be parsed as the next request line.
+            if 'transfer-encoding' in headers:
+                keep_alive = False
+            elif 'content-length' in headers:
+                try:
+                    length = int(headers['content-length'])
+                except ValueError:
+                    length = -1
+                if 0 <= length <= MAX_BODY:
+                    await reader.readexactly(length)
+                else:
+                    keep_alive = False
+
+            if method not in ('GET', 'HEAD'):
+                status, body = 405, {'error': 'method not allowed'}
+            else:
+                try:
+                    status, body = 200, route(holder.catalog, target, demand)
+                except HTTPError as e:
+                    status, body = e.status, {'error': e.message}
+                except Exception as e:
+                    print(f'Error serving {target}: {e!r}')
+                    status, body = 500, {'error': 'internal server error'}
+            writer.write(_response(status, body, keep_alive, head=method == 'HEAD'))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host, port, path, demand_path=DEMAND_PATH):
+    holder = CatalogHolder(path)
+    holder.load()
+    print(f'Loaded {path}: {len(holder.catalog.makes)} makes, {holder.catalog.model_count} models')
+    demand = DemandLog(demand_path) if demand_path else None
+    server = await asyncio.start_server(functools.partial(handle, holder, demand), host, port)
+    print(f'Serving on http://{host}:{port}/api/vehicles')
+    watchers = [asyncio.create_task(holder.watch())]
+    if demand is not None:
+        watchers.append(asyncio.create_task(demand.watch()))
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        for watcher in watchers:
+            watcher.cancel()
+        await asyncio.gather(*watchers, return_exceptions=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve make/model suggestions from models.json.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--data', default=DATA_PATH, help='models.json to serve')
+    parser.add_argument('--demand', default=DEMAND_PATH,
+                        help="per-make request counts for the refresh daemon ('' to disable)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.data, args.demand))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
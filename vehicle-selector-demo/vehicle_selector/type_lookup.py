@@ -0,0 +1,182 @@
+"""Authoritative vehicle types from VPIC for models the name heuristics cannot place.
+
+Only models that vehicle_types.py marks Unknown, or matched through a weak
+keyword (see `is_confident`), are looked up. VPIC has no per-model type call,
+so lookups are batched per make: GetVehicleTypesForMake lists the make's
+vehicle types, then one GetModelsForMakeYear/make/<make>/vehicletype/<type>
+request per type lists the models of that type (all years). That answers
+every model of the make in a handful of requests.
+
+The (make, model) -> VPIC types answers, including "VPIC does not list it",
+are kept permanently in .cache/vpic_types.json, per API base URL, so a make is
+only asked about again when it gains a model the file has never seen. Delete
+the file to start over.
+
+VPIC types are broad (a "Passenger Car" may be a sedan, coupe or hatchback),
+so a heuristic type that VPIC's answer confirms is kept and only a missing or
+contradicted one is replaced, always by one of the types vehicle_types.py
+uses: a passenger car becomes a Sedan, an MPV an SUV, a bus a Van. Classes
+with no such type (motorcycles, trailers, ...) never replace the heuristic.
+"""
+import json
+import os
+import threading
+
+from .models_io import write_compact
+from .normalize import canonical_key
+from .vehicle_types import infer_subtiers, is_confident
+
+BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TYPES_PATH = os.path.join(BASE, '.cache', 'vpic_types.json')
+
+# VPIC vehicle type (lower case) -> (catalog type, or None to keep the heuristic
+# type; heuristic types it confirms), in the order used when a model is listed
+# under several types.
+VPIC_TYPES = {
+    'passenger car': ('Sedan', {'Sedan', 'Coupe', 'Roadster', 'Hatchback', 'Wagon'}),
+    'multipurpose passenger vehicle (mpv)': ('SUV', {'SUV', 'Minivan', 'Van', 'Wagon'}),
+    'truck': ('Truck', {'Truck', 'Van'}),
+    'bus': ('Van', {'Van', 'Minivan'}),
+    'motorcycle': (None, set()),
+    'low speed vehicle (lsv)': (None, set()),
+    'off road vehicle': (None, set()),
+    'trailer': (None, set()),
+    'incomplete vehicle': (None, set()),
+}
+
+
+def needs_lookup(entry):
+    """True when `entry`'s type came from no keyword or a weak one."""
+    return entry.get('type') == 'Unknown' or not is_confident(entry.get('name'))
+
+
+def catalog_type(vpic_types, heuristic):
+    """Catalog type for a model VPIC lists under `vpic_types`, or None to keep `heuristic`."""
+    known = [VPIC_TYPES[t] for t in VPIC_TYPES if t in {v.strip().lower() for v in vpic_types}]
+    if any(heuristic in confirms for _, confirms in known):
+        return None
+    return next((vtype for vtype, _ in known if vtype is not None), None)
+
+
+class TypeStore:
+    """{make: {model key: [VPIC type names]}} for one API base, persisted as JSON.
+
+    An empty list records that VPIC does not list the model under any type.
+    Thread-safe, so workers can share one store.
+    """
+
+    def __init__(self, path, base):
+        self.path = path
+        self.base = base
+        self.all = {}
+        self.types = {}
+        self.lock = threading.Lock()
+        self.dirty = False
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.all = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.all = {}
+        self.types = self.all.setdefault(self.base, {})
+        return self
+
+    def get(self, make, key):
+        with self.lock:
+            return self.types.get(make.lower(), {}).get(key)
+
+    def make_types(self, make):
+        """The VPIC types the store has seen for any of `make`'s models."""
+        with self.lock:
+            return {t for types in self.types.get(make.lower(), {}).values() for t in types}
+
+    def update(self, make, types):
+        with self.lock:
+            self.types.setdefault(make.lower(), {}).update(types)
+            self.dirty = True
+
+    def save(self):
+        with self.lock:
+            if self.dirty:
+                write_compact(self.path, self.all)
+                self.dirty = False
+
+
+def lookup_cost(store, make, entries):
+    """VPIC requests `TypeResolver.resolve(make, entries)` is expected to make.
+
+    0 when `store` already answers for every entry that needs a lookup;
+    otherwise GetVehicleTypesForMake plus one listing per type the store has
+    seen for the make, or per VPIC type for a make it has never seen.
+    """
+    keys = [canonical_key(e['name']) for e in entries if needs_lookup(e)]
+    if all(store.get(make, k) is not None for k in keys):
+        return 0
+    return 1 + (len(store.make_types(make)) or len(VPIC_TYPES))
+
+
+class TypeResolver:
+    """Replaces Unknown and low-confidence types in a make's entries with VPIC's answer."""
+
+    def __init__(self, client, store):
+        self.client = client
+        self.store = store
+        self.stats = {'lookups': 0, 'checked': 0, 'changed': 0}
+        self.lock = threading.Lock()
+
+    def _count(self, **counts):
+        with self.lock:
+            for name, n in counts.items():
+                self.stats[name] += n
+
+    def lookup_make(self, make):
+        """{model key: [VPIC type names]} for every model VPIC lists for `make`."""
+        vpic_types = []
+        rows = self.client.get_vehicle_types_for_make(make)
+        # VPIC matches the make as a substring; keep exact matches when there are any.
+        exact = [r for r in rows if (r.get('MakeName') or '').strip().lower() == make.lower()]
+        for row in exact or rows:
+            name = (row.get('VehicleTypeName') or '').strip()
+            if name and name not in vpic_types:
+                vpic_types.append(name)
+        found = {}
+        for vtype in vpic_types:
+            for row in self.client.get_make_type_results(make, vtype):
+                key = canonical_key(row.get('Model_Name') or '')
+                if key and vtype not in found.setdefault(key, []):
+                    found[key].append(vtype)
+        self._count(lookups=1)
+        return found
+
+    def resolve(self, make, entries):
+        """Update `entries` in place; returns how many changed type."""
+        pending = [e for e in entries if needs_lookup(e)]
+        if not pending:
+            return 0
+        keys = {id(e): canonical_key(e['name']) for e in pending}
+        if any(self.store.get(make, k) is None for k in keys.values()):
+            found = self.lookup_make(make)
+            # Aliases are other spellings of the same model: let them answer for it.
+            for e in pending:
+                if keys[id(e)] not in found:
+                    for alias in e.get('aliases', ()):
+                        if canonical_key(alias) in found:
+                            found[keys[id(e)]] = found[canonical_key(alias)]
+                            break
+            found.update((k, []) for k in keys.values() if k not in found)
+            self.store.update(make, found)
+
+        changed = 0
+        for e in pending:
+            vtype = catalog_type(self.store.get(make, keys[id(e)]) or [], e['type'])
+            if vtype is not None and vtype != e['type']:
+                e['type'] = vtype
+                e['subtiers'] = infer_subtiers(vtype, e['name'])
+                changed += 1
+        self._count(checked=len(pending), changed=changed)
+        return changed
+
+    def report(self):
+        s = self.stats
+        return f"Types: {s['checked']} checked against VPIC, {s['changed']} changed ({s['lookups']} makes looked up)"
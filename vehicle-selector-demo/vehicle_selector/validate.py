@@ -0,0 +1,82 @@
+"""Check a catalog file for problems before it is published.
+
+Usage:
+  python -m vehicle_selector validate [data/models.json ...]
+
+A catalog is a JSON object mapping make names to non-empty lists of entries.
+Each entry needs a non-empty string `name`, a string `type` and a list of
+string `subtiers`; `aliases`, when present, is a list of strings. Model names
+must be unique within a make and make names unique ignoring case (script.js
+and the API match them case-insensitively). Exits non-zero on any problem.
+"""
+import argparse
+import os
+import sys
+
+from .models_io import load_models
+
+BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_PATH = os.path.join(BASE, 'data', 'models.json')
+
+
+def _is_str_list(value):
+    return isinstance(value, list) and all(isinstance(v, str) for v in value)
+
+
+def validate(data):
+    """Return a list of problems found in `data` (empty when it is valid)."""
+    if not isinstance(data, dict):
+        return ['top level is not an object of makes']
+    problems = []
+    makes = {}
+    for make, models in data.items():
+        other = makes.setdefault(make.lower(), make)
+        if other != make:
+            problems.append(f'{make}: same make as {other!r} ignoring case')
+        if not isinstance(models, list) or not models:
+            problems.append(f'{make}: expected a non-empty list of models')
+            continue
+        names = set()
+        for i, m in enumerate(models):
+            where = f'{make}[{i}]'
+            if not isinstance(m, dict):
+                problems.append(f'{where}: not an object')
+                continue
+            name = m.get('name')
+            if not isinstance(name, str) or not name.strip():
+                problems.append(f'{where}: missing name')
+            elif name.lower() in names:
+                problems.append(f'{where}: duplicate model {name!r}')
+            else:
+                names.add(name.lower())
+            if not isinstance(m.get('type'), str):
+                problems.append(f'{where}: missing type')
+            if not _is_str_list(m.get('subtiers')):
+                problems.append(f'{where}: subtiers is not a list of strings')
+            if 'aliases' in m and not _is_str_list(m['aliases']):
+                problems.append(f'{where}: aliases is not a list of strings')
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Validate catalog files.')
+    parser.add_argument('paths', nargs='*', default=[DATA_PATH], help='files to check (default data/models.json)')
+    args = parser.parse_args(argv)
+
+    failed = 0
+    for path in args.paths:
+        try:
+            problems = validate(load_models(path))
+        except (OSError, ValueError) as e:
+            problems = [str(e)]
+        for problem in problems:
+            print(f'{path}: {problem}')
+        if problems:
+            failed += 1
+        else:
+            print(f'✓ {path}')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""Vehicle type and subtier inference from model names.
+
+The keyword table below is compiled once into a single regex with word
+boundaries, so each name is classified in one pass instead of one substring
+scan per keyword. Rules are listed in priority order: when a name matches
+keywords of several types, the earliest rule wins.
+"""
+import re
+
+# (type, keyword patterns). Patterns are regex fragments matched as whole words.
+TYPE_RULES = [
+    ('Truck', [r'f-?[1-7]50', r'f-?100', 'silverado', 'sierra', 'ram', 'tundra', 'tacoma',
+               'frontier', 'colorado', 'ranger', 'gladiator', r'\w*truck\w*', 'pickup']),
+    ('Roadster', ['roadster', 'miata', 'mx-5']),
+    ('Coupe', ['911', 'boxster', 'cayman', 'corvette', 'camaro', 'challenger', 'mustang',
+               r'coupes?']),
+    ('SUV', ['suv', 'explorer', 'escape', 'expedition', 'tahoe', 'suburban', 'yukon', 'denali',
+             'rogue', 'pathfinder', 'highlander', 'rav4', r'cx-\d+', r'qx\d+', 'q3', 'q5', 'q7', 'x3', 'x5',
+             'x7', 'gla', 'gle', 'glc', 'forester', 'crosstrek', 'outback', 'wrangler', 'cherokee',
+             'compass', 'renegade']),
+    ('Sedan', ['sedan', 'accord', 'civic', 'camry', 'corolla', 'prius', 'altima', 'maxima',
+               'sentra', 'elantra', 'sonata', 'forte', 'rio', 'optima', 'a3', 'a4', 'a6', 'a8', r'mazda[36]',
+               r'[357] series', r'[ces]-class', r'(?:is|es|gs|ls)(?: ?\d{3}[a-z]*)?',
+               r'model [3s]', 'charger']),
+    ('Hatchback', [r'hatch\w*', 'golf', 'focus']),
+    ('Wagon', [r'\w*wagon']),
+    ('Minivan', ['minivan', 'odyssey', r'(?:grand )?caravan', 'sienna', 'pacifica']),
+    ('Van', ['van', 'sprinter', r'prom[ae]ster', 'transit']),
+]
+
+# (type substrings, subtiers), checked in order.
+SUBTIER_RULES = [
+    (('truck',), ["Single-Cab", "Double-Cab", "Crew-Cab"]),
+    (('coupe', 'roadster'), ["2-Door"]),
+    (('sedan',), ["4-Door"]),
+    (('hatch',), ["3-Door", "5-Door"]),
+    (('suv', 'crossover', 'wagon'), ["Standard"]),
+    (('van', 'minivan'), ["Standard", "Extended"]),
+]
+DEFAULT_SUBTIERS = ["Standard"]
+
+# Keywords that pick a subtier rule from the name alone, whatever the type.
+SUBTIER_HINTS = {'pickup': 0, 'coupe': 1, 'coupes': 1, 'roadster': 1, 'sedan': 2, 'hatchback': 3}
+
+# Keywords that are short codes or everyday words and so often match inside
+# unrelated names ('is' in "This Is", 'van' in "Van Hool"). A type found only
+# through one of these is low-confidence and worth checking against VPIC.
+WEAK_KEYWORDS = {
+    'is', 'es', 'gs', 'ls', 'ram', 'rio', 'van',
+    'a3', 'a4', 'a6', 'a8', 'q3', 'q5', 'q7', 'x3', 'x5', 'x7', 'gla', 'gle', 'glc',
+    'compass', 'escape', 'focus', 'frontier', 'ranger', 'transit',
+}
+
+
+def _compile_types(rules):
+    parts = []
+    for i, (_, patterns) in enumerate(rules):
+        alternatives = '|'.join(f'(?:{p})' for p in patterns)
+        parts.append(f'(?P<r{i}>{alternatives})')
+    # Names are lower-cased before matching; that is cheaper than re.IGNORECASE.
+    return re.compile(r'(?<!\w)(?:' + '|'.join(parts) + r')(?!\w)')
+
+
+TYPE_RE = _compile_types(TYPE_RULES)
+TYPE_NAMES = [vtype for vtype, _ in TYPE_RULES]
+NO_MATCH = len(TYPE_RULES)
+
+
+def _scan(model_name):
+    """One regex pass over the name: (best type rule, subtier hint rule)."""
+    best = NO_MATCH
+    hint = None
+    for m in TYPE_RE.finditer((model_name or '').lower()):
+        rule = int(m.lastgroup[1:])
+        if rule < best:
+            best = rule
+        h = SUBTIER_HINTS.get(m.group())
+        if h is not None and (hint is None or h < hint):
+            hint = h
+    return best, hint
+
+
+_subtier_memo = {}
+
+
+def _subtiers(vtype, hint):
+    # There are only a handful of (type, hint) pairs, so resolve each once.
+    key = (vtype, hint)
+    subtiers = _subtier_memo.get(key)
+    if subtiers is None:
+        t = (vtype or '').lower()
+        subtiers = DEFAULT_SUBTIERS
+        for i, (type_keys, rule_subtiers) in enumerate(SUBTIER_RULES):
+            if i == hint or any(k in t for k in type_keys):
+                subtiers = rule_subtiers
+                break
+        _subtier_memo[key] = subtiers
+    return list(subtiers)
+
+
+def infer_vehicle_type_from_model_name(model_name):
+    """Infer vehicle type from model name patterns only (no API calls)."""
+    best, _ = _scan(model_name)
+    return TYPE_NAMES[best] if best < NO_MATCH else 'Unknown'
+
+
+def infer_subtiers(vtype, model_name):
+    """Infer subtier options based on vehicle type (and a few name hints)."""
+    _, hint = _scan(model_name)
+    return _subtiers(vtype, hint)
+
+
+def classify(model_name):
+    """Return (vehicle type, subtiers) for one model name."""
+    best, hint = _scan(model_name)
+    vtype = TYPE_NAMES[best] if best < NO_MATCH else 'Unknown'
+    return vtype, _subtiers(vtype, hint)
+
+
+def is_confident(model_name):
+    """True when the name's type comes from a distinctive keyword (False for a weak match or none)."""
+    best, word = NO_MATCH, None
+    for m in TYPE_RE.finditer((model_name or '').lower()):
+        rule = int(m.lastgroup[1:])
+        if rule < best:
+            best, word = rule, m.group()
+    return best < NO_MATCH and word not in WEAK_KEYWORDS
+
+
+def classify_many(names):
+    """Classify a batch of model names; returns a list of (type, subtiers) pairs.
+
+    Repeated names are classified once.
+    """
+    seen = {}
+    out = []
+    for name in names:
+        result = seen.get(name)
+        if result is None:
+            result = seen[name] = classify(name)
+        out.append((result[0], list(result[1])))
+    return out
+
@@ -0,0 +1,164 @@
+"""Persistent on-disk cache for raw VPIC responses.
+
+Entries are keyed by endpoint + key (e.g. GetModelsForMake + make name) and
+stored one JSON file each under `.cache/vpic/`. Fresh entries are served from
+disk; stale entries are revalidated with If-None-Match / If-Modified-Since so
+an unchanged upstream answer costs a 304 instead of a full body.
+
+The least-recently-used order is read from the files' mtimes once, on first
+use, and then kept in memory, so each new entry evicts at most a few old ones
+without rescanning the directory.
+"""
+import collections
+import hashlib
+import json
+import os
+import threading
+import time
+
+BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(BASE, '.cache', 'vpic')
+
+DEFAULT_TTL = 7 * 24 * 3600  # one week
+DEFAULT_MAX_ENTRIES = 5000
+
+
+class ResponseCache:
+    """Disk-backed response cache with per-entry TTL and an LRU eviction cap.
+
+    Each entry records the TTL it was stored with; a smaller `ttl` passed here
+    shortens it (so `ttl=0` forces revalidation of everything).
+    """
+
+    def __init__(self, directory=CACHE_DIR, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.recent = None  # entry file name -> None, least recently used first
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0, 'evicted': 0}
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, endpoint, key, url):
+        # The URL is part of the key so a stand-in server never shares entries with the real API.
+        digest = hashlib.sha1(f'{endpoint}\0{key}\0{url}'.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f'{endpoint}-{digest[:16]}.json')
+
+    def _load(self, path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _store(self, path, entry):
+        tmp = f'{path}.{threading.get_ident()}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def _count(self, stat):
+        with self.lock:
+            self.stats[stat] += 1
+
+    def get(self, url, endpoint, key, fetch, revalidate=False):
+        """Return the response body for `url`, from disk when possible.
+
+        `fetch(url, headers)` performs the real request and must return an
+        object with `status_code`, `headers`, `text` and `raise_for_status()`
+        (a `requests.Response` works). With `revalidate`, a fresh entry is
+        revalidated anyway, so the caller sees upstream changes at the cost
+        of a 304; the entry keeps this cache's TTL for everyone else.
+        """
+        path = self._path(endpoint, key, url)
+        entry = self._load(path)
+        now = time.time()
+
+        if (entry is not None and not revalidate
+                and now < entry.get('validated_at', 0) + min(entry.get('ttl', 0), self.ttl)):
+            self._count('hits')
+            try:
+                os.utime(path)  # keep the order for the next run's scan
+            except FileNotFoundError:
+                pass  # evicted by another worker since it was read; the body is still good
+            else:
+                self._touch(path)
+            return entry['body']
+
+        headers = {}
+        if entry is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        resp = fetch(url, headers)
+        if entry is not None and resp.status_code == 304:
+            self._count('revalidated')
+            entry['validated_at'] = now
+            entry['ttl'] = self.ttl
+            self._store(path, entry)
+            self._touch(path)
+            return entry['body']
+        if resp.status_code == 304:
+            # Nothing was asked to be revalidated, so there is no body to serve or cache.
+            raise ValueError(f'{url}: 304 Not Modified without a cached entry')
+
+        resp.raise_for_status()
+        self._count('misses')
+        self._store(path, {
+            'endpoint': endpoint,
+            'key': key,
+            'url': url,
+            'fetched_at': now,
+            'validated_at': now,
+            'ttl': self.ttl,
+            'etag': resp.headers.get('ETag'),
+            'last_modified': resp.headers.get('Last-Modified'),
+            'body': resp.text,
+        })
+        self._touch(path)
+        return resp.text
+
+    def _index(self):
+        """The in-memory LRU order, scanned from disk on first use; call with the lock held."""
+        if self.recent is None:
+            try:
+                names = [n for n in os.listdir(self.directory) if n.endswith('.json')]
+            except OSError:
+                names = []
+
+            def mtime(name):
+                try:
+                    return os.path.getmtime(os.path.join(self.directory, name))
+                except OSError:
+                    return 0.0
+            self.recent = collections.OrderedDict((n, None) for n in sorted(names, key=mtime))
+        return self.recent
+
+    def _touch(self, path):
+        """Mark `path` most recently used and evict what no longer fits."""
+        name = os.path.basename(path)
+        with self.lock:
+            recent = self._index()
+            recent[name] = None
+            recent.move_to_end(name)
+        self.evict()
+
+    def evict(self):
+        """Drop least-recently-used entries beyond `max_entries`."""
+        with self.lock:
+            recent = self._index()
+            excess = [recent.popitem(last=False)[0] for _ in range(len(recent) - self.max_entries)]
+        for name in excess:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                continue  # already gone, e.g. removed by another process
+            self._count('evicted')
+
+    def report(self):
+        s = self.stats
+        total = s['hits'] + s['revalidated'] + s['misses']
+        return (f"cache: {s['hits']} hits, {s['revalidated']} revalidated, "
+                f"{s['misses']} misses, {s['evicted']} evicted ({total} lookups)")
@@ -0,0 +1,290 @@
+"""Shared NHTSA VPIC client used by the fetch scripts.
+
+One pooled keep-alive `requests.Session` is reused for every call (and is safe
+to share between worker threads). Requests that fail with a connection error,
+a 5xx or a 429 are retried with exponential backoff plus jitter, honouring
+`Retry-After`. A circuit breaker trips after repeated failures so a run fails
+fast instead of waiting out a timeout per make while the API is down.
+Truncated and undecodable bodies are retried like connection errors. An
+optional `concurrency.AdaptiveConcurrency` caps the attempts in flight and
+learns the cap from each attempt's latency and status.
+"""
+import email.utils
+import json
+import random
+import threading
+import time
+import urllib.parse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+VPIC_BASE = 'https://vpic.nhtsa.dot.gov/api/vehicles'
+
+DEFAULT_TIMEOUT = 20
+DEFAULT_RETRIES = 4
+DEFAULT_BACKOFF = 0.5  # seconds, doubled per attempt
+MAX_BACKOFF = 30.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Request errors a retry cannot fix; every other requests.RequestException
+# (connection resets, timeouts, truncated or undecodable bodies) is retried.
+PERMANENT_ERRORS = (
+    requests.exceptions.InvalidURL,
+    requests.exceptions.InvalidSchema,
+    requests.exceptions.MissingSchema,
+    requests.exceptions.InvalidHeader,
+    requests.exceptions.URLRequired,
+    requests.exceptions.TooManyRedirects,
+)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of sending a request while the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Open after `threshold` consecutive failures; allow a probe after `reset_timeout` s.
+
+    While the probe is in flight every other request still fails fast; its
+    success closes the breaker and its failure reopens it for another
+    `reset_timeout`. The default threshold is above one make's full retry
+    budget, so a single broken make cannot trip the breaker on its own.
+    """
+
+    def __init__(self, threshold=10, reset_timeout=30.0):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self.lock = threading.Lock()
+
+    def before_request(self):
+        with self.lock:
+            if self.opened_at is None:
+                return
+            if self.probing or time.monotonic() - self.opened_at < self.reset_timeout:
+                raise CircuitOpenError(
+                    f'VPIC circuit open after {self.failures} consecutive failures')
+            # Half-open: let this one request through as a probe.
+            self.probing = True
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.probing:
+                self.probing = False
+                self.opened_at = time.monotonic()
+            elif self.failures >= self.threshold and self.opened_at is None:
+                self.opened_at = time.monotonic()
+
+    def abandon(self):
+        """An attempt ended without an answer about VPIC; let another probe through."""
+        with self.lock:
+            self.probing = False
+
+
+def parse_retry_after(value):
+    """Return the delay in seconds from a Retry-After header, or None."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+class VPICClient:
+    """Pooled VPIC client with retries, backoff and a circuit breaker.
+
+    `limiter` (a `ratelimit.TokenBucket`) is consulted before every real
+    request, including retries. `concurrency` (a
+    `concurrency.AdaptiveConcurrency`) holds a slot for the duration of each
+    attempt. `cache` (a `vpic_cache.ResponseCache`) is checked first, so cache
+    hits never touch the network. `metrics` (a `metrics.RunMetrics`) is told
+    about every attempt and retry.
+    """
+
+    def __init__(self, base=VPIC_BASE, timeout=DEFAULT_TIMEOUT, retries=DEFAULT_RETRIES,
+                 backoff=DEFAULT_BACKOFF, limiter=None, cache=None, breaker=None, pool_size=16, metrics=None,
+                 concurrency=None):
+        self.base = base.rstrip('/')
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.limiter = limiter
+        self.concurrency = concurrency
+        self.cache = cache
+        self.breaker = breaker or CircuitBreaker()
+        self.metrics = metrics
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'Accept': 'application/json',
+            'Accept-Encoding': 'gzip, deflate',
+            'User-Agent': 'vehicle-selector-demo/1.0',
+        })
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _delay(self, attempt, resp=None):
+        if resp is not None:
+            retry_after = parse_retry_after(resp.headers.get('Retry-After'))
+            if retry_after is not None:
+                return min(retry_after, MAX_BACKOFF)
+        # Full jitter: uniform in [0, backoff * 2**attempt].
+        return random.uniform(0, min(MAX_BACKOFF, self.backoff * (2 ** attempt)))
+
+    def _endpoint(self, url):
+        """Metrics label for `url`: the VPIC endpoint name, e.g. GetModelsForMake."""
+        path = url[len(self.base):] if url.startswith(self.base) else urllib.parse.urlsplit(url).path
+        return path.lstrip('/').split('/', 1)[0].split('?', 1)[0] or 'unknown'
+
+    def get(self, url, headers=None):
+        """GET `url` with retries. Returns the final `requests.Response`."""
+        attempt = 0
+        while True:
+            self.breaker.before_request()
+            if self.limiter is not None:
+                try:
+                    self.limiter.acquire()
+                except BaseException:
+                    # e.g. ratelimit.BudgetExhausted: no request went out.
+                    self.breaker.abandon()
+                    raise
+            if attempt and self.metrics is not None:
+                self.metrics.count_retry()
+            if self.concurrency is not None:
+                self.concurrency.acquire()
+            start = time.perf_counter()
+            try:
+                resp = self.session.get(url, headers=headers, timeout=self.timeout)
+            except PERMANENT_ERRORS:
+                if self.concurrency is not None:
+                    self.concurrency.release()
+                self.breaker.abandon()
+                raise
+            except requests.RequestException as e:
+                elapsed = time.perf_counter() - start
+                if self.concurrency is not None:
+                    self.concurrency.release(elapsed, error=e)
+                if self.metrics is not None:
+                    self.metrics.observe_request(self._endpoint(url), elapsed, error=e)
+                self.breaker.record_failure()
+                if attempt >= self.retries:
+                    raise
+                time.sleep(self._delay(attempt))
+                attempt += 1
+                continue
+            except BaseException:
+                if self.concurrency is not None:
+                    self.concurrency.release()
+                self.breaker.abandon()
+                raise
+            elapsed = time.perf_counter() - start
+            if self.concurrency is not None:
+                self.concurrency.release(elapsed, resp.status_code)
+            if self.metrics is not None:
+                self.metrics.observe_request(self._endpoint(url), elapsed, resp.status_code, len(resp.content))
+
+            if resp.status_code not in RETRY_STATUSES:
+                self.breaker.record_success()
+                return resp
+            self.breaker.record_failure()
+            if attempt >= self.retries:
+                return resp
+            time.sleep(self._delay(attempt, resp))
+            attempt += 1
+
+    def get_json(self, endpoint, key, path, revalidate=False):
+        """Fetch `{base}/{path}` as JSON, going through the cache when configured.
+
+        `revalidate` asks upstream even when the cached copy is fresh (see
+        `ResponseCache.get`).
+        """
+        url = f'{self.base}/{path}'
+        if self.cache is not None:
+            return json.loads(self.cache.get(url, endpoint, key, self.get, revalidate))
+        resp = self.get(url)
+        resp.raise_for_status()
+        return resp.json()
+
+    def get_make_results(self, make, revalidate=False):
+        """Return VPIC's raw GetModelsForMake `Results` rows for `make`."""
+        j = self.get_json('GetModelsForMake', make,
+                          f'GetModelsForMake/{urllib.parse.quote(make)}?format=json', revalidate)
+        return j.get('Results', [])
+
+    def get_models_for_make(self, make):
+        """Return the unique model names VPIC lists for `make`, in VPIC's order."""
+        return model_names(self.get_make_results(make))
+
+    def get_make_year_results(self, make, year):
+        """Return VPIC's raw GetModelsForMakeYear `Results` rows for `make` in model year `year`."""
+        j = self.get_json('GetModelsForMakeYear', f'{make}/{year}',
+                          f'GetModelsForMakeYear/make/{urllib.parse.quote(make)}/modelyear/{int(year)}?format=json')
+        return j.get('Results', [])
+
+    def get_all_makes(self):
+        """Return VPIC's raw GetAllMakes `Results` rows (Make_ID, Make_Name), about 11,000 of them."""
+        return self.get_json('GetAllMakes', 'all', 'GetAllMakes?format=json').get('Results', [])
+
+    def get_makes_for_vehicle_type(self, vehicle_type):
+        """Return VPIC's raw GetMakesForVehicleType `Results` rows (MakeId, MakeName, VehicleTypeName)."""
+        j = self.get_json('GetMakesForVehicleType', vehicle_type,
+                          f'GetMakesForVehicleType/{urllib.parse.quote(vehicle_type)}?format=json')
+        return j.get('Results', [])
+
+    def get_make_id_results(self, make_id):
+        """Return VPIC's raw GetModelsForMakeId `Results` rows; unlike a make name, the id matches exactly."""
+        j = self.get_json('GetModelsForMakeId', str(int(make_id)),
+                          f'GetModelsForMakeId/{int(make_id)}?format=json')
+        return j.get('Results', [])
+
+    def get_vehicle_types_for_make(self, make):
+        """Return VPIC's raw GetVehicleTypesForMake `Results` rows (one per make and vehicle type).
+
+        VPIC matches `make` as a substring, so rows for other makes can appear.
+        """
+        j = self.get_json('GetVehicleTypesForMake', make,
+                          f'GetVehicleTypesForMake/{urllib.parse.quote(make)}?format=json')
+        return j.get('Results', [])
+
+    def get_make_type_results(self, make, vehicle_type):
+        """Return VPIC's raw GetModelsForMakeYear rows for `make`'s models of one vehicle type, all years."""
+        j = self.get_json('GetModelsForMakeYear', f'{make}/type/{vehicle_type}',
+                          f'GetModelsForMakeYear/make/{urllib.parse.quote(make)}'
+                          f'/vehicletype/{urllib.parse.quote(vehicle_type)}?format=json')
+        return j.get('Results', [])
+
+
+def model_names(results):
+    """Unique model names from GetModelsForMake rows, preserving order."""
+    seen = set()
+    models = []
+    for r in results:
+        name = r.get('Model_Name') or r.get('Model') or ''
+        if not name or name in seen:
+            continue
+        seen.add(name)
+        models.append(name)
+    return models
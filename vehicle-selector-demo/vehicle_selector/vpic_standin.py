@@ -0,0 +1,466 @@
+"""Local VPIC stand-in: record real responses once, then replay them with injected faults.
+
+Usage:
+  python -m vehicle_selector standin record [--makes Toyota,Honda] [--rate 2] [--cassette FILE]
+  python -m vehicle_selector standin serve [--port 8765] [--latency lognormal:80:0.6]
+      [--error-rate 0.05] [--error-status 429,503] [--retry-after 1] [--reset-rate 0.01]
+      [--drip-rate 0.05] [--drip-interval 50] [--oversize-rate 0.02] [--oversize-factor 20]
+      [--missing empty|synthetic|404] [--seed 1]
+
+`record` fetches GetModelsForMake for every make in data/models.json (or
+`--makes`) from the live API and saves the responses to a cassette
+(.cache/vpic_cassette.json by default). `serve` replays the cassette under the
+same URL layout as VPIC, so any fetch script can be pointed at it, e.g.
+
+  python -m vehicle_selector fetch --no-cache --vpic-base http://127.0.0.1:8765/api/vehicles
+
+Every response gets a latency drawn from `--latency` (milliseconds):
+  fixed:MS | uniform:LO:HI | normal:MEAN:SD | lognormal:MEDIAN:SIGMA
+and, independently per request, may instead be turned into an error status
+(with `Retry-After` when set), a dropped connection, a slow body sent in small
+chunks, or an oversized body (the Results rows repeated). Responses carry an
+ETag and honour If-None-Match. With `--seed` the fault sequence is repeatable.
+GET /__stats returns request and fault counters as JSON.
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+import urllib.parse
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .models_io import load_models, write_models
+
+BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_PATH = os.path.join(BASE, 'data', 'models.json')
+CASSETTE_PATH = os.path.join(BASE, '.cache', 'vpic_cassette.json')
+API_PREFIX = '/api/vehicles/'
+
+DEFAULT_PORT = 8765
+SYNTHETIC_MODELS = 50
+SYNTHETIC_MAKES = 2000  # makes listed by a synthetic GetAllMakes
+SYNTHETIC_TYPES = [(2, 'Passenger Car'), (7, 'Multipurpose Passenger Vehicle (MPV)')]
+
+
+def request_key(path):
+    """Cassette key for a request path: the endpoint path below /api/vehicles/, lower-cased.
+
+    VPIC matches makes case-insensitively and every script asks for
+    `format=json`, so the query string is not part of the key.
+    """
+    path = urllib.parse.unquote(urllib.parse.urlsplit(path).path)
+    if path.startswith(API_PREFIX):
+        path = path[len(API_PREFIX):]
+    return path.strip('/').lower()
+
+
+def parse_latency(spec):
+    """Return a function that draws one latency, in seconds, from `spec` (in ms)."""
+    kind, _, args = (spec or 'fixed:0').partition(':')
+    try:
+        values = [float(v) for v in args.split(':')] if args else []
+    except ValueError:
+        raise ValueError(f'invalid latency spec: {spec!r}')
+    shapes = {'fixed': 1, 'uniform': 2, 'normal': 2, 'lognormal': 2}
+    if kind not in shapes or len(values) != shapes[kind]:
+        raise ValueError(f'invalid latency spec: {spec!r}')
+    if kind == 'fixed':
+        return lambda rng: values[0] / 1000
+    if kind == 'uniform':
+        return lambda rng: rng.uniform(*values) / 1000
+    if kind == 'normal':
+        return lambda rng: max(0.0, rng.gauss(*values)) / 1000
+    median, sigma = values
+    return lambda rng: rng.lognormvariate(0.0, sigma) * median / 1000
+
+
+class Faults:
+    """Fault-injection settings plus the seeded random source they are drawn from."""
+
+    def __init__(self, latency='fixed:0', error_rate=0.0, error_statuses=(503,), retry_after=None,
+                 reset_rate=0.0, drip_rate=0.0, drip_chunk=256, drip_interval=0.05,
+                 oversize_rate=0.0, oversize_factor=20, seed=None):
+        self.latency = parse_latency(latency)
+        self.error_rate = error_rate
+        self.error_statuses = list(error_statuses) or [503]
+        self.retry_after = retry_after
+        self.reset_rate = reset_rate
+        self.drip_rate = drip_rate
+        self.drip_chunk = drip_chunk
+        self.drip_interval = drip_interval
+        self.oversize_rate = oversize_rate
+        self.oversize_factor = oversize_factor
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def draw(self):
+        """Decide what happens to one request: (delay, fault) with fault None or a name."""
+        with self.lock:
+            delay = self.latency(self.rng)
+            roll = self.rng.random()
+            for fault, rate in (('error', self.error_rate), ('reset', self.reset_rate),
+                                ('drip', self.drip_rate), ('oversize', self.oversize_rate)):
+                if roll < rate:
+                    return delay, fault
+                roll -= rate
+            return delay, None
+
+    def error_status(self):
+        with self.lock:
+            return self.rng.choice(self.error_statuses)
+
+
+def synthetic_results(key, count=SYNTHETIC_MODELS):
+    """Deterministic GetModelsForMake-shaped body for a make that was never recorded."""
+    make = key.rsplit('/', 1)[-1].title()
+    rows = [{'Make_ID': 0, 'Make_Name': make.upper(), 'Model_ID': i, 'Model_Name': f'{make} Model {i}'}
+            for i in range(count)]
+    return {'Count': len(rows), 'Message': 'Response returned successfully',
+            'SearchCriteria': f'Make:{make}', 'Results': rows}
+
+
+def synthetic_year_results(key, count=SYNTHETIC_MODELS):
+    """Deterministic GetModelsForMakeYear-shaped body: each model is offered in some years only."""
+    parts = key.split('/')  # getmodelsformakeyear/make/<make>/modelyear/<year>
+    make, year = parts[2].title(), int(parts[4])
+    rows = [{'Make_ID': 0, 'Make_Name': make.upper(), 'Model_ID': i, 'Model_Name': f'{make} Model {i}'}
+            for i in range(count) if (year * 7 + i) % 11 < 8]
+    return {'Count': len(rows), 'Message': 'Response returned successfully',
+            'SearchCriteria': f'Make:{make} | ModelYear:{year}', 'Results': rows}
+
+
+def synthetic_make_types(key):
+    """Deterministic GetVehicleTypesForMake-shaped body: every make builds cars and MPVs."""
+    make = key.rsplit('/', 1)[-1].title()
+    rows = [{'IsPrimary': True, 'MakeId': 0, 'MakeName': make.upper(), 'VehicleTypeId': i, 'VehicleTypeName': name}
+            for i, name in SYNTHETIC_TYPES]
+    return {'Count': len(rows), 'Message': 'Response returned successfully',
+            'SearchCriteria': f'Make:{make}', 'Results': rows}
+
+
+def synthetic_type_results(key, count=SYNTHETIC_MODELS):
+    """Deterministic GetModelsForMakeYear-by-type body: the synthetic models split across SYNTHETIC_TYPES."""
+    parts = key.split('/')  # getmodelsformakeyear/make/<make>/vehicletype/<type>
+    make, vtype = parts[2].title(), parts[4]
+    types = [name.lower() for _, name in SYNTHETIC_TYPES]
+    rows = []
+    if vtype in types:
+        index = types.index(vtype)
+        type_id, type_name = SYNTHETIC_TYPES[index]
+        rows = [{'Make_ID': 0, 'Make_Name': make.upper(), 'Model_ID': i, 'Model_Name': f'{make} Model {i}',
+                 'VehicleTypeId': type_id, 'VehicleTypeName': type_name}
+                for i in range(count) if i % len(types) == index]
+    return {'Count': len(rows), 'Message': 'Response returned successfully',
+            'SearchCriteria': f'Make:{make} | VehicleType:{vtype}', 'Results': rows}
+
+
+def synthetic_all_makes(key, count=SYNTHETIC_MAKES):
+    """Deterministic GetAllMakes-shaped body listing `count` makes ("Make 0000", ...)."""
+    rows = [{'Make_ID': i, 'Make_Name': f'MAKE {i:04d}'} for i in range(count)]
+    return {'Count': len(rows), 'Message': 'Response returned successfully', 'SearchCriteria': None, 'Results': rows}
+
+
+def synthetic_type_makes(key, count=SYNTHETIC_MAKES):
+    """Deterministic GetMakesForVehicleType-shaped body: a fixed subset of the synthetic makes per type."""
+    vtype = key.rsplit('/', 1)[-1]
+    step = 2 + len(vtype) % 5
+    rows = [{'MakeId': i, 'MakeName': f'MAKE {i:04d}', 'VehicleTypeId': 0, 'VehicleTypeName': vtype.title()}
+            for i in range(0, count, step)]
+    return {'Count': len(rows), 'Message': 'Response returned successfully',
+            'SearchCriteria': f'Vehicle Type: {vtype}', 'Results': rows}
+
+
+def synthetic_make_id_results(key, count=SYNTHETIC_MODELS):
+    """Deterministic GetModelsForMakeId-shaped body; every third make has no models, like much of VPIC."""
+    make_id = int(key.rsplit('/', 1)[-1]) if key.rsplit('/', 1)[-1].isdigit() else 0
+    rows = [{'Make_ID': make_id, 'Make_Name': f'MAKE {make_id:04d}', 'Model_ID': i, 'Model_Name': f'Model {i}'}
+            for i in range(count if make_id % 3 else 0)]
+    return {'Count': len(rows), 'Message': 'Response returned successfully',
+            'SearchCriteria': f'Make ID:{make_id}', 'Results': rows}
+
+
+def empty_results(key):
+    return {'Count': 0, 'Message': 'Response returned successfully', 'SearchCriteria': None, 'Results': []}
+
+
+def _encode(body):
+    payload = json.dumps(body, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return payload, '"' + hashlib.sha256(payload).hexdigest()[:32] + '"'
+
+
+class StandinServer(ThreadingHTTPServer):
+    """Replays `responses` ({request_key: JSON body}) with the given `faults`."""
+
+    daemon_threads = True
+
+    def __init__(self, address, responses, faults=None, missing='empty', synthetic_models=SYNTHETIC_MODELS):
+        super().__init__(address, StandinHandler)
+        self.responses = responses
+        self.faults = faults or Faults()
+        self.missing = missing
+        self.synthetic_models = synthetic_models
+        self.encoded = {}
+        self.stats = {'requests': 0, 'status': {}, 'faults': {}, 'missing': 0}
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}/api/vehicles'
+
+    def count(self, status=None, fault=None, missing=False):
+        with self.lock:
+            if status is not None:
+                self.stats['requests'] += 1
+                self.stats['status'][str(status)] = self.stats['status'].get(str(status), 0) + 1
+            if fault is not None:
+                self.stats['faults'][fault] = self.stats['faults'].get(fault, 0) + 1
+            if missing:
+                self.stats['missing'] += 1
+
+    def lookup(self, key):
+        """(payload, etag) for `key`, or None when it was not recorded and `missing` is 404."""
+        with self.lock:
+            hit = self.encoded.get(key)
+        if hit is not None:
+            return hit
+        body = self.responses.get(key)
+        if body is None:
+            self.count(missing=True)
+            if self.missing == '404':
+                return None
+            if self.missing == 'synthetic' and key.startswith('getmodelsformake/'):
+                body = synthetic_results(key, self.synthetic_models)
+            elif self.missing == 'synthetic' and key.startswith('getmodelsformakeyear/make/') and key[-4:].isdigit():
+                body = synthetic_year_results(key, self.synthetic_models)
+            elif self.missing == 'synthetic' and key.startswith('getmodelsformakeyear/make/') and '/vehicletype/' in key:
+                body = synthetic_type_results(key, self.synthetic_models)
+            elif self.missing == 'synthetic' and key.startswith('getvehicletypesformake/'):
+                body = synthetic_make_types(key)
+            elif self.missing == 'synthetic' and key == 'getallmakes':
+                body = synthetic_all_makes(key)
+            elif self.missing == 'synthetic' and key.startswith('getmakesforvehicletype/'):
+                body = synthetic_type_makes(key)
+            elif self.missing == 'synthetic' and key.startswith('getmodelsformakeid/'):
+                body = synthetic_make_id_results(key, self.synthetic_models)
+            else:
+                body = empty_results(key)
+        hit = _encode(body)
+        with self.lock:
+            self.encoded[key] = hit
+        return hit
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are separate writes; without this, keep-alive clients
+    # stall on delayed ACKs and every response looks ~40 ms slower.
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, payload, headers=(), drip=False):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command == 'HEAD':
+            return
+        if not drip:
+            self.wfile.write(payload)
+            return
+        faults = self.server.faults
+        for start in range(0, len(payload), faults.drip_chunk):
+            self.wfile.write(payload[start:start + faults.drip_chunk])
+            self.wfile.flush()
+            time.sleep(faults.drip_interval)
+
+    def do_GET(self):
+        server = self.server
+        if self.path.split('?')[0] == '/__stats':
+            with server.lock:
+                payload = json.dumps(server.stats).encode('utf-8')
+            self._send(200, payload)
+            return
+
+        delay, fault = server.faults.draw()
+        time.sleep(delay)
+        server.count(fault=fault)
+
+        if fault == 'reset':
+            # Drop the connection without a response; clients see a connection error.
+            self.close_connection = True
+            server.count(status='reset')
+            return
+
+        if fault == 'error':
+            status = server.faults.error_status()
+            headers = []
+            if server.faults.retry_after is not None and status in (429, 503):
+                headers.append(('Retry-After', str(server.faults.retry_after)))
+            server.count(status=status)
+            self._send(status, json.dumps({'Message': 'Injected fault'}).encode('utf-8'), headers)
+            return
+
+        hit = server.lookup(request_key(self.path))
+        if hit is None:
+            server.count(status=404)
+            self._send(404, json.dumps({'Message': 'Not recorded'}).encode('utf-8'))
+            return
+        payload, etag = hit
+
+        if fault == 'oversize':
+            body = json.loads(payload)
+            body['Results'] = body.get('Results', []) * server.faults.oversize_factor
+            body['Count'] = len(body['Results'])
+            payload, etag = _encode(body)
+        elif self.headers.get('If-None-Match') == etag:
+            server.count(status=304)
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        server.count(status=200)
+        self._send(200, payload, [('ETag', etag)], drip=fault == 'drip')
+
+    do_HEAD = do_GET
+
+
+def load_cassette(path):
+    """Recorded responses as {request_key: JSON body}."""
+    return load_models(path).get('responses', {})
+
+
+def start(server):
+    """Serve `server` on a daemon thread; stop it with `server.shutdown()`."""
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return thread
+
+
+def record(makes, path, base=None, rate=2.0):
+    """Fetch GetModelsForMake for `makes` from `base` (default: the live API) into the cassette."""
+    # Only recording needs an HTTP client; replaying uses the standard library alone.
+    from .ratelimit import TokenBucket
+    from .vpic_client import VPIC_BASE, VPICClient
+
+    base = base or VPIC_BASE
+    try:
+        cassette = load_models(path)
+    except FileNotFoundError:
+        cassette = {}
+    responses = cassette.get('responses', {})
+    recorded = 0
+    with VPICClient(base=base, limiter=TokenBucket(rate)) as client:
+        for i, make in enumerate(makes, 1):
+            print(f'[{i}/{len(makes)}] {make}...', end=' ', flush=True)
+            url = f'{client.base}/GetModelsForMake/{urllib.parse.quote(make)}?format=json'
+            try:
+                resp = client.get(url)
+                resp.raise_for_status()
+                body = resp.json()
+            except Exception as e:
+                print(f'ERROR: {e}')
+                continue
+            responses[request_key(urllib.parse.urlsplit(url).path)] = body
+            recorded += 1
+            print(f"{len(body.get('Results', []))} rows")
+    write_models(path, {
+        'base': base,
+        'recorded_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'responses': dict(sorted(responses.items())),
+    })
+    return recorded
+
+
+def _rate(value):
+    rate = float(value)
+    if not 0.0 <= rate <= 1.0:
+        raise argparse.ArgumentTypeError('must be between 0 and 1')
+    return rate
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Record and replay VPIC responses with fault injection.')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    rec = sub.add_parser('record', help='record live GetModelsForMake responses to a cassette')
+    rec.add_argument('--makes', help='comma-separated makes (default: every make in data/models.json)')
+    rec.add_argument('--rate', type=float, default=2.0, help='requests per second (default 2)')
+    rec.add_argument('--vpic-base', help='API to record from (default: the live VPIC API)')
+    rec.add_argument('--cassette', default=CASSETTE_PATH, help='cassette file (default .cache/vpic_cassette.json)')
+
+    srv = sub.add_parser('serve', help='replay a cassette with latency and fault injection')
+    srv.add_argument('--host', default='127.0.0.1')
+    srv.add_argument('--port', type=int, default=DEFAULT_PORT)
+    srv.add_argument('--cassette', default=CASSETTE_PATH, help='cassette file (default .cache/vpic_cassette.json)')
+    srv.add_argument('--latency', default='fixed:0',
+                     help='fixed:MS | uniform:LO:HI | normal:MEAN:SD | lognormal:MEDIAN:SIGMA (default fixed:0)')
+    srv.add_argument('--error-rate', type=_rate, default=0.0, help='fraction of requests answered with an error status')
+    srv.add_argument('--error-status', default='503', help='comma-separated statuses to inject (default 503)')
+    srv.add_argument('--retry-after', type=int, help='Retry-After seconds on injected 429/503 responses')
+    srv.add_argument('--reset-rate', type=_rate, default=0.0, help='fraction of connections dropped without a response')
+    srv.add_argument('--drip-rate', type=_rate, default=0.0, help='fraction of bodies sent slowly in small chunks')
+    srv.add_argument('--drip-chunk', type=int, default=256, help='bytes per chunk of a slow body (default 256)')
+    srv.add_argument('--drip-interval', type=float, default=50, help='ms between chunks of a slow body (default 50)')
+    srv.add_argument('--oversize-rate', type=_rate, default=0.0, help='fraction of bodies inflated')
+    srv.add_argument('--oversize-factor', type=int, default=20, help='times the Results rows are repeated (default 20)')
+    srv.add_argument('--missing', choices=['empty', 'synthetic', '404'], default='empty',
+                     help='answer for unrecorded requests: empty Results like VPIC (default), '
+                          f'{SYNTHETIC_MODELS} generated models, or 404')
+    srv.add_argument('--seed', type=int, help='seed for repeatable latency and faults')
+    args = parser.parse_args(argv)
+
+    if args.command == 'record':
+        if args.makes:
+            makes = [m.strip() for m in args.makes.split(',') if m.strip()]
+        else:
+            makes = list(load_models(DATA_PATH))
+        recorded = record(makes, args.cassette, args.vpic_base, args.rate)
+        print(f'✓ Recorded {recorded}/{len(makes)} makes to {args.cassette}')
+        return
+
+    try:
+        faults = Faults(
+            latency=args.latency,
+            error_rate=args.error_rate,
+            error_statuses=[int(s) for s in args.error_status.split(',') if s.strip()],
+            retry_after=args.retry_after,
+            reset_rate=args.reset_rate,
+            drip_rate=args.drip_rate,
+            drip_chunk=max(1, args.drip_chunk),
+            drip_interval=args.drip_interval / 1000,
+            oversize_rate=args.oversize_rate,
+            oversize_factor=max(1, args.oversize_factor),
+            seed=args.seed,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    try:
+        responses = load_cassette(args.cassette)
+    except FileNotFoundError:
+        if args.missing == 'empty':
+            parser.error(f'{args.cassette} not found; run `record` first or pass --missing synthetic')
+        responses = {}
+    server = StandinServer((args.host, args.port), responses, faults, missing=args.missing)
+    print(f'Replaying {len(responses)} recorded responses on {server.base_url}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(server.stats))
+
+
+if __name__ == '__main__':
+    main()